@@ -1,16 +1,78 @@
 from .connection import DatabaseConnection, get_db
+from .pagination import OrderPage, InvalidCursorError
+from .date_range import DateRange
+from .order_facets import OrderFacets
+from .order_archive import ArchivePartitionError
+from .projections import (
+    OrderRow, InventoryRow, CustomerRow, ReturnRequestRow, Projection, projection_for
+)
+from .order_bulk import BulkChunkResult, BulkUpsertResult
+from .order_search import OrderSearch
+from .order_events import (
+    OrderChangeListener, add_order_change_listener, remove_order_change_listener
+)
+from .pool import PoolConfig, PoolStats
+from .sqlite_profile import SqliteProfile
+from .migrations import MigrationRunner, MigrationError
+from .unit_of_work import UnitOfWork, unit_of_work
+from .instrumentation import InstrumentationConfig, QueryInstrumentation, StatementStats
+from .index_advisor import IndexAdvisor, IndexRecommendation, AccessPattern
 from .order_repository import OrderRepository
 from .user_repository import UserRepository
 from .customer_repository import CustomerRepository
 from .inventory_repository import InventoryRepository
 from .return_request_repository import ReturnRequestRepository
+from .async_connection import AsyncDatabaseConnection, AsyncDatabaseUnavailableError, get_async_db
+from .async_repositories import (
+    AsyncOrderRepository,
+    AsyncCustomerRepository,
+    AsyncUserRepository,
+    AsyncInventoryRepository,
+)
 
 __all__ = [
     'DatabaseConnection',
     'get_db',
+    'OrderPage',
+    'InvalidCursorError',
+    'DateRange',
+    'OrderFacets',
+    'ArchivePartitionError',
+    'OrderRow',
+    'InventoryRow',
+    'CustomerRow',
+    'ReturnRequestRow',
+    'Projection',
+    'projection_for',
+    'BulkChunkResult',
+    'BulkUpsertResult',
+    'OrderSearch',
+    'OrderChangeListener',
+    'add_order_change_listener',
+    'remove_order_change_listener',
+    'PoolConfig',
+    'PoolStats',
+    'SqliteProfile',
+    'MigrationRunner',
+    'MigrationError',
+    'UnitOfWork',
+    'unit_of_work',
+    'InstrumentationConfig',
+    'QueryInstrumentation',
+    'StatementStats',
+    'IndexAdvisor',
+    'IndexRecommendation',
+    'AccessPattern',
     'OrderRepository',
     'UserRepository',
     'CustomerRepository',
     'InventoryRepository',
     'ReturnRequestRepository',
+    'AsyncDatabaseConnection',
+    'AsyncDatabaseUnavailableError',
+    'get_async_db',
+    'AsyncOrderRepository',
+    'AsyncCustomerRepository',
+    'AsyncUserRepository',
+    'AsyncInventoryRepository',
 ]
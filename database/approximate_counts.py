@@ -0,0 +1,68 @@
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+
+ROW_COUNT_TABLE = 'table_row_count'
+COUNTED_TABLES = (
+    'order', 'order_archive', 'order_header', 'customer', 'user', 'inventory', 'return_request',
+)
+
+_SQLITE_TABLE_DDL = (
+    f"CREATE TABLE IF NOT EXISTS {ROW_COUNT_TABLE} ("
+    f"table_name VARCHAR(64) NOT NULL PRIMARY KEY, row_count INTEGER NOT NULL DEFAULT 0)"
+)
+
+
+def _sqlite_trigger_ddl(table_name: str) -> List[str]:
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table_name}_row_count_ai AFTER INSERT ON \"{table_name}\" "
+        f"BEGIN UPDATE {ROW_COUNT_TABLE} SET row_count = row_count + 1 "
+        f"WHERE table_name = '{table_name}'; END",
+        f"CREATE TRIGGER IF NOT EXISTS {table_name}_row_count_ad AFTER DELETE ON \"{table_name}\" "
+        f"BEGIN UPDATE {ROW_COUNT_TABLE} SET row_count = row_count - 1 "
+        f"WHERE table_name = '{table_name}'; END",
+    ]
+
+
+def install_row_counts(conn: Connection) -> bool:
+    if conn.dialect.name != 'sqlite':
+        return False
+    conn.exec_driver_sql(_SQLITE_TABLE_DDL)
+    for table_name in COUNTED_TABLES:
+        for ddl in _sqlite_trigger_ddl(table_name):
+            conn.exec_driver_sql(ddl)
+    refresh_row_counts(conn)
+    return True
+
+
+def refresh_row_counts(conn: Connection) -> None:
+    if conn.dialect.name != 'sqlite':
+        return
+    for table_name in COUNTED_TABLES:
+        conn.exec_driver_sql(
+            f"INSERT OR REPLACE INTO {ROW_COUNT_TABLE} (table_name, row_count) "
+            f"SELECT '{table_name}', COUNT(*) FROM \"{table_name}\""
+        )
+
+
+def approximate_row_count(conn: Connection, table_name: str) -> Optional[int]:
+    if conn.dialect.name == 'sqlite':
+        stmt = text(f"SELECT row_count FROM {ROW_COUNT_TABLE} WHERE table_name = :table_name")
+    elif conn.dialect.name == 'mysql':
+        stmt = text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        )
+    else:
+        return None
+
+    try:
+        value = conn.execute(stmt, {"table_name": table_name}).scalar()
+    except DBAPIError:
+        return None
+    if value is None:
+        return None
+    return max(int(value), 0)
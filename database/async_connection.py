@@ -0,0 +1,151 @@
+import importlib.util
+from typing import Optional
+
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from database.connection import get_db
+from database.pool import PoolConfig
+from database.sqlite_profile import SqliteProfile
+
+
+ASYNC_DRIVERS = {
+    "sqlite": ("aiosqlite", "sqlite+aiosqlite"),
+    "mysql": ("aiomysql", "mysql+aiomysql"),
+}
+
+
+class AsyncDatabaseUnavailableError(Exception):
+    pass
+
+
+def to_async_url(database_path: str) -> URL:
+    if "://" not in database_path:
+        database_path = f"sqlite:///{database_path}"
+
+    url = make_url(database_path)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise AsyncDatabaseUnavailableError(
+            f"No async driver configured for backend '{backend}'"
+        )
+
+    module_name, drivername = ASYNC_DRIVERS[backend]
+    if importlib.util.find_spec(module_name) is None:
+        raise AsyncDatabaseUnavailableError(
+            f"Async driver '{module_name}' is not installed"
+        )
+    return url.set(drivername=drivername)
+
+
+class AsyncDatabaseConnection:
+    _instance: Optional['AsyncDatabaseConnection'] = None
+    _engine: Optional[AsyncEngine] = None
+    _replica_engine: Optional[AsyncEngine] = None
+    _session_factory: Optional[async_sessionmaker] = None
+    _read_session_factory: Optional[async_sessionmaker] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        pass
+
+    def connect(
+        self,
+        database_path: str = "./test.db",
+        pool_config: Optional[PoolConfig] = None,
+        sqlite_profile: Optional[SqliteProfile] = None,
+        replica_path: Optional[str] = None
+    ):
+        engine = self._create_engine(to_async_url(database_path), pool_config, sqlite_profile)
+        replica_engine = None
+        if replica_path:
+            try:
+                replica_engine = self._create_engine(
+                    to_async_url(replica_path), pool_config, sqlite_profile
+                )
+            except AsyncDatabaseUnavailableError:
+                engine.sync_engine.dispose()
+                raise
+
+        self._engine = engine
+        self._session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+        self._replica_engine = replica_engine
+        self._read_session_factory = None
+        if replica_engine is not None:
+            self._read_session_factory = async_sessionmaker(
+                bind=replica_engine, expire_on_commit=False
+            )
+
+    def _create_engine(
+        self,
+        url: URL,
+        pool_config: Optional[PoolConfig],
+        sqlite_profile: Optional[SqliteProfile]
+    ) -> AsyncEngine:
+        if url.get_backend_name() == "sqlite":
+            engine = create_async_engine(url, echo=False)
+            profile = sqlite_profile or SqliteProfile.from_env()
+            if profile is not None and url.database not in (None, "", ":memory:"):
+                profile.install(engine.sync_engine)
+        else:
+            pool_config = pool_config or PoolConfig.from_env()
+            engine = create_async_engine(
+                url,
+                echo=False,
+                pool_size=pool_config.pool_size,
+                max_overflow=pool_config.max_overflow,
+                pool_timeout=pool_config.pool_timeout,
+                pool_recycle=pool_config.pool_recycle,
+                pool_pre_ping=pool_config.pool_pre_ping,
+            )
+
+        instrumentation = get_db().instrumentation
+        if instrumentation is not None:
+            instrumentation.install(engine.sync_engine)
+        return engine
+
+    def get_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            raise RuntimeError("Async database not connected. Call connect() first.")
+        return self._session_factory()
+
+    def get_read_session(self) -> AsyncSession:
+        if self._read_session_factory is None or get_db().should_read_from_primary():
+            return self.get_session()
+        return self._read_session_factory()
+
+    async def close(self):
+        if self._replica_engine:
+            await self._replica_engine.dispose()
+            self._replica_engine = None
+            self._read_session_factory = None
+        if self._engine:
+            await self._engine.dispose()
+            self._engine = None
+            self._session_factory = None
+
+    @property
+    def engine(self) -> Optional[AsyncEngine]:
+        return self._engine
+
+    @property
+    def replica_engine(self) -> Optional[AsyncEngine]:
+        return self._replica_engine
+
+    @property
+    def is_connected(self) -> bool:
+        return self._engine is not None
+
+
+_async_db_connection: Optional[AsyncDatabaseConnection] = None
+
+
+def get_async_db() -> AsyncDatabaseConnection:
+    global _async_db_connection
+    if _async_db_connection is None:
+        _async_db_connection = AsyncDatabaseConnection()
+    return _async_db_connection
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Order, OrderHeader, Customer, User, Inventory
+from enums import OrderStatus, CustomerType
+from database.async_connection import get_async_db
+from database.order_overview import build_order_overview_statement, split_order_overview
+from database.order_stats import summary_count_statement
+
+
+class AsyncOrderRepository:
+    def __init__(self):
+        self._db = get_async_db()
+
+    def _get_session(self) -> AsyncSession:
+        return self._db.get_read_session()
+
+    async def count(self) -> int:
+        async with self._get_session() as session:
+            return await session.scalar(select(func.count(Order.hash))) or 0
+
+    async def count_order_headers(self, customer_id: str = "") -> int:
+        stmt = select(func.count(OrderHeader.order_id))
+        if customer_id:
+            stmt = stmt.where(OrderHeader.customer_id == customer_id)
+        async with self._get_session() as session:
+            return await session.scalar(stmt) or 0
+
+    async def find_by_order_id(self, order_id: str) -> List[Order]:
+        async with self._get_session() as session:
+            result = await session.scalars(select(Order).where(Order.order_id == order_id))
+            return list(result.all())
+
+    async def find_nearing_deadline(self, days: int, customer_id: str = "") -> List[Order]:
+        now = datetime.now()
+        start_of_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_of_target_day = start_of_today + timedelta(days=days)
+
+        stmt = select(Order).where(
+            Order.status.notin_([int(s) for s in OrderStatus.get_closed_statuses()]),
+            Order.ship_deadline >= start_of_today,
+            Order.ship_deadline < end_of_target_day
+        ).order_by(Order.ship_deadline)
+        if customer_id:
+            stmt = stmt.where(Order.customer_id == customer_id)
+
+        async with self._get_session() as session:
+            result = await session.scalars(stmt)
+            return list(result.all())
+
+    async def count_by_status(self, customer_id: str = "") -> List[Dict[str, Any]]:
+        if customer_id:
+            stmt = select(Order.status, func.count(Order.hash)).where(
+                Order.customer_id == customer_id
+            ).group_by(Order.status)
+        else:
+            stmt = summary_count_statement('status')
+
+        async with self._get_session() as session:
+            results = (await session.execute(stmt)).all()
+        return [{"status": OrderStatus(r[0]), "count": int(r[1])} for r in results]
+
+    async def count_by_customer_type(self, customer_id: str = "") -> List[Dict[str, Any]]:
+        if customer_id:
+            stmt = select(Order.customer_type, func.count(Order.hash)).where(
+                Order.customer_id == customer_id
+            ).group_by(Order.customer_type)
+        else:
+            stmt = summary_count_statement('customer_type')
+
+        async with self._get_session() as session:
+            results = (await session.execute(stmt)).all()
+        return [{"customer_type": CustomerType(r[0]), "count": int(r[1])} for r in results]
+
+    async def count_by_sales(self, customer_id: str = "") -> List[Dict[str, Any]]:
+        if customer_id:
+            stmt = select(Order.sales, func.count(Order.hash)).where(
+                Order.sales != '',
+                Order.customer_id == customer_id
+            ).group_by(Order.sales)
+        else:
+            stmt = summary_count_statement('sales', exclude_empty=True)
+
+        async with self._get_session() as session:
+            results = (await session.execute(stmt)).all()
+        return [{"sales": r[0], "count": int(r[1])} for r in results]
+
+    async def get_order_overview(self, customer_id: str = "") -> Tuple[Dict[str, Any], Dict[str, int]]:
+        async with self._get_session() as session:
+            row = (await session.execute(build_order_overview_statement(customer_id))).one()
+        return split_order_overview(row)
+
+    async def get_dashboard_counts(self, customer_id: str = "") -> Dict[str, Any]:
+        return (await self.get_order_overview(customer_id))[0]
+
+    async def get_deadline_stats(self, customer_id: str = "") -> Dict[str, int]:
+        return (await self.get_order_overview(customer_id))[1]
+
+
+class AsyncCustomerRepository:
+    def __init__(self):
+        self._db = get_async_db()
+
+    def _get_session(self) -> AsyncSession:
+        return self._db.get_read_session()
+
+    async def count(self) -> int:
+        async with self._get_session() as session:
+            return await session.scalar(select(func.count(Customer.customer_id))) or 0
+
+
+class AsyncUserRepository:
+    def __init__(self):
+        self._db = get_async_db()
+
+    def _get_session(self) -> AsyncSession:
+        return self._db.get_read_session()
+
+    async def count(self) -> int:
+        async with self._get_session() as session:
+            return await session.scalar(select(func.count(User.user_id))) or 0
+
+
+class AsyncInventoryRepository:
+    def __init__(self):
+        self._db = get_async_db()
+
+    def _get_session(self) -> AsyncSession:
+        return self._db.get_read_session()
+
+    async def count(self) -> int:
+        async with self._get_session() as session:
+            return await session.scalar(select(func.count(Inventory.product_id))) or 0
+
+    async def find_all_inventory(self) -> List[Inventory]:
+        async with self._get_session() as session:
+            result = await session.scalars(select(Inventory))
+            return list(result.all())
+
+    async def get_sales_by_product_type(self) -> List[Dict[str, Any]]:
+        stmt = select(
+            Inventory.product_type,
+            func.sum(Inventory.sold_quantity),
+            func.sum(Inventory.stock_quantity)
+        ).group_by(Inventory.product_type).order_by(
+            func.sum(Inventory.sold_quantity).desc()
+        )
+
+        async with self._get_session() as session:
+            results = (await session.execute(stmt)).all()
+        return [{
+            "product_type": r[0],
+            "total_sold": r[1] or 0,
+            "total_stock": r[2] or 0,
+        } for r in results]
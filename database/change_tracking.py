@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Tuple
+
+from sqlalchemy import inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+
+VERSION_ATTRIBUTE = 'version'
+TOUCHED_ATTRIBUTE = 'updated_at'
+
+
+def _column(mapper, key: str):
+    return mapper.get_property(key).columns[0]
+
+
+def changed_attributes(
+    instance: Any,
+    exclude: Iterable[str] = ()
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    state = inspect(instance)
+    excluded = set(exclude) | {VERSION_ATTRIBUTE}
+    changes: Dict[str, Any] = {}
+    previous: Dict[str, Any] = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in excluded or attr.columns[0].primary_key:
+            continue
+        history = state.attrs[attr.key].history
+        if not history.added:
+            continue
+        changes[attr.key] = history.added[0]
+        if history.deleted:
+            previous[attr.key] = history.deleted[0]
+    return changes, previous
+
+
+def mark_clean(instance: Any) -> None:
+    state = inspect(instance)
+    for attr in state.mapper.column_attrs:
+        if attr.key in state.dict:
+            set_committed_value(instance, attr.key, state.dict[attr.key])
+
+
+def versioned_update(
+    session: Session,
+    instance: Any,
+    key_attribute: str,
+    changes: Dict[str, Any],
+    allow_unversioned: bool = False
+) -> bool:
+    mapper = inspect(instance).mapper
+    version_column = _column(mapper, VERSION_ATTRIBUTE)
+    expected_version = getattr(instance, VERSION_ATTRIBUTE)
+    if expected_version is None and not allow_unversioned:
+        return False
+
+    changes = dict(changes)
+    if mapper.has_property(TOUCHED_ATTRIBUTE) and TOUCHED_ATTRIBUTE not in changes:
+        changes[TOUCHED_ATTRIBUTE] = datetime.now()
+
+    values = {_column(mapper, key): value for key, value in changes.items()}
+    values[version_column] = version_column + 1
+
+    criteria = [_column(mapper, key_attribute) == getattr(instance, key_attribute)]
+    if expected_version is not None:
+        criteria.append(version_column == expected_version)
+
+    with session.no_autoflush:
+        result = session.execute(update(mapper.local_table).where(*criteria).values(values))
+    if result.rowcount == 0:
+        return False
+
+    for key, value in changes.items():
+        set_committed_value(instance, key, value)
+    if expected_version is not None:
+        set_committed_value(instance, VERSION_ATTRIBUTE, expected_version + 1)
+    return True
+
+
+def row_exists(session: Session, instance: Any, key_attribute: str) -> bool:
+    mapper = inspect(instance).mapper
+    key_column = _column(mapper, key_attribute)
+    with session.no_autoflush:
+        row = session.execute(
+            select(key_column).where(key_column == getattr(instance, key_attribute))
+        ).first()
+    return row is not None
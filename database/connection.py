@@ -1,15 +1,39 @@
-from typing import Optional
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
 
-from models.order import Base
+from database.pool import PoolConfig, PoolStats, InstrumentedQueuePool, env_bool, env_float
+from database.sqlite_profile import SqliteProfile
+from database.migrations import MigrationRunner, KEY_STORAGE_SETTING, ORDER_SEARCH_SETTING
+from database.order_search import OrderSearch
+from database.index_advisor import IndexAdvisor
+from database.instrumentation import InstrumentationConfig, QueryInstrumentation, StatementStats
 
 
 class DatabaseConnection:
     _instance: Optional['DatabaseConnection'] = None
     _engine = None
     _session_factory = None
+    _replica_engine = None
+    _read_session_factory = None
+    _pool_config: Optional[PoolConfig] = None
+    _sqlite_profile: Optional[SqliteProfile] = None
+    _instrumentation: Optional[QueryInstrumentation] = None
+    _read_your_writes_window: float = 5.0
+    _last_write_at: float = 0.0
+    _primary_reads = threading.local()
+    _unit_of_work = threading.local()
+    _scoped_sessions_enabled: bool = False
+    _scoped_session: Optional[scoped_session] = None
+    _scoped_read_session: Optional[scoped_session] = None
+    _session_scope = threading.local()
+    _order_search: OrderSearch = OrderSearch()
+    _index_advisor: Optional[IndexAdvisor] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -19,36 +43,296 @@ class DatabaseConnection:
     def __init__(self):
         pass
 
-    def connect(self, database_path: str = "./test.db"):
-        if "://" in database_path:
-            self._engine = create_engine(database_path, echo=False)
+    def connect(
+        self,
+        database_path: str = "./test.db",
+        pool_config: Optional[PoolConfig] = None,
+        sqlite_profile: Optional[SqliteProfile] = None,
+        replica_path: Optional[str] = None,
+        read_your_writes_window: Optional[float] = None,
+        instrumentation_config: Optional[InstrumentationConfig] = None,
+        scoped_sessions: Optional[bool] = None,
+        index_advisor: Optional[bool] = None
+    ):
+        self._engine = self._create_engine(database_path, pool_config, sqlite_profile)
+        self._session_factory = sessionmaker(bind=self._engine, expire_on_commit=False)
+        event.listen(self._session_factory, "after_flush", self._on_primary_flush)
+        event.listen(self._session_factory, "do_orm_execute", self._on_primary_execute)
+
+        if replica_path:
+            self._replica_engine = self._create_engine(replica_path, pool_config, sqlite_profile)
+            self._read_session_factory = sessionmaker(
+                bind=self._replica_engine, expire_on_commit=False
+            )
+
+        if read_your_writes_window is None:
+            read_your_writes_window = env_float('DB_READ_YOUR_WRITES_SECONDS', 5.0)
+        self._read_your_writes_window = read_your_writes_window
+        self._last_write_at = 0.0
+
+        if scoped_sessions is None:
+            scoped_sessions = env_bool('DB_SCOPED_SESSIONS', False)
+        self._scoped_sessions_enabled = scoped_sessions
+        self._scoped_session = scoped_session(self._session_factory)
+        self._scoped_read_session = None
+        if self._read_session_factory is not None:
+            self._scoped_read_session = scoped_session(self._read_session_factory)
+
+        instrumentation_config = instrumentation_config or InstrumentationConfig.from_env()
+        self._instrumentation = None
+        if instrumentation_config.enabled:
+            self._instrumentation = QueryInstrumentation(instrumentation_config)
+            self._instrumentation.install(self._engine)
+            if self._replica_engine is not None:
+                self._instrumentation.install(self._replica_engine)
+
+        if index_advisor is None:
+            index_advisor = env_bool('DB_INDEX_ADVISOR', False)
+        self._index_advisor = None
+        if index_advisor:
+            self._index_advisor = IndexAdvisor()
+            self._index_advisor.install(self._session_factory)
+            if self._read_session_factory is not None:
+                self._index_advisor.install(self._read_session_factory)
+
+        migration_runner = MigrationRunner(self._engine)
+        applied = migration_runner.run()
+        settings = {} if applied else migration_runner.schema_settings()
+        key_storage = migration_runner.verify_key_storage(settings.get(KEY_STORAGE_SETTING))
+        if ORDER_SEARCH_SETTING in settings:
+            self._order_search = OrderSearch.from_setting(self._engine, settings[ORDER_SEARCH_SETTING])
         else:
-            self._engine = create_engine(
-                f"sqlite:///{database_path}",
+            self._order_search = OrderSearch.detect(self._engine)
+        if KEY_STORAGE_SETTING not in settings or ORDER_SEARCH_SETTING not in settings:
+            migration_runner.record_schema_settings({
+                KEY_STORAGE_SETTING: key_storage,
+                ORDER_SEARCH_SETTING: self._order_search.setting,
+            })
+
+    def _create_engine(
+        self,
+        database_path: str,
+        pool_config: Optional[PoolConfig],
+        sqlite_profile: Optional[SqliteProfile]
+    ) -> Engine:
+        if "://" not in database_path:
+            url = make_url(f"sqlite:///{database_path}")
+            return self._create_sqlite_engine(url, sqlite_profile, legacy_static=True)
+
+        url = make_url(database_path)
+        if url.get_backend_name() == "sqlite":
+            return self._create_sqlite_engine(url, sqlite_profile, legacy_static=False)
+
+        self._pool_config = pool_config or PoolConfig.from_env()
+        return create_engine(
+            database_path,
+            echo=False,
+            **self._pool_config.to_engine_kwargs()
+        )
+
+    def _create_sqlite_engine(
+        self,
+        url: URL,
+        sqlite_profile: Optional[SqliteProfile],
+        legacy_static: bool
+    ) -> Engine:
+        profile = sqlite_profile or SqliteProfile.from_env()
+        is_memory = url.database in (None, "", ":memory:")
+
+        if profile is not None and not is_memory:
+            self._sqlite_profile = profile
+            engine = create_engine(url, echo=False, **profile.to_engine_kwargs())
+            profile.install(engine)
+        elif legacy_static and is_memory:
+            engine = create_engine(
+                url,
                 connect_args={"check_same_thread": False},
                 poolclass=StaticPool,
                 echo=False
             )
-        
-        self._session_factory = sessionmaker(bind=self._engine, expire_on_commit=False)
-        
-        Base.metadata.create_all(self._engine)
+        elif legacy_static:
+            engine = create_engine(
+                url,
+                connect_args={"check_same_thread": False},
+                poolclass=QueuePool,
+                echo=False
+            )
+        else:
+            engine = create_engine(url, echo=False)
 
-    def get_session(self) -> Session:
+        self._enable_sqlite_transactions(engine)
+        return engine
+
+    @staticmethod
+    def _enable_sqlite_transactions(engine: Engine) -> None:
+        @event.listens_for(engine, "connect")
+        def _disable_driver_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+    def _on_primary_flush(self, session, flush_context):
+        self.mark_write()
+
+    def _on_primary_execute(self, orm_execute_state):
+        if (orm_execute_state.is_insert or orm_execute_state.is_update
+                or orm_execute_state.is_delete):
+            self.mark_write()
+
+    def mark_write(self) -> None:
+        self._last_write_at = time.monotonic()
+
+    def should_read_from_primary(self) -> bool:
+        if getattr(self._primary_reads, 'depth', 0) > 0:
+            return True
+        if not self._last_write_at:
+            return False
+        return time.monotonic() - self._last_write_at < self._read_your_writes_window
+
+    @contextmanager
+    def read_from_primary(self) -> Iterator[None]:
+        self._primary_reads.depth = getattr(self._primary_reads, 'depth', 0) + 1
+        try:
+            yield
+        finally:
+            self._primary_reads.depth -= 1
+
+    @property
+    def supports_unit_of_work(self) -> bool:
+        return self._engine is not None and not isinstance(
+            self._engine.pool, (StaticPool, SingletonThreadPool)
+        )
+
+    def active_unit_of_work_session(self) -> Optional[Session]:
+        return getattr(self._unit_of_work, 'session', None)
+
+    def bind_unit_of_work_session(self, session: Optional[Session]) -> None:
+        self._unit_of_work.session = session
+
+    def create_session(self, **kwargs) -> Session:
         if self._session_factory is None:
             raise RuntimeError("Database not connected. Call connect() first.")
-        return self._session_factory()
+        return self._session_factory(**kwargs)
+
+    def _in_session_scope(self) -> bool:
+        return self._scoped_sessions_enabled and getattr(self._session_scope, 'depth', 0) > 0
+
+    @contextmanager
+    def session_scope(self) -> Iterator[None]:
+        if not self._scoped_sessions_enabled or self._session_factory is None:
+            yield
+            return
+
+        self._session_scope.depth = getattr(self._session_scope, 'depth', 0) + 1
+        try:
+            yield
+        finally:
+            self._session_scope.depth -= 1
+            if self._session_scope.depth == 0:
+                self.clear_scoped_sessions()
+
+    def clear_scoped_sessions(self) -> None:
+        if self._scoped_session is not None:
+            self._scoped_session.remove()
+        if self._scoped_read_session is not None:
+            self._scoped_read_session.remove()
+
+    def get_session(self) -> Session:
+        uow_session = self.active_unit_of_work_session()
+        if uow_session is not None:
+            return uow_session
+        if self._in_session_scope():
+            return self._scoped_session()
+        return self.create_session()
+
+    def get_read_session(self) -> Session:
+        if self.active_unit_of_work_session() is not None:
+            return self.get_session()
+        if self._read_session_factory is None or self.should_read_from_primary():
+            return self.get_session()
+        if self._in_session_scope():
+            return self._scoped_read_session()
+        return self._read_session_factory()
+
+    def release_session(self, session: Session) -> None:
+        if session is self.active_unit_of_work_session():
+            return
+        if self._in_session_scope():
+            if self._scoped_session.registry.has() and session is self._scoped_session():
+                return
+            if (self._scoped_read_session is not None
+                    and self._scoped_read_session.registry.has()
+                    and session is self._scoped_read_session()):
+                return
+        session.close()
+
+    def get_pool_stats(self, replica: bool = False) -> Optional[PoolStats]:
+        engine = self._replica_engine if replica else self._engine
+        if engine is None:
+            return None
+        pool = engine.pool
+        if not isinstance(pool, InstrumentedQueuePool):
+            return None
+        return pool.get_stats()
+
+    def get_query_stats(self) -> List[StatementStats]:
+        if self._instrumentation is None:
+            return []
+        return self._instrumentation.get_stats()
 
     def close(self):
+        self.clear_scoped_sessions()
+        self._scoped_session = None
+        self._scoped_read_session = None
+        if self._replica_engine:
+            self._replica_engine.dispose()
+            self._replica_engine = None
+            self._read_session_factory = None
         if self._engine:
             self._engine.dispose()
             self._engine = None
             self._session_factory = None
+            self._pool_config = None
+            self._sqlite_profile = None
 
     @property
     def engine(self):
         return self._engine
 
+    @property
+    def instrumentation(self) -> Optional[QueryInstrumentation]:
+        return self._instrumentation
+
+    @property
+    def replica_engine(self):
+        return self._replica_engine
+
+    @property
+    def has_replica(self) -> bool:
+        return self._replica_engine is not None
+
+    @property
+    def pool_config(self) -> Optional[PoolConfig]:
+        return self._pool_config
+
+    @property
+    def sqlite_profile(self) -> Optional[SqliteProfile]:
+        return self._sqlite_profile
+
+    @property
+    def scoped_sessions_enabled(self) -> bool:
+        return self._scoped_sessions_enabled
+
+    @property
+    def index_advisor(self) -> Optional[IndexAdvisor]:
+        return self._index_advisor
+
+    @property
+    def order_search(self) -> OrderSearch:
+        return self._order_search
+
     @property
     def is_connected(self) -> bool:
         return self._engine is not None
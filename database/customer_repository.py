@@ -1,11 +1,20 @@
 import uuid
 from typing import List, Optional
 
+from sqlalchemy import select, bindparam
 from sqlalchemy.orm import Session
 
 from models import Customer
 from enums import CustomerType
 from database.connection import get_db
+from database.approximate_counts import approximate_row_count
+from database.change_tracking import changed_attributes, row_exists, versioned_update
+from database.projections import CUSTOMER_LIST, CustomerRow
+
+
+_SELECT_CUSTOMER_BY_COMPANY_NAME = select(Customer).where(
+    Customer.company_name == bindparam('company_name')
+)
 
 
 class CustomerRepositoryError(Exception):
@@ -20,6 +29,10 @@ class CustomerAlreadyExistsError(CustomerRepositoryError):
     pass
 
 
+class CustomerConflictError(CustomerRepositoryError):
+    pass
+
+
 class CustomerRepository:
     def __init__(self):
         self._db = get_db()
@@ -27,6 +40,9 @@ class CustomerRepository:
     def _get_session(self) -> Session:
         return self._db.get_session()
 
+    def _get_read_session(self) -> Session:
+        return self._db.get_read_session()
+
     def create_customer(self, customer: Customer) -> None:
         if not customer.validate():
             raise ValueError("Invalid customer data")
@@ -54,7 +70,7 @@ class CustomerRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_customer_by_id(self, customer_id: str) -> Customer:
         session = self._get_session()
@@ -68,50 +84,49 @@ class CustomerRepository:
                 )
             return customer
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_customer_by_company_name(self, company_name: str) -> Customer:
         session = self._get_session()
         try:
-            customer = session.query(Customer).filter(
-                Customer.company_name == company_name
-            ).first()
+            customer = session.execute(
+                _SELECT_CUSTOMER_BY_COMPANY_NAME, {"company_name": company_name}
+            ).scalars().first()
             if not customer:
                 raise CustomerNotFoundError(
                     f"Customer '{company_name}' not found"
                 )
             return customer
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def update_customer(self, customer: Customer) -> None:
         if not customer.customer_id:
             raise ValueError("Customer ID is required")
         
+        customer.customer_type = int(customer.customer_type)
+        changes, _ = changed_attributes(customer)
+        if not changes:
+            return
+        
         session = self._get_session()
         try:
-            existing = session.query(Customer).filter(
-                Customer.customer_id == customer.customer_id
-            ).first()
-            if not existing:
-                raise CustomerNotFoundError(
-                    f"Customer with ID '{customer.customer_id}' not found"
+            if not versioned_update(session, customer, 'customer_id', changes):
+                if not row_exists(session, customer, 'customer_id'):
+                    raise CustomerNotFoundError(f"Customer with ID '{customer.customer_id}' not found")
+                raise CustomerConflictError(
+                    f"Customer with ID '{customer.customer_id}' was modified by another user"
                 )
-            customer.customer_type = int(customer.customer_type)
-
-            for key, value in customer.__dict__.items():
-                if not key.startswith('_') and key != 'customer_id':
-                    setattr(existing, key, value)
             
             session.commit()
-        except CustomerNotFoundError:
+        except CustomerRepositoryError:
             session.rollback()
             raise
         except Exception as e:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def delete_customer(self, customer_id: str) -> None:
         session = self._get_session()
@@ -131,44 +146,51 @@ class CustomerRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_all_customers(self) -> List[Customer]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Customer).all()
         finally:
-            session.close()
+            self._db.release_session(session)
+
+    def find_all_customer_rows(self) -> List[CustomerRow]:
+        session = self._get_read_session()
+        try:
+            return CUSTOMER_LIST.rows(session.execute(CUSTOMER_LIST.select()))
+        finally:
+            self._db.release_session(session)
 
     def find_customers_by_customer_type(
         self, customer_type: CustomerType
     ) -> List[Customer]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Customer).filter(
                 Customer.customer_type == int(customer_type)
             ).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_active_customers(self) -> List[Customer]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Customer).filter(Customer.is_active == True).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_customers_by_city(self, city: str) -> List[Customer]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Customer).filter(
                 Customer.city.like(f"%{city}%")
             ).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def search_customers(self, keyword: str) -> List[Customer]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Customer).filter(
                 (Customer.company_name.like(f"%{keyword}%")) |
@@ -176,14 +198,18 @@ class CustomerRepository:
                 (Customer.address.like(f"%{keyword}%"))
             ).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def count(self) -> int:
-        session = self._get_session()
+    def count(self, approximate: bool = False) -> int:
+        session = self._get_read_session()
         try:
+            if approximate:
+                estimate = approximate_row_count(session.connection(), Customer.__tablename__)
+                if estimate is not None:
+                    return estimate
             return session.query(Customer).count()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_or_create_customer(
         self, company_name: str, customer_type: CustomerType
@@ -210,4 +236,4 @@ class CustomerRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class DateRange:
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    def __post_init__(self):
+        if self.start is not None and self.end is not None and self.start >= self.end:
+            raise ValueError("Date range start must be before its end")
+
+    @classmethod
+    def of_days(cls, first: Optional[date] = None, last: Optional[date] = None) -> 'DateRange':
+        start = datetime.combine(first, time.min) if first else None
+        end = datetime.combine(last + timedelta(days=1), time.min) if last else None
+        return cls(start=start, end=end)
+
+    @property
+    def is_open(self) -> bool:
+        return self.start is None and self.end is None
+
+    def criteria(self, column) -> list:
+        criteria = []
+        if self.start is not None:
+            criteria.append(column >= self.start)
+        if self.end is not None:
+            criteria.append(column < self.end)
+        return criteria
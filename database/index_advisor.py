@@ -0,0 +1,298 @@
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Column, Index, MetaData, Table, event, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, ClauseElement
+from sqlalchemy.sql.expression import Executable
+
+from database.instrumentation import find_repository_caller
+
+
+MAX_INDEX_COLUMNS = 3
+
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_UNUSED = "unused"
+
+_EQUALITY_OPERATORS = {operators.eq, operators.in_op, operators.is_}
+_RANGE_OPERATORS = {
+    operators.lt, operators.le, operators.gt, operators.ge, operators.between_op,
+    operators.ne, operators.not_in_op,
+}
+_SQLITE_INDEX_PATTERN = re.compile(r"USING (?:COVERING )?INDEX (\S+)")
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement, prefix: str):
+        self.statement = statement
+        self.prefix = prefix
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    return f"{element.prefix} {compiler.process(element.statement, **kw)}"
+
+
+@dataclass
+class AccessPattern:
+    table: str
+    equality: Tuple[str, ...] = ()
+    ranges: Tuple[str, ...] = ()
+    sort: Tuple[str, ...] = ()
+    calls: int = 0
+    callers: Set[str] = field(default_factory=set)
+    sample: Optional[Executable] = field(default=None, repr=False, compare=False)
+    sample_parameters: Optional[Dict] = field(default=None, repr=False, compare=False)
+
+    @property
+    def key(self) -> Tuple:
+        return (self.table, self.equality, self.ranges, self.sort)
+
+    @property
+    def candidate_columns(self) -> Tuple[str, ...]:
+        columns = list(self.equality)
+        for name in self.sort + self.ranges:
+            if name not in columns:
+                columns.append(name)
+        return tuple(columns[:MAX_INDEX_COLUMNS])
+
+
+@dataclass
+class IndexRecommendation:
+    pattern: AccessPattern
+    columns: Tuple[str, ...]
+    status: str
+    plan: List[str] = field(default_factory=list)
+    index_used: Optional[str] = None
+    serving_index: Optional[str] = None
+    proposed_ddl: str = ""
+    validated: Optional[bool] = None
+
+
+def _table_column(element) -> Optional[Column]:
+    if isinstance(element, Column) and isinstance(element.table, Table):
+        return element
+    return None
+
+
+def _first_column(clause) -> Optional[Column]:
+    for element in visitors.iterate(clause):
+        column = _table_column(element)
+        if column is not None:
+            return column
+    return None
+
+
+def _append(target: Dict[str, List[str]], column: Column) -> None:
+    names = target.setdefault(column.table.name, [])
+    if column.name not in names:
+        names.append(column.name)
+
+
+def extract_access_patterns(statement) -> List[AccessPattern]:
+    equality: Dict[str, List[str]] = {}
+    ranges: Dict[str, List[str]] = {}
+    sort: Dict[str, List[str]] = {}
+
+    whereclause = getattr(statement, 'whereclause', None)
+    if whereclause is not None:
+        for element in visitors.iterate(whereclause):
+            if not isinstance(element, BinaryExpression):
+                continue
+            column = _table_column(element.left)
+            if column is None:
+                column = _table_column(element.right)
+            if column is None:
+                continue
+            if element.operator in _EQUALITY_OPERATORS:
+                _append(equality, column)
+            elif element.operator in _RANGE_OPERATORS:
+                _append(ranges, column)
+
+    clauses = list(getattr(statement, '_group_by_clauses', ()))
+    clauses += list(getattr(statement, '_order_by_clauses', ()))
+    for clause in clauses:
+        column = _first_column(clause)
+        if column is not None:
+            _append(sort, column)
+
+    patterns = []
+    for table_name in dict.fromkeys([*equality, *ranges, *sort]):
+        range_names = ranges.get(table_name, [])
+        patterns.append(AccessPattern(
+            table=table_name,
+            equality=tuple(n for n in equality.get(table_name, []) if n not in range_names),
+            ranges=tuple(range_names),
+            sort=tuple(sort.get(table_name, [])),
+        ))
+    return patterns
+
+
+class IndexAdvisor:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._patterns: Dict[Tuple, AccessPattern] = {}
+
+    def install(self, session_factory: sessionmaker) -> None:
+        event.listen(session_factory, "do_orm_execute", self._on_execute)
+
+    def uninstall(self, session_factory: sessionmaker) -> None:
+        event.remove(session_factory, "do_orm_execute", self._on_execute)
+
+    def _on_execute(self, orm_execute_state) -> None:
+        if orm_execute_state.is_select:
+            self.record(
+                orm_execute_state.statement,
+                find_repository_caller(),
+                orm_execute_state.parameters
+            )
+
+    def record(self, statement, caller: str = "", parameters: Optional[Dict] = None) -> None:
+        patterns = extract_access_patterns(statement)
+        if not patterns:
+            return
+        with self._lock:
+            for pattern in patterns:
+                recorded = self._patterns.setdefault(pattern.key, pattern)
+                recorded.calls += 1
+                if caller:
+                    recorded.callers.add(caller)
+                recorded.sample = statement
+                recorded.sample_parameters = dict(parameters) if parameters else None
+
+    def get_patterns(self) -> List[AccessPattern]:
+        with self._lock:
+            patterns = list(self._patterns.values())
+        return sorted(patterns, key=lambda p: p.calls, reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._patterns.clear()
+
+    def explain(self, conn: Connection, statement, parameters: Optional[Dict] = None) -> List[str]:
+        if conn.dialect.name == 'sqlite':
+            rows = conn.execute(Explain(statement, "EXPLAIN QUERY PLAN"), parameters).all()
+            return [row[3] for row in rows]
+        rows = conn.execute(Explain(statement, "EXPLAIN"), parameters).mappings().all()
+        return [
+            " ".join(f"{k}={v}" for k, v in row.items() if v is not None)
+            for row in rows
+        ]
+
+    def _read_plan(self, dialect_name: str, table: str, plan: List[str]) -> Tuple[bool, Optional[str]]:
+        full_scan = False
+        index_used = None
+        for detail in plan:
+            if dialect_name == 'sqlite':
+                if not re.match(rf"(SCAN|SEARCH) {re.escape(table)}\b", detail):
+                    continue
+                match = _SQLITE_INDEX_PATTERN.search(detail)
+                if match:
+                    index_used = index_used or match.group(1)
+                elif "INTEGER PRIMARY KEY" in detail:
+                    index_used = index_used or "PRIMARY"
+                if detail.startswith("SCAN"):
+                    full_scan = True
+            else:
+                if f"table={table} " not in f"{detail} ":
+                    continue
+                if re.search(r"\btype=(ALL|index)\b", detail):
+                    full_scan = True
+                match = re.search(r"\bkey=(\S+)", detail)
+                if match:
+                    index_used = index_used or match.group(1)
+        return full_scan, index_used
+
+    def _serving_index(self, conn: Connection, pattern: AccessPattern) -> Optional[str]:
+        inspector = inspect(conn)
+        candidates = [
+            (ix['name'], ix['column_names']) for ix in inspector.get_indexes(pattern.table)
+        ]
+        pk = inspector.get_pk_constraint(pattern.table)
+        if pk.get('constrained_columns'):
+            candidates.append(('PRIMARY', pk['constrained_columns']))
+        for uc in inspector.get_unique_constraints(pattern.table):
+            candidates.append((uc['name'], uc['column_names']))
+
+        leading = pattern.candidate_columns[:1]
+        for name, columns in candidates:
+            if leading and list(columns[:1]) == list(leading):
+                return name
+        return None
+
+    def _proposed_index(self, conn: Connection, pattern: AccessPattern, columns: Tuple[str, ...]) -> Index:
+        table = Table(pattern.table, MetaData(), autoload_with=conn)
+        name = f"ix_{pattern.table}_{'_'.join(c.lower() for c in columns)}"[:64]
+        return Index(name, *[table.c[c] for c in columns])
+
+    def _validate(self, conn: Connection, index: Index, pattern: AccessPattern) -> Optional[bool]:
+        if conn.dialect.name != 'sqlite':
+            return None
+        conn.exec_driver_sql("SAVEPOINT index_advisor")
+        try:
+            index.create(conn)
+            _, index_used = self._read_plan(
+                'sqlite', pattern.table, self.explain(conn, pattern.sample, pattern.sample_parameters)
+            )
+            return index_used == index.name
+        finally:
+            conn.exec_driver_sql("ROLLBACK TO SAVEPOINT index_advisor")
+            conn.exec_driver_sql("RELEASE SAVEPOINT index_advisor")
+
+    def recommend(self, engine: Engine, validate: bool = True) -> List[IndexRecommendation]:
+        recommendations = []
+        with engine.connect() as conn:
+            for pattern in self.get_patterns():
+                if pattern.sample is None or not pattern.candidate_columns:
+                    continue
+                plan = self.explain(conn, pattern.sample, pattern.sample_parameters)
+                full_scan, index_used = self._read_plan(engine.dialect.name, pattern.table, plan)
+                if not (pattern.equality or pattern.ranges):
+                    full_scan = False
+                serving = self._serving_index(conn, pattern)
+
+                recommendation = IndexRecommendation(
+                    pattern=pattern,
+                    columns=pattern.candidate_columns,
+                    status=STATUS_OK,
+                    plan=plan,
+                    index_used=index_used,
+                    serving_index=serving,
+                )
+                if full_scan and serving is None:
+                    recommendation.status = STATUS_MISSING
+                    index = self._proposed_index(conn, pattern, recommendation.columns)
+                    recommendation.proposed_ddl = str(CreateIndex(index).compile(dialect=engine.dialect))
+                    if validate:
+                        recommendation.validated = self._validate(conn, index, pattern)
+                elif full_scan:
+                    recommendation.status = STATUS_UNUSED
+                recommendations.append(recommendation)
+            conn.rollback()
+        return recommendations
+
+    def format_report(self, recommendations: List[IndexRecommendation]) -> str:
+        lines = []
+        for rec in recommendations:
+            pattern = rec.pattern
+            lines.append(
+                f"[{rec.status}] {pattern.table} calls={pattern.calls} "
+                f"eq={list(pattern.equality)} range={list(pattern.ranges)} sort={list(pattern.sort)} "
+                f"callers={sorted(pattern.callers)}"
+            )
+            lines.append(f"    index used: {rec.index_used or '-'}; serving index: {rec.serving_index or '-'}")
+            if rec.proposed_ddl:
+                validated = {True: "yes", False: "no", None: "not checked"}[rec.validated]
+                lines.append(f"    propose: {rec.proposed_ddl.strip()} (validated: {validated})")
+            for detail in rec.plan:
+                lines.append(f"    plan: {detail}")
+        return "\n".join(lines)
@@ -0,0 +1,191 @@
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from database.pool import env_bool, env_float, env_int
+
+
+SLOW_QUERY_LOGGER_NAME = "database.slow_query"
+UNKNOWN_CALLER = "<unknown>"
+ASYNC_CALLER = "<async>"
+
+_DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_APP_DIR = os.path.dirname(_DATABASE_DIR)
+
+
+def _app_path(path: str) -> str:
+    return path if os.path.isabs(path) else os.path.join(_APP_DIR, path)
+
+
+@dataclass
+class InstrumentationConfig:
+    enabled: bool = False
+    slow_query_ms: float = 200.0
+    log_path: str = os.path.join(_APP_DIR, "logs", "slow_queries.log")
+    log_max_bytes: int = 5 * 1024 * 1024
+    log_backup_count: int = 5
+    max_statement_length: int = 2000
+
+    @classmethod
+    def from_env(cls) -> 'InstrumentationConfig':
+        defaults = cls()
+        return cls(
+            enabled=env_bool('DB_QUERY_INSTRUMENTATION', defaults.enabled),
+            slow_query_ms=env_float('DB_SLOW_QUERY_MS', defaults.slow_query_ms),
+            log_path=_app_path(os.environ.get('DB_SLOW_QUERY_LOG', defaults.log_path)),
+            log_max_bytes=env_int('DB_SLOW_QUERY_LOG_MAX_BYTES', defaults.log_max_bytes),
+            log_backup_count=env_int('DB_SLOW_QUERY_LOG_BACKUPS', defaults.log_backup_count),
+        )
+
+
+@dataclass
+class StatementStats:
+    caller: str
+    calls: int = 0
+    slow_calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    total_rows: int = 0
+    counted_calls: int = 0
+    last_statement: str = ""
+
+    @property
+    def avg_time(self) -> float:
+        if self.calls == 0:
+            return 0.0
+        return self.total_time / self.calls
+
+
+def find_repository_caller() -> str:
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (filename.endswith("_repository.py")
+                and os.path.dirname(os.path.abspath(filename)) == _DATABASE_DIR):
+            owner = frame.f_locals.get('self')
+            method = frame.f_code.co_name
+            if owner is not None:
+                return f"{type(owner).__name__}.{method}"
+            return method
+        frame = frame.f_back
+    return UNKNOWN_CALLER
+
+
+class QueryInstrumentation:
+    def __init__(self, config: Optional[InstrumentationConfig] = None):
+        self._config = config or InstrumentationConfig.from_env()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, StatementStats] = {}
+        self._logger: Optional[logging.Logger] = None
+
+    @property
+    def config(self) -> InstrumentationConfig:
+        return self._config
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def uninstall(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            caller = ASYNC_CALLER if conn.dialect.is_async else find_repository_caller()
+            context.query_started = (time.perf_counter(), caller)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, 'query_started', None)
+        if started is None:
+            return
+        start, caller = started
+        elapsed = time.perf_counter() - start
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        is_slow = elapsed * 1000.0 >= self._config.slow_query_ms
+
+        with self._lock:
+            stats = self._stats.get(caller)
+            if stats is None:
+                stats = StatementStats(caller=caller)
+                self._stats[caller] = stats
+            stats.calls += 1
+            stats.total_time += elapsed
+            if rows is not None:
+                stats.total_rows += rows
+                stats.counted_calls += 1
+            stats.last_statement = statement
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+            if is_slow:
+                stats.slow_calls += 1
+
+        if is_slow:
+            self._log_slow_query(caller, statement, parameters, elapsed, rows, executemany)
+
+    def _get_logger(self) -> logging.Logger:
+        if self._logger is not None:
+            return self._logger
+
+        logger = logging.getLogger(SLOW_QUERY_LOGGER_NAME)
+        logger.setLevel(logging.WARNING)
+        logger.propagate = False
+        if not logger.handlers:
+            log_dir = os.path.dirname(self._config.log_path)
+            if log_dir and not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+            handler = RotatingFileHandler(
+                self._config.log_path,
+                maxBytes=self._config.log_max_bytes,
+                backupCount=self._config.log_backup_count,
+                encoding='utf-8'
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+        self._logger = logger
+        return logger
+
+    def _log_slow_query(self, caller, statement, parameters, elapsed, rows, executemany):
+        statement_text = " ".join(statement.split())
+        if len(statement_text) > self._config.max_statement_length:
+            statement_text = statement_text[:self._config.max_statement_length] + "..."
+        params_text = repr(parameters)
+        if len(params_text) > 500:
+            params_text = params_text[:500] + "..."
+
+        try:
+            self._get_logger().warning(
+                "%.1fms rows=%s caller=%s executemany=%s sql=%s params=%s",
+                elapsed * 1000.0, "-" if rows is None else rows, caller, executemany, statement_text, params_text
+            )
+        except OSError:
+            pass
+
+    def get_stats(self) -> List[StatementStats]:
+        with self._lock:
+            stats = [
+                StatementStats(
+                    caller=s.caller,
+                    calls=s.calls,
+                    slow_calls=s.slow_calls,
+                    total_time=s.total_time,
+                    max_time=s.max_time,
+                    total_rows=s.total_rows,
+                    counted_calls=s.counted_calls,
+                    last_statement=s.last_statement,
+                )
+                for s in self._stats.values()
+            ]
+        return sorted(stats, key=lambda s: s.total_time, reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
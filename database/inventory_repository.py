@@ -1,12 +1,20 @@
 import uuid
 from typing import List, Optional, Dict, Any
 
-from sqlalchemy import func
+from sqlalchemy import func, select, bindparam
 from sqlalchemy.orm import Session
 
 from models import Inventory
 from enums import InventoryStatus
 from database.connection import get_db
+from database.approximate_counts import approximate_row_count
+from database.change_tracking import changed_attributes, row_exists, versioned_update
+from database.projections import INVENTORY_LIST, InventoryRow
+
+
+_SELECT_INVENTORY_BY_ID = select(Inventory).where(
+    Inventory.product_id == bindparam('product_id')
+)
 
 
 class InventoryRepositoryError(Exception):
@@ -21,6 +29,10 @@ class InventoryAlreadyExistsError(InventoryRepositoryError):
     pass
 
 
+class InventoryConflictError(InventoryRepositoryError):
+    pass
+
+
 class InventoryRepository:
     def __init__(self):
         self._db = get_db()
@@ -28,6 +40,9 @@ class InventoryRepository:
     def _get_session(self) -> Session:
         return self._db.get_session()
 
+    def _get_read_session(self) -> Session:
+        return self._db.get_read_session()
+
     def create_inventory(self, inventory: Inventory) -> None:
         if not inventory.validate():
             raise ValueError("Invalid inventory data")
@@ -45,21 +60,21 @@ class InventoryRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_inventory_by_id(self, product_id: str) -> Inventory:
         session = self._get_session()
         try:
-            inventory = session.query(Inventory).filter(
-                Inventory.product_id == product_id
-            ).first()
+            inventory = session.execute(
+                _SELECT_INVENTORY_BY_ID, {"product_id": product_id}
+            ).scalars().first()
             if not inventory:
                 raise InventoryNotFoundError(
                     f"Inventory with ID '{product_id}' not found"
                 )
             return inventory
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_inventory_by_name(self, product_name: str) -> Inventory:
         session = self._get_session()
@@ -73,7 +88,7 @@ class InventoryRepository:
                 )
             return inventory
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def update_inventory(self, inventory: Inventory) -> None:
         if not inventory.product_id:
@@ -81,29 +96,28 @@ class InventoryRepository:
         
         inventory.update_status()
         
+        changes, _ = changed_attributes(inventory)
+        if not changes:
+            return
+        
         session = self._get_session()
         try:
-            existing = session.query(Inventory).filter(
-                Inventory.product_id == inventory.product_id
-            ).first()
-            if not existing:
-                raise InventoryNotFoundError(
-                    f"Inventory with ID '{inventory.product_id}' not found"
+            if not versioned_update(session, inventory, 'product_id', changes):
+                if not row_exists(session, inventory, 'product_id'):
+                    raise InventoryNotFoundError(f"Inventory with ID '{inventory.product_id}' not found")
+                raise InventoryConflictError(
+                    f"Inventory with ID '{inventory.product_id}' was modified by another user"
                 )
             
-            for key, value in inventory.__dict__.items():
-                if not key.startswith('_') and key != 'product_id':
-                    setattr(existing, key, value)
-            
             session.commit()
-        except InventoryNotFoundError:
+        except InventoryRepositoryError:
             session.rollback()
             raise
         except Exception as e:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def delete_inventory(self, product_id: str) -> None:
         session = self._get_session()
@@ -123,66 +137,89 @@ class InventoryRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_all_inventory(self) -> List[Inventory]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Inventory).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_inventory_by_type(self, product_type: str) -> List[Inventory]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Inventory).filter(
                 Inventory.product_type == product_type
             ).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_inventory_by_id(self, product_id: str) -> List[Inventory]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Inventory).filter(
                 Inventory.product_id == product_id
             ).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_inventory_by_status(self, status: InventoryStatus) -> List[Inventory]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Inventory).filter(
                 Inventory.status == int(status)
             ).all()
         finally:
-            session.close()
+            self._db.release_session(session)
+
+    def _search_criteria(self, keyword: str):
+        return (
+            (Inventory.product_name.like(f"%{keyword}%")) |
+            (Inventory.product_type.like(f"%{keyword}%")) |
+            (Inventory.manufacturer.like(f"%{keyword}%"))
+        )
 
     def search_inventory(self, keyword: str) -> List[Inventory]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
-            return session.query(Inventory).filter(
-                (Inventory.product_name.like(f"%{keyword}%")) |
-                (Inventory.product_type.like(f"%{keyword}%")) |
-                (Inventory.manufacturer.like(f"%{keyword}%"))
-            ).all()
+            return session.query(Inventory).filter(self._search_criteria(keyword)).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def count(self) -> int:
-        session = self._get_session()
+    def find_all_inventory_rows(self) -> List[InventoryRow]:
+        session = self._get_read_session()
+        try:
+            return INVENTORY_LIST.rows(session.execute(INVENTORY_LIST.select()))
+        finally:
+            self._db.release_session(session)
+
+    def search_inventory_rows(self, keyword: str) -> List[InventoryRow]:
+        session = self._get_read_session()
+        try:
+            return INVENTORY_LIST.rows(session.execute(
+                INVENTORY_LIST.select().where(self._search_criteria(keyword))
+            ))
+        finally:
+            self._db.release_session(session)
+
+    def count(self, approximate: bool = False) -> int:
+        session = self._get_read_session()
         try:
+            if approximate:
+                estimate = approximate_row_count(session.connection(), Inventory.__tablename__)
+                if estimate is not None:
+                    return estimate
             return session.query(Inventory).count()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def update_stock(self, product_id: str, quantity_change: int) -> None:
         session = self._get_session()
         try:
-            inventory = session.query(Inventory).filter(
-                Inventory.product_id == product_id
-            ).first()
+            inventory = session.execute(
+                _SELECT_INVENTORY_BY_ID, {"product_id": product_id}
+            ).scalars().first()
             if not inventory:
                 raise InventoryNotFoundError(
                     f"Inventory with ID '{product_id}' not found"
@@ -201,7 +238,7 @@ class InventoryRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_or_create_inventory(
         self,
@@ -236,10 +273,10 @@ class InventoryRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_sales_by_product_type(self) -> List[Dict[str, Any]]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             results = session.query(
                 Inventory.product_type,
@@ -255,4 +292,4 @@ class InventoryRepository:
                 "total_stock": r[2] or 0,
             } for r in results]
         finally:
-            session.close()
+            self._db.release_session(session)
@@ -0,0 +1,419 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+    delete, func, inspect, insert, select, text
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+from models.order import Order
+from models.key_types import COMPACT_KEYS, HashKey, SurrogateKey, UuidKey
+from models import OrderStatsSummary, OrderHeader, ArchivedOrder
+from database.order_stats import rebuild_order_stats_summary
+from database.order_search import install_order_search
+from database.order_headers import rebuild_order_headers
+from database.approximate_counts import install_row_counts
+from database.pool import env_float
+
+
+schema_metadata = MetaData()
+
+schema_version_table = Table(
+    'schema_version',
+    schema_metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('description', String(200), nullable=False, default=''),
+    Column('applied_at', DateTime, nullable=False, default=datetime.now),
+)
+
+schema_setting_table = Table(
+    'schema_setting',
+    schema_metadata,
+    Column('name', String(64), primary_key=True),
+    Column('value', String(200), nullable=False, default=''),
+)
+
+MIGRATION_LOCK_NAME = 'order_system_schema_migration'
+
+KEY_STORAGE_SETTING = 'key_storage'
+ORDER_SEARCH_SETTING = 'order_search'
+COMPACT_KEY_STORAGE = 'compact'
+STRING_KEY_STORAGE = 'string'
+
+
+@dataclass
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def create_index_if_missing(conn: Connection, index: Index) -> None:
+    index.create(conn, checkfirst=True)
+
+
+def add_column_if_missing(conn: Connection, table_name: str, column: Column) -> None:
+    existing = {c['name'] for c in inspect(conn).get_columns(table_name)}
+    if column.name in existing:
+        return
+    column_ddl = CreateColumn(column).compile(dialect=conn.dialect)
+    table_ddl = conn.dialect.identifier_preparer.quote(table_name)
+    conn.exec_driver_sql(f"ALTER TABLE {table_ddl} ADD COLUMN {column_ddl}")
+
+
+baseline_metadata = MetaData()
+
+Table(
+    'customer',
+    baseline_metadata,
+    Column('customer_id', UuidKey(), primary_key=True),
+    Column('company_name', String(200), unique=True, nullable=False, index=True),
+    Column('customer_type', Integer),
+    Column('contact_person', String(50)),
+    Column('contact_phone', String(20)),
+    Column('contact_email', String(100)),
+    Column('address', String(500)),
+    Column('city', String(50)),
+    Column('province', String(50)),
+    Column('postal_code', String(10)),
+    Column('tax_id', String(50)),
+    Column('credit_level', Integer),
+    Column('notes', Text),
+    Column('is_active', Boolean),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+)
+
+Table(
+    'inventory',
+    baseline_metadata,
+    Column('product_id', String(64), primary_key=True),
+    Column('product_type', String(100), nullable=False),
+    Column('manufacturer', String(200), nullable=False),
+    Column('product_name', String(200), nullable=False, index=True),
+    Column('product_model', String(100)),
+    Column('stock_quantity', Integer),
+    Column('sold_quantity', Integer),
+    Column('status', Integer),
+    Column('expected_arrival', DateTime, nullable=True),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+)
+
+Table(
+    'user',
+    baseline_metadata,
+    Column('user_id', UuidKey(), primary_key=True),
+    Column('username', String(50), unique=True, nullable=False, index=True),
+    Column('password_hash', String(128), nullable=False),
+    Column('display_name', String(100)),
+    Column('role', Integer),
+    Column('department', String(100)),
+    Column('email', String(100)),
+    Column('phone', String(20)),
+    Column('is_active', Boolean),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+    Column('last_login_at', DateTime, nullable=True),
+)
+
+Table(
+    'return_request',
+    baseline_metadata,
+    Column('return_request_id', String(64), primary_key=True),
+    Column('order_id', String(50), nullable=False, index=True),
+    Column('product_id', String(64), ForeignKey('inventory.product_id'), nullable=False),
+    Column('quantity', Integer, nullable=False),
+    Column('reason', Integer, nullable=False),
+    Column('description', Text),
+    Column('status', Integer),
+    Column('customer_name', String(200), nullable=False),
+    Column('reviewer_id', UuidKey(), nullable=True),
+    Column('review_comment', Text),
+    Column('reviewed_at', DateTime, nullable=True),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+)
+
+Table(
+    'order',
+    baseline_metadata,
+    *(
+        [
+            Column('id', SurrogateKey, primary_key=True, autoincrement=True),
+            Column('Hash', HashKey(), unique=True, nullable=False),
+        ] if COMPACT_KEYS else [
+            Column('Hash', HashKey(), primary_key=True, nullable=False),
+        ]
+    ),
+    Column('customer_type', Integer),
+    Column('customer_name', String(200), nullable=False),
+    Column('sales', String(100), nullable=False),
+    Column('order_id', String(50), nullable=False, index=True),
+    Column('tracking_number', String(100)),
+    Column('status', Integer, nullable=False),
+    Column('order_time', DateTime, nullable=False),
+    Column('payment_time', DateTime, nullable=True),
+    Column('ship_deadline', DateTime, nullable=True),
+    Column('product_id', String(64), ForeignKey('inventory.product_id'), nullable=False),
+    Column('quantity', Integer, nullable=False),
+    Column('return_request_id', String(64), index=True, nullable=True),
+    Column('customer_id', UuidKey(), ForeignKey('customer.customer_id'), index=True, nullable=True),
+    Column('created_by_id', UuidKey(), ForeignKey('user.user_id'), index=True, nullable=True),
+    Column('return_applied', Boolean),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+)
+
+
+def _v1_baseline(conn: Connection) -> None:
+    baseline_metadata.create_all(conn)
+
+
+def _v2_order_stats_summary(conn: Connection) -> None:
+    OrderStatsSummary.__table__.create(conn, checkfirst=True)
+    rebuild_order_stats_summary(conn)
+
+
+def _v3_row_versions(conn: Connection) -> None:
+    for table_name in ('order', 'customer', 'user', 'inventory'):
+        add_column_if_missing(
+            conn, table_name,
+            Column('version', Integer, nullable=False, server_default='1')
+        )
+
+
+def _v4_order_search(conn: Connection) -> None:
+    install_order_search(conn)
+
+
+ORDER_INDEX_PACK = [
+    'ix_order_status_ship_deadline',
+    'ix_order_ship_deadline_hash',
+    'ix_order_sales_status',
+    'ix_order_product_id',
+    'ix_order_tracking_number',
+]
+
+
+def _v5_order_index_pack(conn: Connection) -> None:
+    for index in Order.__table__.indexes:
+        if index.name in ORDER_INDEX_PACK:
+            create_index_if_missing(conn, index)
+
+
+ORDER_DATE_INDEXES = [
+    'ix_order_order_time',
+    'ix_order_payment_time',
+]
+
+
+def _v6_order_date_indexes(conn: Connection) -> None:
+    for index in Order.__table__.indexes:
+        if index.name in ORDER_DATE_INDEXES:
+            create_index_if_missing(conn, index)
+
+
+def _v7_order_headers(conn: Connection) -> None:
+    OrderHeader.__table__.create(conn, checkfirst=True)
+    rebuild_order_headers(conn)
+
+
+def _v8_order_archive(conn: Connection) -> None:
+    ArchivedOrder.__table__.create(conn, checkfirst=True)
+
+
+def _v9_row_counts(conn: Connection) -> None:
+    install_row_counts(conn)
+
+
+def _v10_schema_settings(conn: Connection) -> None:
+    schema_setting_table.create(conn, checkfirst=True)
+
+
+def _v11_order_search_keys(conn: Connection) -> None:
+    if conn.dialect.name == 'sqlite':
+        install_order_search(conn)
+
+
+def _v12_order_created_at_index(conn: Connection) -> None:
+    for index in Order.__table__.indexes:
+        if index.name == 'ix_order_created_at_hash':
+            create_index_if_missing(conn, index)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline schema", _v1_baseline),
+    Migration(2, "order statistics summary table", _v2_order_stats_summary),
+    Migration(3, "optimistic row versions", _v3_row_versions),
+    Migration(4, "order substring search index", _v4_order_search),
+    Migration(5, "order composite index pack", _v5_order_index_pack),
+    Migration(6, "order date range indexes", _v6_order_date_indexes),
+    Migration(7, "order header rollup table", _v7_order_headers),
+    Migration(8, "order archive table", _v8_order_archive),
+    Migration(9, "approximate row counters", _v9_row_counts),
+    Migration(10, "schema settings", _v10_schema_settings),
+    Migration(11, "order search keyed by hash", _v11_order_search_keys),
+    Migration(12, "order insertion order index", _v12_order_created_at_index),
+]
+
+
+class MigrationError(Exception):
+    pass
+
+
+def _is_lock_timeout(error: DBAPIError) -> bool:
+    return isinstance(error, OperationalError) and 'database is locked' in str(error.orig)
+
+
+class MigrationRunner:
+    def __init__(
+        self,
+        engine: Engine,
+        migrations: Optional[List[Migration]] = None,
+        lock_timeout: Optional[float] = None
+    ):
+        self._engine = engine
+        self._migrations = sorted(
+            migrations if migrations is not None else MIGRATIONS,
+            key=lambda m: m.version
+        )
+        if lock_timeout is None:
+            lock_timeout = env_float('DB_MIGRATION_LOCK_TIMEOUT', 600.0)
+        self._lock_timeout = lock_timeout
+
+    @property
+    def latest_version(self) -> int:
+        if not self._migrations:
+            return 0
+        return self._migrations[-1].version
+
+    def current_version(self) -> int:
+        stmt = select(func.max(schema_version_table.c.version))
+        with self._engine.connect() as conn:
+            try:
+                version = conn.execute(stmt).scalar()
+            except DBAPIError:
+                conn.rollback()
+                if not inspect(conn).has_table(schema_version_table.name):
+                    return 0
+                version = conn.execute(stmt).scalar()
+        return version or 0
+
+    def pending(self) -> List[Migration]:
+        current = self.current_version()
+        return [m for m in self._migrations if m.version > current]
+
+    def run(self) -> int:
+        if self.current_version() >= self.latest_version:
+            return 0
+
+        with self._engine.begin() as conn:
+            for table in schema_metadata.sorted_tables:
+                conn.execute(CreateTable(table, if_not_exists=True))
+
+        applied = 0
+        with self._migration_lock():
+            for migration in self._migrations:
+                if migration.version <= self.current_version():
+                    continue
+                if self._apply(migration):
+                    applied += 1
+
+        return applied
+
+    @contextmanager
+    def _migration_lock(self) -> Iterator[None]:
+        if self._engine.dialect.name != 'mysql':
+            yield
+            return
+
+        with self._engine.connect() as conn:
+            acquired = conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": MIGRATION_LOCK_NAME, "timeout": int(self._lock_timeout)}
+            ).scalar()
+            if acquired != 1:
+                raise MigrationError("Timed out waiting for another process to finish migrating")
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME})
+
+    def _record_version(self, conn: Connection, migration: Migration) -> None:
+        conn.execute(
+            insert(schema_version_table).values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.now(),
+            )
+        )
+
+    def _apply(self, migration: Migration) -> bool:
+        deadline = time.monotonic() + self._lock_timeout
+        while True:
+            try:
+                with self._engine.begin() as conn:
+                    if conn.dialect.name == 'sqlite':
+                        self._record_version(conn, migration)
+                        migration.upgrade(conn)
+                    else:
+                        migration.upgrade(conn)
+                        self._record_version(conn, migration)
+                return True
+            except (IntegrityError, OperationalError) as e:
+                if self.current_version() >= migration.version:
+                    return False
+                if _is_lock_timeout(e) and time.monotonic() < deadline:
+                    time.sleep(0.5)
+                    continue
+                raise MigrationError(
+                    f"Migration {migration.version} ({migration.description}) failed: {e}"
+                ) from e
+            except Exception as e:
+                raise MigrationError(
+                    f"Migration {migration.version} ({migration.description}) failed: {e}"
+                ) from e
+
+    def schema_settings(self) -> Dict[str, str]:
+        with self._engine.connect() as conn:
+            try:
+                rows = conn.execute(
+                    select(schema_setting_table.c.name, schema_setting_table.c.value)
+                ).all()
+            except DBAPIError:
+                conn.rollback()
+                return {}
+        return {row[0]: row[1] for row in rows}
+
+    def record_schema_settings(self, settings: Dict[str, str]) -> None:
+        with self._engine.begin() as conn:
+            conn.execute(
+                delete(schema_setting_table).where(schema_setting_table.c.name.in_(list(settings)))
+            )
+            conn.execute(
+                insert(schema_setting_table),
+                [{"name": name, "value": value} for name, value in settings.items()]
+            )
+
+    def detect_key_storage(self) -> str:
+        with self._engine.connect() as conn:
+            columns = {c['name'] for c in inspect(conn).get_columns(Order.__tablename__)}
+        return COMPACT_KEY_STORAGE if 'id' in columns else STRING_KEY_STORAGE
+
+    def verify_key_storage(self, key_storage: Optional[str] = None) -> str:
+        key_storage = key_storage or self.detect_key_storage()
+        expected = COMPACT_KEY_STORAGE if COMPACT_KEYS else STRING_KEY_STORAGE
+        if key_storage != expected:
+            names = {COMPACT_KEY_STORAGE: "compact binary", STRING_KEY_STORAGE: "string"}
+            raise MigrationError(
+                f"DB_COMPACT_KEYS expects {names[expected]} key storage "
+                f"but the database uses {names.get(key_storage, key_storage)} keys"
+            )
+        return key_storage
@@ -0,0 +1,121 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models import Order, ArchivedOrder, ARCHIVED_COLUMN_NAMES
+
+
+ARCHIVE_PARTITION_COLUMN = 'order_time'
+ARCHIVE_OVERFLOW_PARTITION = 'pmax'
+
+_order_table = Order.__table__
+_archive_table = ArchivedOrder.__table__
+
+
+class ArchivePartitionError(Exception):
+    pass
+
+
+def move_orders_to_archive(session: Session, hashes: List[str]) -> None:
+    if not hashes:
+        return
+    source = select(
+        *[_order_table.c[name] for name in ARCHIVED_COLUMN_NAMES],
+        literal(datetime.now(), DateTime)
+    ).where(_order_table.c.Hash.in_(hashes))
+    with session.no_autoflush:
+        session.execute(delete(_archive_table).where(_archive_table.c.Hash.in_(hashes)))
+        session.execute(
+            insert(_archive_table).from_select(ARCHIVED_COLUMN_NAMES + ['archived_at'], source)
+        )
+        session.execute(delete(_order_table).where(_order_table.c.Hash.in_(hashes)))
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def month_starts(first: date, through: date) -> List[date]:
+    months = []
+    month = _month_start(first)
+    while month <= _month_start(through):
+        months.append(month)
+        month = _next_month(month)
+    return months
+
+
+def _partition_definitions(months: List[date]) -> str:
+    definitions = [
+        f"PARTITION p{month.year:04d}{month.month:02d} "
+        f"VALUES LESS THAN ('{_next_month(month).isoformat()}')"
+        for month in months
+    ]
+    definitions.append(f"PARTITION {ARCHIVE_OVERFLOW_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return ", ".join(definitions)
+
+
+def archive_partitions(conn: Connection) -> List[str]:
+    if conn.dialect.name != 'mysql':
+        return []
+    rows = conn.execute(
+        text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name "
+            "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"table_name": _archive_table.name}
+    ).all()
+    return [row[0] for row in rows]
+
+
+def _partition_month(name: str) -> Optional[date]:
+    if name == ARCHIVE_OVERFLOW_PARTITION:
+        return None
+    return date(int(name[1:5]), int(name[5:7]), 1)
+
+
+def partition_order_archive(conn: Connection, through: Optional[date] = None) -> bool:
+    if conn.dialect.name != 'mysql':
+        return False
+    if archive_partitions(conn):
+        return False
+
+    through = through or date.today()
+    oldest = conn.execute(select(func.min(_archive_table.c.order_time))).scalar()
+    first = oldest.date() if oldest else through
+    conn.exec_driver_sql(
+        f"ALTER TABLE {_archive_table.name} PARTITION BY RANGE COLUMNS({ARCHIVE_PARTITION_COLUMN}) "
+        f"({_partition_definitions(month_starts(first, through))})"
+    )
+    return True
+
+
+def extend_archive_partitions(conn: Connection, through: Optional[date] = None) -> int:
+    partitions = archive_partitions(conn)
+    if not partitions:
+        return 0
+    if partitions[-1] != ARCHIVE_OVERFLOW_PARTITION:
+        raise ArchivePartitionError(
+            f"{_archive_table.name} has no '{ARCHIVE_OVERFLOW_PARTITION}' partition to split"
+        )
+
+    existing = [m for m in (_partition_month(name) for name in partitions) if m is not None]
+    through = through or date.today()
+    first = _next_month(existing[-1]) if existing else _month_start(through)
+    months = month_starts(first, through)
+    if not months:
+        return 0
+    conn.exec_driver_sql(
+        f"ALTER TABLE {_archive_table.name} REORGANIZE PARTITION {ARCHIVE_OVERFLOW_PARTITION} "
+        f"INTO ({_partition_definitions(months)})"
+    )
+    return len(months)
@@ -0,0 +1,86 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import Order
+
+
+_order_table = Order.__table__
+_INSERT_ONLY_ATTRIBUTES = {'created_at'}
+_SKIPPED_ATTRIBUTES = {'surrogate_id'}
+
+
+@dataclass
+class BulkChunkResult:
+    chunk_index: int
+    inserted: int = 0
+    updated: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated
+
+
+@dataclass
+class BulkUpsertResult:
+    chunks: List[BulkChunkResult] = field(default_factory=list)
+
+    @property
+    def inserted(self) -> int:
+        return sum(c.inserted for c in self.chunks)
+
+    @property
+    def updated(self) -> int:
+        return sum(c.updated for c in self.chunks)
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated
+
+
+def prepare_order_row(order: Order) -> Dict[str, Any]:
+    row = {}
+    for attr in Order.__mapper__.column_attrs:
+        if attr.key in _SKIPPED_ATTRIBUTES:
+            continue
+        column = attr.columns[0]
+        value = getattr(order, attr.key)
+        if value is None and column.default is not None:
+            value = column.default.arg(None) if column.default.is_callable else column.default.arg
+            setattr(order, attr.key, value)
+        row[column.key] = value
+    return row
+
+
+def _update_columns() -> List[str]:
+    return [
+        attr.columns[0].key
+        for attr in Order.__mapper__.column_attrs
+        if attr.key not in _SKIPPED_ATTRIBUTES
+        and attr.key not in _INSERT_ONLY_ATTRIBUTES
+        and attr.key != 'hash'
+        and attr.key != 'version'
+    ]
+
+
+def build_order_upsert(dialect_name: str) -> Optional[Any]:
+    if dialect_name == 'sqlite':
+        stmt = sqlite_insert(_order_table)
+        return stmt.on_conflict_do_update(
+            index_elements=[_order_table.c.Hash],
+            set_=dict(
+                {name: stmt.excluded[name] for name in _update_columns()},
+                version=_order_table.c.version + 1
+            )
+        )
+    if dialect_name in ('mysql', 'mariadb'):
+        stmt = mysql_insert(_order_table)
+        return stmt.on_duplicate_key_update(
+            dict(
+                {name: stmt.inserted[name] for name in _update_columns()},
+                version=_order_table.c.version + 1
+            )
+        )
+    return None
@@ -0,0 +1,79 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+
+OrderChangeListener = Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]
+
+_PENDING_KEY = 'pending_order_changes'
+_SAVEPOINTS_KEY = 'order_change_savepoints'
+
+_listeners: List[OrderChangeListener] = []
+
+
+def add_order_change_listener(listener: OrderChangeListener) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_order_change_listener(listener: OrderChangeListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def record_order_changes(
+    session: Session,
+    removed: List[Dict[str, Any]],
+    added: List[Dict[str, Any]]
+) -> None:
+    if not _listeners or (not removed and not added):
+        return
+    session.connection().info.setdefault(_PENDING_KEY, []).append((removed, added))
+
+
+def _pending(conn: Connection) -> List[Tuple[list, list]]:
+    return conn.info.get(_PENDING_KEY, [])
+
+
+@event.listens_for(Engine, 'commit')
+def _on_commit(conn: Connection) -> None:
+    pending = conn.info.pop(_PENDING_KEY, None)
+    conn.info.pop(_SAVEPOINTS_KEY, None)
+    if not pending:
+        return
+    for listener in list(_listeners):
+        for removed, added in pending:
+            listener(removed, added)
+
+
+@event.listens_for(Engine, 'rollback')
+def _on_rollback(conn: Connection) -> None:
+    conn.info.pop(_PENDING_KEY, None)
+    conn.info.pop(_SAVEPOINTS_KEY, None)
+
+
+@event.listens_for(Engine, 'savepoint')
+def _on_savepoint(conn: Connection, name: str) -> None:
+    conn.info.setdefault(_SAVEPOINTS_KEY, []).append((name, len(_pending(conn))))
+
+
+def _pop_savepoint(conn: Connection, name: str) -> int:
+    savepoints = conn.info.get(_SAVEPOINTS_KEY, [])
+    while savepoints:
+        savepoint_name, mark = savepoints.pop()
+        if savepoint_name == name:
+            return mark
+    return len(_pending(conn))
+
+
+@event.listens_for(Engine, 'rollback_savepoint')
+def _on_rollback_savepoint(conn: Connection, name: str, context: Any) -> None:
+    mark = _pop_savepoint(conn, name)
+    del _pending(conn)[mark:]
+
+
+@event.listens_for(Engine, 'release_savepoint')
+def _on_release_savepoint(conn: Connection, name: str, context: Any) -> None:
+    _pop_savepoint(conn, name)
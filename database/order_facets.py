@@ -0,0 +1,88 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.sql import Select
+
+from models import Order, OrderStatsSummary, NO_DEADLINE_DAY
+from enums import CustomerType
+from database.date_range import DateRange
+
+
+FACET_DIMENSIONS = ('status', 'customer_type', 'sales')
+
+_summary_table = OrderStatsSummary.__table__
+
+
+@dataclass
+class OrderFacets:
+    total: int = 0
+    status: Dict[int, int] = field(default_factory=dict)
+    customer_type: Dict[int, int] = field(default_factory=dict)
+    sales: Dict[str, int] = field(default_factory=dict)
+
+    def count(self, dimension: str, value: Any) -> int:
+        return getattr(self, dimension).get(value, 0)
+
+
+def order_facet_statement(criteria: list) -> Select:
+    customer_type = func.coalesce(
+        Order.customer_type, literal_column(str(int(CustomerType.UNKNOWN)))
+    )
+    return select(
+        Order.status,
+        customer_type,
+        Order.sales,
+        func.count(Order.hash)
+    ).where(*criteria).group_by(Order.status, customer_type, Order.sales)
+
+
+def _is_day_boundary(value: Optional[datetime]) -> bool:
+    return value is None or value.time() == time.min
+
+
+def summary_facet_statement(ship_deadline: Optional[DateRange] = None) -> Optional[Select]:
+    table = _summary_table
+    stmt = select(
+        table.c.status,
+        table.c.customer_type,
+        table.c.sales,
+        func.sum(table.c.order_count)
+    ).group_by(table.c.status, table.c.customer_type, table.c.sales)
+    if ship_deadline is None or ship_deadline.is_open:
+        return stmt
+    if not (_is_day_boundary(ship_deadline.start) and _is_day_boundary(ship_deadline.end)):
+        return None
+
+    stmt = stmt.where(table.c.deadline_day != NO_DEADLINE_DAY)
+    if ship_deadline.start is not None:
+        stmt = stmt.where(table.c.deadline_day >= ship_deadline.start.date())
+    if ship_deadline.end is not None:
+        stmt = stmt.where(table.c.deadline_day < ship_deadline.end.date())
+    return stmt
+
+
+def split_order_facets(rows: Iterable, selected: Dict[str, Any]) -> OrderFacets:
+    facets = OrderFacets()
+    counts = {dimension: defaultdict(int) for dimension in FACET_DIMENSIONS}
+    for status, customer_type, sales, count in rows:
+        count = int(count or 0)
+        if count <= 0:
+            continue
+        values = {'status': status, 'customer_type': customer_type, 'sales': sales or ''}
+        misses = [
+            dimension for dimension in FACET_DIMENSIONS
+            if selected.get(dimension) is not None and values[dimension] != selected[dimension]
+        ]
+        if not misses:
+            facets.total += count
+        for dimension in FACET_DIMENSIONS:
+            if not misses or misses == [dimension]:
+                counts[dimension][values[dimension]] += count
+
+    facets.status = dict(counts['status'])
+    facets.customer_type = dict(counts['customer_type'])
+    facets.sales = dict(counts['sales'])
+    return facets
@@ -0,0 +1,99 @@
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import case, delete, func, insert, literal_column, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from models import Order, OrderHeader
+from enums import OrderStatus, CustomerType
+
+
+HEADER_ATTRIBUTES = (
+    'order_id', 'customer_name', 'customer_id', 'customer_type', 'sales', 'status',
+    'quantity', 'order_time', 'payment_time', 'ship_deadline',
+)
+HEADER_REFRESH_BATCH_SIZE = 500
+
+_header_table = OrderHeader.__table__
+_HEADER_COLUMNS = [
+    'order_id', 'customer_name', 'customer_id', 'customer_type', 'sales', 'status',
+    'line_count', 'total_quantity', 'order_time', 'payment_time', 'ship_deadline',
+]
+
+
+def header_source() -> Select:
+    customer_type = func.coalesce(
+        func.max(Order.customer_type), literal_column(str(int(CustomerType.UNKNOWN)))
+    )
+    status = case(
+        (func.min(Order.status) == func.max(Order.status), func.min(Order.status)),
+        else_=literal_column(str(int(OrderStatus.UNKNOWN)))
+    )
+    return select(
+        Order.order_id,
+        func.max(Order.customer_name),
+        func.max(Order.customer_id),
+        customer_type,
+        func.coalesce(func.max(Order.sales), literal_column("''")),
+        status,
+        func.count(Order.hash),
+        func.coalesce(func.sum(Order.quantity), literal_column('0')),
+        func.min(Order.order_time),
+        func.max(Order.payment_time),
+        func.min(Order.ship_deadline),
+    ).group_by(Order.order_id)
+
+
+def affected_order_ids(
+    removed: Iterable[Dict[str, Any]],
+    added: Iterable[Dict[str, Any]]
+) -> List[str]:
+    def header_view(snapshot: Dict[str, Any]) -> tuple:
+        return tuple(snapshot.get(name) for name in HEADER_ATTRIBUTES)
+
+    before = Counter(header_view(snapshot) for snapshot in removed)
+    after = Counter(header_view(snapshot) for snapshot in added)
+    changed = (before - after) + (after - before)
+    return list(dict.fromkeys(view[0] for view in changed if view[0]))
+
+
+def refresh_order_headers(session: Session, order_ids: List[str]) -> None:
+    with session.no_autoflush:
+        for start in range(0, len(order_ids), HEADER_REFRESH_BATCH_SIZE):
+            batch = order_ids[start:start + HEADER_REFRESH_BATCH_SIZE]
+            session.execute(delete(_header_table).where(_header_table.c.order_id.in_(batch)))
+            session.execute(
+                insert(_header_table).from_select(
+                    _HEADER_COLUMNS, header_source().where(Order.order_id.in_(batch))
+                )
+            )
+
+
+def apply_header_changes(
+    session: Session,
+    removed: Iterable[Dict[str, Any]],
+    added: Iterable[Dict[str, Any]]
+) -> None:
+    order_ids = affected_order_ids(removed, added)
+    if order_ids:
+        refresh_order_headers(session, order_ids)
+
+
+def rebuild_order_headers(conn: Connection) -> int:
+    conn.execute(delete(_header_table))
+    result = conn.execute(insert(_header_table).from_select(_HEADER_COLUMNS, header_source()))
+    return result.rowcount or 0
+
+
+def orders_per_day_statement(start: date, end: date, customer_id: str = "") -> Select:
+    day = func.date(OrderHeader.order_time)
+    stmt = select(day, func.count(OrderHeader.order_id)).where(
+        OrderHeader.order_time >= datetime.combine(start, datetime.min.time()),
+        OrderHeader.order_time < datetime.combine(end, datetime.min.time())
+    ).group_by(day).order_by(day)
+    if customer_id:
+        stmt = stmt.where(OrderHeader.customer_id == customer_id)
+    return stmt
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.sql import Select
+
+from models import Order, OrderStatsSummary, NO_DEADLINE_DAY
+from enums import OrderStatus
+
+
+DASHBOARD_COUNT_KEYS = [
+    "total_orders",
+    "pending_orders",
+    "completed_orders",
+    "near_deadline_orders",
+]
+
+NEAR_DEADLINE_DAYS = 3
+
+DEADLINE_BUCKET_LABELS = [
+    "已逾期",
+    "今日截止",
+    "明日截止",
+    "3日内截止",
+    "7日内截止",
+    "7日以上",
+]
+
+_summary_table = OrderStatsSummary.__table__
+
+
+def _sum_if(weight, *criteria):
+    return func.coalesce(func.sum(case((and_(*criteria), weight), else_=0)), 0)
+
+
+def _day_boundaries(now: Optional[datetime]) -> List[datetime]:
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return [today + timedelta(days=offset) for offset in (0, 1, 2, NEAR_DEADLINE_DAYS, 4, 8)]
+
+
+def _overview_columns(status, deadline, weight, boundaries: list, has_deadline: tuple = ()) -> list:
+    today, tomorrow, day_after_tomorrow, near_deadline_end, in_4_days, in_8_days = boundaries
+
+    pending_statuses = [int(s) for s in OrderStatus.get_pending_statuses()]
+    is_open = status.notin_([int(s) for s in OrderStatus.get_closed_statuses()])
+
+    buckets = [
+        (deadline < today, *has_deadline),
+        (deadline >= today, deadline < tomorrow),
+        (deadline >= tomorrow, deadline < day_after_tomorrow),
+        (deadline >= day_after_tomorrow, deadline < in_4_days),
+        (deadline >= in_4_days, deadline < in_8_days),
+        (deadline >= in_8_days,),
+    ]
+
+    columns = [
+        _sum_if(weight, status.in_(pending_statuses)).label("pending_orders"),
+        _sum_if(weight, status == int(OrderStatus.COMPLETED)).label("completed_orders"),
+        _sum_if(weight, is_open, deadline >= today, deadline < near_deadline_end).label("near_deadline_orders"),
+    ]
+    columns.extend(
+        _sum_if(weight, is_open, *criteria).label(f"deadline_bucket_{i}")
+        for i, criteria in enumerate(buckets)
+    )
+    return columns
+
+
+def build_order_overview_statement(
+    customer_id: str = "",
+    now: Optional[datetime] = None
+) -> Select:
+    stmt = select(
+        func.count(Order.hash).label("total_orders"),
+        *_overview_columns(Order.status, Order.ship_deadline, 1, _day_boundaries(now))
+    )
+    if customer_id:
+        stmt = stmt.where(Order.customer_id == customer_id)
+    return stmt
+
+
+def build_summary_overview_statement(now: Optional[datetime] = None) -> Select:
+    table = _summary_table
+    boundaries = [boundary.date() for boundary in _day_boundaries(now)]
+    return select(
+        func.coalesce(func.sum(table.c.order_count), 0).label("total_orders"),
+        *_overview_columns(
+            table.c.status, table.c.deadline_day, table.c.order_count, boundaries,
+            has_deadline=(table.c.deadline_day != NO_DEADLINE_DAY,)
+        )
+    )
+
+
+def split_order_overview(row) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    values = [int(v or 0) for v in row]
+    dashboard_counts = dict(zip(DASHBOARD_COUNT_KEYS, values))
+    deadline_stats = dict(zip(DEADLINE_BUCKET_LABELS, values[len(DASHBOARD_COUNT_KEYS):]))
+    return dashboard_counts, deadline_stats
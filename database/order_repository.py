@@ -1,18 +1,59 @@
-from datetime import datetime, timedelta
-from typing import List, Optional, Tuple, Dict, Any
-import math
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple, Dict, Any, Iterator, Callable, Union
 
-from sqlalchemy import func, and_, or_, case
+from sqlalchemy import func, and_, or_, case, select, bindparam, insert, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import IntegrityError
 
-from models import Order
+from models import Order, OrderHeader, ArchivedOrder
 from enums import OrderStatus, CustomerType
 from database.connection import get_db
+from database.pagination import OrderPage, encode_cursor, decode_cursor
+from database.date_range import DateRange
+from database.order_facets import (
+    OrderFacets, order_facet_statement, split_order_facets, summary_facet_statement
+)
+from database.projections import ORDER_LIST, OrderRow, Projection
+from database.order_overview import (
+    build_order_overview_statement, build_summary_overview_statement, split_order_overview
+)
+from database.order_bulk import (
+    BulkChunkResult, BulkUpsertResult, build_order_upsert, prepare_order_row
+)
+from database.order_stats import (
+    SUMMARY_ATTRIBUTES, apply_summary_changes, order_snapshot, rebuild_order_stats_summary,
+    summary_count_statement
+)
+from database.order_headers import (
+    apply_header_changes, orders_per_day_statement, rebuild_order_headers
+)
+from database.order_archive import (
+    extend_archive_partitions, move_orders_to_archive, partition_order_archive
+)
+from database.approximate_counts import approximate_row_count
+from database.order_events import record_order_changes
+from database.pool import env_bool
+from database.change_tracking import changed_attributes, mark_clean, row_exists, versioned_update
+
+
+_SELECT_ORDER_BY_HASH = select(Order).where(Order.hash == bindparam('hash'))
+_SELECT_ORDERS_BY_ORDER_ID = select(Order).where(Order.order_id == bindparam('order_id'))
+
+
+class OrderConflictError(ValueError):
+    pass
 
 
 class OrderRepository:
     PAGE_SIZE = 50
+    STREAM_BATCH_SIZE = 1000
+    STATUS_TRANSITION_BATCH_SIZE = 5000
+    ARCHIVE_BATCH_SIZE = 1000
+    KEYSET_BY_HASH = "hash"
+    KEYSET_BY_DEADLINE = "deadline"
+    KEYSET_BY_CREATED = "created"
+    KEYSET_BY_ORDER_ID = "order_id"
 
     def __init__(self):
         self._db = get_db()
@@ -20,6 +61,19 @@ class OrderRepository:
     def _get_session(self) -> Session:
         return self._db.get_session()
 
+    def _get_read_session(self) -> Session:
+        return self._db.get_read_session()
+
+    def _apply_order_changes(
+        self,
+        session: Session,
+        removed: List[Dict[str, Any]],
+        added: List[Dict[str, Any]]
+    ) -> None:
+        apply_summary_changes(session, removed, added)
+        apply_header_changes(session, removed, added)
+        record_order_changes(session, removed, added)
+
     def create_order(self, order: Order) -> None:
         if not order.check_entity():
             raise ValueError("Invalid order data")
@@ -28,184 +82,834 @@ class OrderRepository:
         
         session = self._get_session()
         try:
-            existing = session.query(Order).filter(Order.hash == order.hash).first()
+            existing = session.execute(
+                _SELECT_ORDER_BY_HASH, {"hash": order.hash}
+            ).scalars().first()
             if existing:
-                for key, value in order.__dict__.items():
-                    if not key.startswith('_'):
-                        setattr(existing, key, value)
+                removed = [order_snapshot(existing)]
+                changes, _ = changed_attributes(order, exclude=('hash',))
+                for key, value in changes.items():
+                    setattr(existing, key, value)
+                session.flush()
+                self._apply_order_changes(session, removed, [order_snapshot(existing)])
                 session.commit()
             else:
                 session.add(order)
+                session.flush()
+                self._apply_order_changes(session, [], [order_snapshot(order)])
                 session.commit()
         except Exception as e:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def find(
+    def create_orders_bulk(
+        self,
+        orders: List[Order],
+        chunk_size: int = 1000,
+        on_chunk: Optional[Callable[[BulkChunkResult], None]] = None
+    ) -> BulkUpsertResult:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        
+        unique_orders: Dict[str, Order] = {}
+        for order in orders:
+            if not order.check_entity():
+                raise ValueError(f"Invalid order data: '{order.order_id}'")
+            order.generate_hash()
+            unique_orders.pop(order.hash, None)
+            unique_orders[order.hash] = order
+        
+        pending = list(unique_orders.values())
+        result = BulkUpsertResult()
+        for chunk_index, start in enumerate(range(0, len(pending), chunk_size)):
+            chunk_result = self._upsert_order_chunk(
+                chunk_index, pending[start:start + chunk_size]
+            )
+            result.chunks.append(chunk_result)
+            if on_chunk:
+                on_chunk(chunk_result)
+        return result
+
+    def _upsert_order_chunk(self, chunk_index: int, orders: List[Order]) -> BulkChunkResult:
+        rows = [prepare_order_row(order) for order in orders]
+        hashes = [order.hash for order in orders]
+        
+        session = self._get_session()
+        try:
+            existing_orders = session.execute(
+                select(Order).where(Order.hash.in_(hashes))
+            ).scalars().all()
+            removed = [order_snapshot(existing) for existing in existing_orders]
+            existing_versions = {existing.hash: existing.version for existing in existing_orders}
+            existing_hashes = set(existing_versions)
+            for existing in existing_orders:
+                session.expunge(existing)
+            
+            upsert = build_order_upsert(session.get_bind().dialect.name)
+            if upsert is not None:
+                session.execute(upsert, rows)
+            else:
+                new_rows = [r for r, o in zip(rows, orders) if o.hash not in existing_hashes]
+                changed_rows = [
+                    dict(
+                        {k: v for k, v in r.items() if k not in ('Hash', 'created_at', 'version')},
+                        b_hash=o.hash
+                    )
+                    for r, o in zip(rows, orders) if o.hash in existing_hashes
+                ]
+                if new_rows:
+                    session.execute(insert(Order.__table__), new_rows)
+                if changed_rows:
+                    session.execute(
+                        update(Order.__table__).where(
+                            Order.hash == bindparam('b_hash')
+                        ).values(version=Order.__table__.c.version + 1),
+                        changed_rows
+                    )
+            
+            self._apply_order_changes(
+                session, removed, [order_snapshot(order) for order in orders]
+            )
+            session.commit()
+            
+            for order in orders:
+                order.version = existing_versions.get(order.hash, 0) + 1
+                mark_clean(order)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            self._db.release_session(session)
+        
+        return BulkChunkResult(
+            chunk_index=chunk_index,
+            inserted=len(orders) - len(existing_hashes),
+            updated=len(existing_hashes)
+        )
+
+    def _filter_criteria(
         self,
         order_id: str = "",
         customer_name: str = "",
         sales: str = "",
         status: Optional[OrderStatus] = None,
         customer_type: Optional[CustomerType] = None,
-        ship_deadline: Optional[datetime] = None
-    ) -> List[Order]:
-        if not any([order_id, customer_name, sales, status is not None,
-                   customer_type is not None, ship_deadline]):
-            return self.find_all()
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None,
+        owner_name: Optional[str] = None,
+        entity: type = Order
+    ) -> list:
+        criteria = []
+        if entity is Order:
+            contains = self._db.order_search.contains
+        else:
+            contains = lambda column_name, term: getattr(entity, column_name).like(f"%{term}%")
+        if order_id:
+            criteria.append(contains('order_id', order_id))
+        if customer_name:
+            criteria.append(contains('customer_name', customer_name))
+        if sales:
+            criteria.append(entity.sales == sales)
+        if status is not None and status != OrderStatus.UNKNOWN:
+            criteria.append(entity.status == int(status))
+        if customer_type is not None and customer_type != CustomerType.UNKNOWN:
+            criteria.append(entity.customer_type == int(customer_type))
+        if isinstance(ship_deadline, DateRange):
+            criteria.extend(ship_deadline.criteria(entity.ship_deadline))
+        elif ship_deadline:
+            criteria.append(entity.ship_deadline == ship_deadline)
+        if order_time is not None:
+            criteria.extend(order_time.criteria(entity.order_time))
+        if payment_time is not None:
+            criteria.extend(payment_time.criteria(entity.payment_time))
+        if owner_name is not None:
+            criteria.append(entity.customer_name == owner_name)
+        return criteria
+
+    def _pending_criteria(self, customer_id: str = "") -> list:
+        criteria = [
+            Order.status.notin_([int(s) for s in OrderStatus.get_closed_statuses()])
+        ]
+        if customer_id:
+            criteria.append(Order.customer_id == customer_id)
+        return criteria
+
+    def _keyset_lead(self, kind: str):
+        if kind == self.KEYSET_BY_DEADLINE:
+            return Order.ship_deadline
+        if kind == self.KEYSET_BY_CREATED:
+            return Order.created_at
+        return None
+
+    def _keyset_order_by(self, kind: str) -> tuple:
+        lead = self._keyset_lead(kind)
+        if lead is None:
+            return (Order.hash,)
+        return (lead, Order.hash)
+
+    def _keyset_values(self, kind: str, order: Order) -> list:
+        lead = self._keyset_lead(kind)
+        if lead is None:
+            return [order.hash]
+        return [getattr(order, lead.key), order.hash]
+
+    def _keyset_seek(self, kind: str, after: list):
+        lead = self._keyset_lead(kind)
+        if lead is None:
+            return Order.hash > after[0]
         
-        session = self._get_session()
+        value, order_hash = after
+        if value is None:
+            return or_(
+                lead.isnot(None),
+                and_(lead.is_(None), Order.hash > order_hash)
+            )
+        return and_(
+            lead >= value,
+            or_(lead > value, Order.hash > order_hash)
+        )
+
+    def _fetch_keyset_batch(
+        self,
+        kind: str,
+        criteria: list,
+        after: Optional[list],
+        limit: int,
+        projection: Optional[Projection] = None
+    ) -> list:
+        stmt = projection.select() if projection else select(Order)
+        stmt = stmt.where(*criteria)
+        if after is not None:
+            stmt = stmt.where(self._keyset_seek(kind, after))
+        stmt = stmt.order_by(*self._keyset_order_by(kind)).limit(limit)
+        
+        session = self._get_read_session()
         try:
-            query = session.query(Order)
-            
-            if order_id:
-                query = query.filter(Order.order_id.like(f"%{order_id}%"))
-            if customer_name:
-                query = query.filter(Order.customer_name.like(f"%{customer_name}%"))
-            if sales:
-                query = query.filter(Order.sales == sales)
-            if status is not None and status != OrderStatus.UNKNOWN:
-                query = query.filter(Order.status == int(status))
-            if customer_type is not None and customer_type != CustomerType.UNKNOWN:
-                query = query.filter(Order.customer_type == int(customer_type))
-            if ship_deadline:
-                query = query.filter(Order.ship_deadline == ship_deadline)
-            
-            total_count = query.count()
-            if total_count == 0:
-                return []
-            
-            orders = []
-            total_pages = math.ceil(total_count / self.PAGE_SIZE)
-            
-            for page in range(total_pages):
-                page_orders = query.offset(page * self.PAGE_SIZE).limit(self.PAGE_SIZE).all()
-                orders.extend(page_orders)
-            
+            if projection:
+                return projection.rows(session.execute(stmt))
+            orders = list(session.execute(stmt).scalars().all())
+            for order in orders:
+                session.expunge(order)
             return orders
         finally:
-            session.close()
+            self._db.release_session(session)
+
+    def _keyset_page(
+        self,
+        kind: str,
+        criteria: list,
+        cursor: Optional[str],
+        page_size: int,
+        projection: Optional[Projection] = None
+    ) -> OrderPage:
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        
+        after = decode_cursor(cursor, kind) if cursor else None
+        orders = self._fetch_keyset_batch(kind, criteria, after, page_size + 1, projection)
+        
+        next_cursor = None
+        if len(orders) > page_size:
+            orders = orders[:page_size]
+            next_cursor = encode_cursor(kind, self._keyset_values(kind, orders[-1]))
+        return OrderPage(orders=orders, next_cursor=next_cursor)
+
+    def _keyset_stream(
+        self,
+        kind: str,
+        criteria: list,
+        batch_size: int,
+        projection: Optional[Projection] = None
+    ) -> Iterator:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        
+        after = None
+        while True:
+            orders = self._fetch_keyset_batch(kind, criteria, after, batch_size, projection)
+            yield from orders
+            if len(orders) < batch_size:
+                return
+            after = self._keyset_values(kind, orders[-1])
+
+    def find_page(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None,
+        owner_name: Optional[str] = None
+    ) -> OrderPage:
+        criteria = self._filter_criteria(
+            order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time, owner_name
+        )
+        return self._keyset_page(self.KEYSET_BY_HASH, criteria, cursor, page_size)
+
+    def iter_orders(
+        self,
+        batch_size: int = PAGE_SIZE,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None,
+        owner_name: Optional[str] = None
+    ) -> Iterator[Order]:
+        criteria = self._filter_criteria(
+            order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time, owner_name
+        )
+        return self._keyset_stream(self.KEYSET_BY_HASH, criteria, batch_size)
+
+    def find(
+        self,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None,
+        include_archived: bool = False
+    ) -> List[Order]:
+        criteria = self._filter_criteria(
+            order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time
+        )
+        orders = list(self._keyset_stream(self.KEYSET_BY_CREATED, criteria, self.STREAM_BATCH_SIZE))
+        if include_archived:
+            session = self._get_read_session()
+            try:
+                orders += self._archived(session, *self._filter_criteria(
+                    order_id, customer_name, sales, status, customer_type, ship_deadline,
+                    order_time, payment_time, entity=ArchivedOrder
+                ))
+            finally:
+                self._db.release_session(session)
+        return orders
 
     def find_all(self) -> List[Order]:
-        session = self._get_session()
+        return list(self._keyset_stream(self.KEYSET_BY_CREATED, [], self.STREAM_BATCH_SIZE))
+
+    def find_rows_page(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None,
+        include_facets: bool = False,
+        owner_name: Optional[str] = None
+    ) -> OrderPage:
+        criteria = self._filter_criteria(
+            order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time, owner_name
+        )
+        page = self._keyset_page(self.KEYSET_BY_HASH, criteria, cursor, page_size, ORDER_LIST)
+        if include_facets and cursor is None:
+            page.facets = self.find_facets(
+                order_id, customer_name, sales, status, customer_type, ship_deadline,
+                order_time, payment_time, owner_name
+            )
+        return page
+
+    def find_facets(
+        self,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None,
+        owner_name: Optional[str] = None
+    ) -> OrderFacets:
+        selected = {
+            'status': int(status) if status is not None and status != OrderStatus.UNKNOWN else None,
+            'customer_type': (
+                int(customer_type)
+                if customer_type is not None and customer_type != CustomerType.UNKNOWN else None
+            ),
+            'sales': sales or None,
+        }
+        
+        stmt = None
+        if (not any([order_id, customer_name, order_time, payment_time]) and owner_name is None
+                and (ship_deadline is None or isinstance(ship_deadline, DateRange))):
+            stmt = summary_facet_statement(ship_deadline)
+        if stmt is None:
+            criteria = self._filter_criteria(
+                order_id, customer_name, "", None, None, ship_deadline, order_time, payment_time,
+                owner_name
+            )
+            stmt = order_facet_statement(criteria)
+        
+        session = self._get_read_session()
         try:
-            total_count = session.query(Order).count()
-            if total_count == 0:
-                return []
-            
-            orders = []
-            total_pages = math.ceil(total_count / self.PAGE_SIZE)
-            
-            for page in range(total_pages):
-                page_orders = session.query(Order).offset(page * self.PAGE_SIZE).limit(self.PAGE_SIZE).all()
-                orders.extend(page_orders)
-            
+            return split_order_facets(session.execute(stmt).all(), selected)
+        finally:
+            self._db.release_session(session)
+
+    def find_with_facets(
+        self,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None
+    ) -> Tuple[List[Order], OrderFacets]:
+        orders = self.find(
+            order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time
+        )
+        facets = self.find_facets(
+            order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time
+        )
+        return orders, facets
+
+    def iter_order_rows(
+        self,
+        batch_size: int = STREAM_BATCH_SIZE,
+        statuses: Optional[List[OrderStatus]] = None
+    ) -> Iterator[OrderRow]:
+        criteria = []
+        if statuses is not None:
+            criteria.append(Order.status.in_([int(s) for s in statuses]))
+        return self._keyset_stream(self.KEYSET_BY_HASH, criteria, batch_size, ORDER_LIST)
+
+    def find_rows(self, statuses: Optional[List[OrderStatus]] = None) -> List[OrderRow]:
+        return list(self.iter_order_rows(statuses=statuses))
+
+    def _archived(self, session: Session, *criteria) -> List[ArchivedOrder]:
+        return list(session.execute(select(ArchivedOrder).where(*criteria)).scalars().all())
+
+    def find_by_order_id(self, order_id: str, include_archived: bool = False) -> List[Order]:
+        session = self._get_read_session()
+        try:
+            orders = list(session.execute(
+                _SELECT_ORDERS_BY_ORDER_ID, {"order_id": order_id}
+            ).scalars().all())
+            if include_archived:
+                orders += self._archived(session, ArchivedOrder.order_id == order_id)
             return orders
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def find_by_order_id(self, order_id: str) -> List[Order]:
-        session = self._get_session()
+    def find_by_product_id(self, product_id: str, include_archived: bool = False) -> List[Order]:
+        session = self._get_read_session()
         try:
-            return session.query(Order).filter(Order.order_id == order_id).all()
+            orders = session.query(Order).filter(Order.product_id == product_id).all()
+            if include_archived:
+                orders += self._archived(session, ArchivedOrder.product_id == product_id)
+            return orders
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def find_by_product_id(self, product_id: str) -> List[Order]:
-        session = self._get_session()
+    def find_by_tracking_number(self, tracking_number: str, include_archived: bool = False) -> List[Order]:
+        session = self._get_read_session()
         try:
-            return session.query(Order).filter(Order.product_id == product_id).all()
+            orders = session.query(Order).filter(Order.tracking_number == tracking_number).all()
+            if include_archived:
+                orders += self._archived(session, ArchivedOrder.tracking_number == tracking_number)
+            return orders
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def find_by_status(self, status: OrderStatus) -> List[Order]:
-        session = self._get_session()
+    def find_by_status(self, status: OrderStatus, include_archived: bool = False) -> List[Order]:
+        session = self._get_read_session()
         try:
-            return session.query(Order).filter(Order.status == int(status)).all()
+            orders = session.query(Order).filter(Order.status == int(status)).all()
+            if include_archived:
+                orders += self._archived(session, ArchivedOrder.status == int(status))
+            return orders
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def find_by_customer_type(self, customer_type: CustomerType) -> List[Order]:
-        session = self._get_session()
+    def find_by_customer_type(self, customer_type: CustomerType, include_archived: bool = False) -> List[Order]:
+        session = self._get_read_session()
         try:
-            return session.query(Order).filter(Order.customer_type == int(customer_type)).all()
+            orders = session.query(Order).filter(Order.customer_type == int(customer_type)).all()
+            if include_archived:
+                orders += self._archived(session, ArchivedOrder.customer_type == int(customer_type))
+            return orders
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_by_ship_deadline(self, ship_deadline: datetime) -> List[Order]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(Order).filter(Order.ship_deadline == ship_deadline).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def find_by_sales(self, sales: str) -> List[Order]:
-        session = self._get_session()
+    def find_by_sales(self, sales: str, include_archived: bool = False) -> List[Order]:
+        session = self._get_read_session()
         try:
-            return session.query(Order).filter(Order.sales == sales).all()
+            orders = session.query(Order).filter(Order.sales == sales).all()
+            if include_archived:
+                orders += self._archived(session, ArchivedOrder.sales == sales)
+            return orders
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def find_by_customer_name(self, customer_name: str) -> List[Order]:
-        session = self._get_session()
+    def find_by_customer_name(self, customer_name: str, include_archived: bool = False) -> List[Order]:
+        session = self._get_read_session()
         try:
-            return session.query(Order).filter(
-                Order.customer_name.like(f"%{customer_name}%")
+            orders = session.query(Order).filter(
+                self._db.order_search.contains('customer_name', customer_name)
             ).all()
+            if include_archived:
+                orders += self._archived(
+                    session, ArchivedOrder.customer_name.like(f"%{customer_name}%")
+                )
+            return orders
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def find_by_customer_id(self, customer_id: str) -> List[Order]:
-        session = self._get_session()
+    def find_by_customer_id(self, customer_id: str, include_archived: bool = False) -> List[Order]:
+        session = self._get_read_session()
         try:
-            return session.query(Order).filter(Order.customer_id == customer_id).all()
+            orders = session.query(Order).filter(Order.customer_id == customer_id).all()
+            if include_archived:
+                orders += self._archived(session, ArchivedOrder.customer_id == customer_id)
+            return orders
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def update_order(self, order: Order) -> None:
+    def update_order(self, order: Order, allow_unversioned: bool = False) -> None:
         if not order.check_entity():
             raise ValueError("Invalid order data")
         
+        changes, previous = changed_attributes(order, exclude=('hash',))
+        if not changes:
+            return
+        
         session = self._get_session()
         try:
-            existing = session.query(Order).filter(Order.hash == order.hash).first()
-            if not existing:
-                raise ValueError("Order not found")
+            unknown = [key for key in SUMMARY_ATTRIBUTES if key in changes and key not in previous]
+            if order.version is None and allow_unversioned:
+                unknown = [
+                    attr.key for attr in Order.__mapper__.column_attrs
+                    if attr.key != 'hash' and not attr.columns[0].primary_key
+                ]
+            if unknown:
+                row = session.execute(
+                    select(*[getattr(Order, key) for key in unknown]).where(
+                        Order.hash == order.hash
+                    ).with_for_update()
+                ).first()
+                if row is None:
+                    raise ValueError("Order not found")
+                stored = dict(zip(unknown, row))
+                for key, value in stored.items():
+                    if key not in changes:
+                        set_committed_value(order, key, value)
+                previous.update({key: stored[key] for key in unknown if key in changes})
             
-            for key, value in order.__dict__.items():
-                if not key.startswith('_') and key != 'hash':
-                    setattr(existing, key, value)
+            removed = [dict(order_snapshot(order), **previous)]
+            if not versioned_update(session, order, 'hash', changes, allow_unversioned):
+                if not row_exists(session, order, 'hash'):
+                    raise ValueError("Order not found")
+                raise OrderConflictError(
+                    f"Order '{order.hash}' was modified by another user (version {order.version})"
+                )
             
+            self._apply_order_changes(session, removed, [order_snapshot(order)])
             session.commit()
         except Exception as e:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def delete_order(self, order: Order) -> None:
         session = self._get_session()
         try:
-            session.query(Order).filter(Order.hash == order.hash).delete()
+            existing = session.execute(
+                _SELECT_ORDER_BY_HASH, {"hash": order.hash}
+            ).scalars().first()
+            if existing:
+                removed = [order_snapshot(existing)]
+                session.delete(existing)
+                session.flush()
+                self._apply_order_changes(session, removed, [])
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            self._db.release_session(session)
+
+    def transition_status(
+        self,
+        hashes: List[str],
+        new_status: OrderStatus,
+        allowed_sources: Optional[List[OrderStatus]] = None,
+        values: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        if allowed_sources is None:
+            allowed_sources = OrderStatus.get_allowed_sources(new_status)
+        sources = [int(s) for s in allowed_sources if s != new_status]
+        hashes = list(dict.fromkeys(hashes))
+        if not hashes or not sources:
+            return []
+        
+        transitioned: List[str] = []
+        session = self._get_session()
+        try:
+            for start in range(0, len(hashes), self.STATUS_TRANSITION_BATCH_SIZE):
+                batch = hashes[start:start + self.STATUS_TRANSITION_BATCH_SIZE]
+                eligible = session.execute(
+                    select(Order).where(
+                        Order.hash.in_(batch),
+                        Order.status.in_(sources)
+                    ).with_for_update()
+                ).scalars().all()
+                if not eligible:
+                    continue
+                
+                removed = [order_snapshot(order) for order in eligible]
+                eligible_hashes = [order.hash for order in eligible]
+                for order in eligible:
+                    session.expunge(order)
+                
+                session.execute(
+                    update(Order).where(
+                        Order.hash.in_(eligible_hashes),
+                        Order.status.in_(sources)
+                    ).values(
+                        status=int(new_status),
+                        updated_at=datetime.now(),
+                        version=Order.version + 1,
+                        **(values or {})
+                    ).execution_options(synchronize_session=False)
+                )
+                
+                added = [
+                    dict(snapshot, status=int(new_status), **(values or {}))
+                    for snapshot in removed
+                ]
+                self._apply_order_changes(session, removed, added)
+                transitioned.extend(eligible_hashes)
+            
             session.commit()
+            return transitioned
         except Exception as e:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
+
+    def count(self, include_archived: bool = False, approximate: bool = False) -> int:
+        session = self._get_read_session()
+        try:
+            tables = [Order]
+            if include_archived:
+                tables.append(ArchivedOrder)
+            total = 0
+            for table in tables:
+                estimate = None
+                if approximate:
+                    estimate = approximate_row_count(session.connection(), table.__table__.name)
+                if estimate is None:
+                    estimate = session.execute(select(func.count(table.hash))).scalar() or 0
+                total += estimate
+            return total
+        finally:
+            self._db.release_session(session)
 
-    def count(self) -> int:
+    def rebuild_stats_summary(self) -> int:
         session = self._get_session()
         try:
-            return session.query(Order).count()
+            rows = rebuild_order_stats_summary(session.connection())
+            session.commit()
+            return rows
+        except Exception as e:
+            session.rollback()
+            raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def count_by_status(self, customer_id: str = "") -> List[Dict[str, Any]]:
+    def rebuild_order_headers(self) -> int:
         session = self._get_session()
         try:
+            rows = rebuild_order_headers(session.connection())
+            session.commit()
+            return rows
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            self._db.release_session(session)
+
+    def archive_orders(
+        self,
+        older_than_days: int,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        partition_archive: Optional[bool] = None
+    ) -> int:
+        if older_than_days < 0:
+            raise ValueError("older_than_days must not be negative")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if partition_archive is None:
+            partition_archive = env_bool('DB_ARCHIVE_PARTITIONS', False)
+        
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        statuses = [int(s) for s in OrderStatus.get_archivable_statuses()]
+        archived = 0
+        while True:
+            session = self._get_session()
+            try:
+                if partition_archive and archived == 0:
+                    conn = session.connection()
+                    if not partition_order_archive(conn):
+                        extend_archive_partitions(conn)
+                
+                eligible = session.execute(
+                    select(Order).where(
+                        Order.status.in_(statuses),
+                        Order.order_time < cutoff
+                    ).order_by(Order.order_time).limit(batch_size).with_for_update()
+                ).scalars().all()
+                removed = [order_snapshot(order) for order in eligible]
+                hashes = [order.hash for order in eligible]
+                for order in eligible:
+                    session.expunge(order)
+                
+                move_orders_to_archive(session, hashes)
+                self._apply_order_changes(session, removed, [])
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                raise e
+            finally:
+                self._db.release_session(session)
+            
+            archived += len(hashes)
+            if len(hashes) < batch_size:
+                return archived
+
+    def get_order_header(self, order_id: str) -> Optional[OrderHeader]:
+        session = self._get_read_session()
+        try:
+            return session.get(OrderHeader, order_id)
+        finally:
+            self._db.release_session(session)
+
+    def _header_criteria(
+        self,
+        customer_id: str = "",
+        status: Optional[OrderStatus] = None,
+        owner_name: Optional[str] = None
+    ) -> list:
+        criteria = []
+        if customer_id:
+            criteria.append(OrderHeader.customer_id == customer_id)
+        if owner_name is not None:
+            criteria.append(OrderHeader.customer_name == owner_name)
+        if status is not None:
+            criteria.append(OrderHeader.status == int(status))
+        return criteria
+
+    def find_order_headers_page(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+        customer_id: str = "",
+        status: Optional[OrderStatus] = None,
+        owner_name: Optional[str] = None
+    ) -> OrderPage:
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        
+        stmt = select(OrderHeader).where(
+            *self._header_criteria(customer_id, status, owner_name)
+        ).order_by(OrderHeader.order_id).limit(page_size + 1)
+        if cursor:
+            stmt = stmt.where(
+                OrderHeader.order_id > decode_cursor(cursor, self.KEYSET_BY_ORDER_ID)[0]
+            )
+        
+        session = self._get_read_session()
+        try:
+            headers = list(session.execute(stmt).scalars().all())
+        finally:
+            self._db.release_session(session)
+        
+        next_cursor = None
+        if len(headers) > page_size:
+            headers = headers[:page_size]
+            next_cursor = encode_cursor(self.KEYSET_BY_ORDER_ID, [headers[-1].order_id])
+        return OrderPage(orders=headers, next_cursor=next_cursor)
+
+    def count_order_headers(
+        self,
+        customer_id: str = "",
+        status: Optional[OrderStatus] = None,
+        approximate: bool = False
+    ) -> int:
+        session = self._get_read_session()
+        try:
+            if approximate and not customer_id and status is None:
+                estimate = approximate_row_count(session.connection(), OrderHeader.__tablename__)
+                if estimate is not None:
+                    return estimate
+            return session.execute(
+                select(func.count(OrderHeader.order_id)).where(
+                    *self._header_criteria(customer_id, status)
+                )
+            ).scalar() or 0
+        finally:
+            self._db.release_session(session)
+
+    def count_orders_per_day(
+        self,
+        start: date,
+        end: date,
+        customer_id: str = ""
+    ) -> List[Dict[str, Any]]:
+        session = self._get_read_session()
+        try:
+            results = session.execute(orders_per_day_statement(start, end, customer_id)).all()
+            return [{
+                "day": r[0] if isinstance(r[0], date) else date.fromisoformat(r[0]),
+                "count": int(r[1]),
+            } for r in results]
+        finally:
+            self._db.release_session(session)
+
+    def count_by_status(self, customer_id: str = "") -> List[Dict[str, Any]]:
+        session = self._get_read_session()
+        try:
+            if not customer_id:
+                results = session.execute(summary_count_statement('status')).all()
+                return [{"status": OrderStatus(r[0]), "count": int(r[1])} for r in results]
+            
             query = session.query(
                 Order.status,
                 func.count(Order.hash).label('count')
@@ -218,11 +922,15 @@ class OrderRepository:
             
             return [{"status": OrderStatus(r[0]), "count": r[1]} for r in results]
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def count_by_customer_type(self, customer_id: str = "") -> List[Dict[str, Any]]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
+            if not customer_id:
+                results = session.execute(summary_count_statement('customer_type')).all()
+                return [{"customer_type": CustomerType(r[0]), "count": int(r[1])} for r in results]
+            
             query = session.query(
                 Order.customer_type,
                 func.count(Order.hash).label('count')
@@ -235,11 +943,17 @@ class OrderRepository:
             
             return [{"customer_type": CustomerType(r[0]), "count": r[1]} for r in results]
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def count_by_sales(self, customer_id: str = "") -> List[Dict[str, Any]]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
+            if not customer_id:
+                results = session.execute(
+                    summary_count_statement('sales', exclude_empty=True)
+                ).all()
+                return [{"sales": r[0], "count": int(r[1])} for r in results]
+            
             query = session.query(
                 Order.sales,
                 func.count(Order.hash).label('count')
@@ -252,17 +966,29 @@ class OrderRepository:
             
             return [{"sales": r[0], "count": r[1]} for r in results]
         finally:
-            session.close()
+            self._db.release_session(session)
+
+    def find_open_deadlines(self) -> List[Tuple[str, datetime]]:
+        session = self._get_read_session()
+        try:
+            rows = session.execute(
+                select(Order.hash, Order.ship_deadline).where(
+                    *self._pending_criteria(), Order.ship_deadline.isnot(None)
+                )
+            ).all()
+            return [(row[0], row[1]) for row in rows]
+        finally:
+            self._db.release_session(session)
 
     def find_nearing_deadline(self, days: int, customer_id: str = "") -> List[Order]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             now = datetime.now()
             start_of_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
             end_of_target_day = start_of_today + timedelta(days=days)
             
             query = session.query(Order).filter(
-                Order.status != OrderStatus.COMPLETED,
+                Order.status.notin_([int(s) for s in OrderStatus.get_closed_statuses()]),
                 Order.ship_deadline >= start_of_today,
                 Order.ship_deadline < end_of_target_day
             ).order_by(Order.ship_deadline)
@@ -272,115 +998,48 @@ class OrderRepository:
             
             return query.all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def get_dashboard_counts(self, customer_id: str = "") -> Dict[str, Any]:
-        session = self._get_session()
+    def get_order_overview(
+        self,
+        customer_id: str = "",
+        approximate: bool = False
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        session = self._get_read_session()
         try:
-            now = datetime.now()
-            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            three_days_later = today + timedelta(days=3)
-            
-            pending_statuses = OrderStatus.get_pending_statuses()
-            
-            total_query = session.query(func.count(Order.hash))
-            if customer_id:
-                total_query = total_query.filter(Order.customer_id == customer_id)
-            total = total_query.scalar() or 0
-            
-            pending_query = session.query(func.count(Order.hash)).filter(
-                Order.status.in_([int(s) for s in pending_statuses])
-            )
-            if customer_id:
-                pending_query = pending_query.filter(Order.customer_id == customer_id)
-            pending = pending_query.scalar() or 0
-            
-            completed_query = session.query(func.count(Order.hash)).filter(
-                Order.status == int(OrderStatus.COMPLETED)
-            )
-            if customer_id:
-                completed_query = completed_query.filter(Order.customer_id == customer_id)
-            completed = completed_query.scalar() or 0
-            
-            near_deadline_query = session.query(func.count(Order.hash)).filter(
-                Order.status.notin_([int(OrderStatus.COMPLETED), int(OrderStatus.PAUSED)]),
-                Order.ship_deadline >= today,
-                Order.ship_deadline < three_days_later
-            )
-            if customer_id:
-                near_deadline_query = near_deadline_query.filter(Order.customer_id == customer_id)
-            near_deadline = near_deadline_query.scalar() or 0
-            
-            return {
-                "total_orders": total,
-                "pending_orders": pending,
-                "completed_orders": completed,
-                "near_deadline_orders": near_deadline,
-            }
+            if approximate and not customer_id:
+                stmt = build_summary_overview_statement()
+            else:
+                stmt = build_order_overview_statement(customer_id)
+            row = session.execute(stmt).one()
+            return split_order_overview(row)
         finally:
-            session.close()
+            self._db.release_session(session)
+
+    def get_dashboard_counts(self, customer_id: str = "") -> Dict[str, Any]:
+        return self.get_order_overview(customer_id)[0]
 
     def get_deadline_stats(self, customer_id: str = "") -> Dict[str, int]:
-        session = self._get_session()
-        try:
-            now = datetime.now()
-            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            tomorrow = today + timedelta(days=1)
-            day_after_tomorrow = today + timedelta(days=2)
-            in_4_days = today + timedelta(days=4)
-            in_8_days = today + timedelta(days=8)
-            
-            def get_count(start, end=None, is_overdue=False):
-                query = session.query(func.count(Order.hash)).filter(
-                    Order.status.notin_([OrderStatus.COMPLETED, OrderStatus.PAUSED])
-                )
-                if customer_id:
-                    query = query.filter(Order.customer_id == customer_id)
-                
-                if is_overdue:
-                    query = query.filter(Order.ship_deadline < start)
-                elif end:
-                    query = query.filter(
-                        Order.ship_deadline >= start,
-                        Order.ship_deadline < end
-                    )
-                else:
-                    query = query.filter(Order.ship_deadline >= start)
-                
-                return query.scalar() or 0
-            
-            return {
-                "已逾期": get_count(today, is_overdue=True),
-                "今日截止": get_count(today, tomorrow),
-                "明日截止": get_count(tomorrow, day_after_tomorrow),
-                "3日内截止": get_count(day_after_tomorrow, in_4_days),
-                "7日内截止": get_count(in_4_days, in_8_days),
-                "7日以上": get_count(in_8_days),
-            }
-        finally:
-            session.close()
+        return self.get_order_overview(customer_id)[1]
+
+    def find_pending_orders_page(
+        self,
+        customer_id: str = "",
+        cursor: Optional[str] = None,
+        page_size: int = PAGE_SIZE
+    ) -> OrderPage:
+        return self._keyset_page(
+            self.KEYSET_BY_DEADLINE, self._pending_criteria(customer_id), cursor, page_size
+        )
+
+    def iter_pending_orders_sorted(
+        self,
+        customer_id: str = "",
+        batch_size: int = PAGE_SIZE
+    ) -> Iterator[Order]:
+        return self._keyset_stream(
+            self.KEYSET_BY_DEADLINE, self._pending_criteria(customer_id), batch_size
+        )
 
     def find_pending_orders_sorted(self, customer_id: str = "") -> List[Order]:
-        session = self._get_session()
-        try:
-            query = session.query(Order).filter(
-                Order.status.notin_([int(OrderStatus.COMPLETED), int(OrderStatus.PAUSED)])
-            ).order_by(Order.ship_deadline)
-            
-            if customer_id:
-                query = query.filter(Order.customer_id == customer_id)
-            
-            total_count = query.count()
-            if total_count == 0:
-                return []
-            
-            orders = []
-            total_pages = math.ceil(total_count / self.PAGE_SIZE)
-            
-            for page in range(total_pages):
-                page_orders = query.offset(page * self.PAGE_SIZE).limit(self.PAGE_SIZE).all()
-                orders.extend(page_orders)
-            
-            return orders
-        finally:
-            session.close()
+        return list(self.iter_pending_orders_sorted(customer_id))
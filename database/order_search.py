@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+from typing import Dict
+
+from sqlalchemy import inspect, literal_column, select, table
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from models import Order
+
+
+ORDER_SEARCH_TABLE = 'order_search'
+SEARCH_COLUMNS = ('order_id', 'customer_name')
+SEARCH_ENABLED = 'enabled'
+SEARCH_DISABLED = 'disabled'
+
+MIN_TERM_LENGTH: Dict[str, int] = {
+    'sqlite': 3,
+    'mysql': 2,
+}
+
+_FULLTEXT_INDEXES = {
+    'order_id': 'ft_order_order_id',
+    'customer_name': 'ft_order_customer_name',
+}
+
+ORDER_SEARCH_KEY_TABLE = 'order_search_key'
+
+_SQLITE_COLUMNS = ', '.join(SEARCH_COLUMNS)
+_SQLITE_NEW_VALUES = ', '.join(f"new.{name}" for name in SEARCH_COLUMNS)
+_SQLITE_ORDER_VALUES = ', '.join(f"o.{name}" for name in SEARCH_COLUMNS)
+
+_SQLITE_INDEX_NEW = (
+    f"INSERT INTO {ORDER_SEARCH_KEY_TABLE}(Hash) VALUES (new.Hash); "
+    f"INSERT INTO {ORDER_SEARCH_TABLE}(rowid, {_SQLITE_COLUMNS}) "
+    f"VALUES (last_insert_rowid(), {_SQLITE_NEW_VALUES});"
+)
+_SQLITE_UNINDEX_OLD = (
+    f"DELETE FROM {ORDER_SEARCH_TABLE} WHERE rowid = "
+    f"(SELECT id FROM {ORDER_SEARCH_KEY_TABLE} WHERE Hash = old.Hash); "
+    f"DELETE FROM {ORDER_SEARCH_KEY_TABLE} WHERE Hash = old.Hash;"
+)
+
+_SQLITE_LEGACY_DDL = [
+    f"DROP TRIGGER IF EXISTS {ORDER_SEARCH_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {ORDER_SEARCH_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {ORDER_SEARCH_TABLE}_au",
+    f"DROP TABLE IF EXISTS {ORDER_SEARCH_TABLE}",
+]
+
+_SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {ORDER_SEARCH_TABLE} USING fts5("
+    f"{_SQLITE_COLUMNS}, tokenize='trigram')",
+    f"CREATE TABLE IF NOT EXISTS {ORDER_SEARCH_KEY_TABLE} ("
+    f"id INTEGER PRIMARY KEY, Hash NOT NULL UNIQUE)",
+    f"CREATE TRIGGER IF NOT EXISTS {ORDER_SEARCH_TABLE}_ai AFTER INSERT ON \"order\" BEGIN "
+    f"{_SQLITE_INDEX_NEW} END",
+    f"CREATE TRIGGER IF NOT EXISTS {ORDER_SEARCH_TABLE}_ad AFTER DELETE ON \"order\" BEGIN "
+    f"{_SQLITE_UNINDEX_OLD} END",
+    f"CREATE TRIGGER IF NOT EXISTS {ORDER_SEARCH_TABLE}_au AFTER UPDATE OF Hash, {_SQLITE_COLUMNS} "
+    f"ON \"order\" BEGIN {_SQLITE_UNINDEX_OLD} {_SQLITE_INDEX_NEW} END",
+]
+
+
+def _install_sqlite(conn: Connection) -> bool:
+    for ddl in _SQLITE_LEGACY_DDL:
+        conn.exec_driver_sql(ddl)
+    try:
+        with conn.begin_nested():
+            conn.exec_driver_sql(_SQLITE_DDL[0])
+    except DBAPIError:
+        return False
+    for ddl in _SQLITE_DDL[1:]:
+        conn.exec_driver_sql(ddl)
+    rebuild_order_search(conn)
+    return True
+
+
+def _install_mysql(conn: Connection) -> bool:
+    existing = {ix['name'] for ix in inspect(conn).get_indexes(Order.__tablename__)}
+    conn.exec_driver_sql("SET SESSION innodb_ft_enable_stopword = OFF")
+    for column_name, index_name in _FULLTEXT_INDEXES.items():
+        if index_name in existing:
+            continue
+        conn.exec_driver_sql(
+            f"ALTER TABLE `order` ADD FULLTEXT INDEX {index_name} ({column_name}) WITH PARSER ngram"
+        )
+    return True
+
+
+def install_order_search(conn: Connection) -> bool:
+    if conn.dialect.name == 'sqlite':
+        return _install_sqlite(conn)
+    if conn.dialect.name == 'mysql':
+        return _install_mysql(conn)
+    return False
+
+
+def rebuild_order_search(conn: Connection) -> None:
+    if conn.dialect.name == 'sqlite':
+        conn.exec_driver_sql(f"DELETE FROM {ORDER_SEARCH_TABLE}")
+        conn.exec_driver_sql(f"DELETE FROM {ORDER_SEARCH_KEY_TABLE}")
+        conn.exec_driver_sql(
+            f"INSERT INTO {ORDER_SEARCH_KEY_TABLE}(Hash) SELECT Hash FROM \"order\""
+        )
+        conn.exec_driver_sql(
+            f"INSERT INTO {ORDER_SEARCH_TABLE}(rowid, {_SQLITE_COLUMNS}) "
+            f"SELECT k.id, {_SQLITE_ORDER_VALUES} FROM \"order\" o "
+            f"JOIN {ORDER_SEARCH_KEY_TABLE} k ON k.Hash = o.Hash"
+        )
+
+
+@dataclass
+class OrderSearch:
+    dialect_name: str = ''
+    enabled: bool = False
+
+    @classmethod
+    def detect(cls, engine: Engine) -> 'OrderSearch':
+        dialect_name = engine.dialect.name
+        with engine.connect() as conn:
+            inspector = inspect(conn)
+            if dialect_name == 'sqlite':
+                enabled = inspector.has_table(ORDER_SEARCH_TABLE)
+            elif dialect_name == 'mysql':
+                existing = {ix['name'] for ix in inspector.get_indexes(Order.__tablename__)}
+                enabled = set(_FULLTEXT_INDEXES.values()) <= existing
+            else:
+                enabled = False
+        return cls(dialect_name=dialect_name, enabled=enabled)
+
+    @classmethod
+    def from_setting(cls, engine: Engine, setting: str) -> 'OrderSearch':
+        return cls(dialect_name=engine.dialect.name, enabled=setting == SEARCH_ENABLED)
+
+    @property
+    def setting(self) -> str:
+        return SEARCH_ENABLED if self.enabled else SEARCH_DISABLED
+
+    def can_search(self, term: str) -> bool:
+        if not self.enabled or '"' in term:
+            return False
+        min_length = MIN_TERM_LENGTH.get(self.dialect_name)
+        return min_length is not None and len(term) >= min_length
+
+    def contains(self, column_name: str, term: str):
+        column = getattr(Order, column_name)
+        pattern = column.like(f"%{term}%")
+        if column_name not in SEARCH_COLUMNS or not self.can_search(term):
+            return pattern
+
+        if self.dialect_name == 'sqlite':
+            matches = select(literal_column('rowid')).select_from(
+                table(ORDER_SEARCH_TABLE)
+            ).where(
+                literal_column(ORDER_SEARCH_TABLE).match(f'{column_name} : "{term}"')
+            )
+            hashes = select(literal_column(f'{ORDER_SEARCH_KEY_TABLE}.Hash')).select_from(
+                table(ORDER_SEARCH_KEY_TABLE)
+            ).where(literal_column(f'{ORDER_SEARCH_KEY_TABLE}.id').in_(matches))
+            return Order.hash.in_(hashes) & pattern
+
+        return column.match(f'"{term}"') & pattern
@@ -0,0 +1,148 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Tuple
+
+from sqlalchemy import and_, delete, func, insert, literal_column, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from models import Order, OrderStatsSummary, NO_DEADLINE_DAY
+from enums import CustomerType
+
+
+SummaryKey = Tuple[int, int, str, date]
+
+_summary_table = OrderStatsSummary.__table__
+_KEY_COLUMNS = ['status', 'customer_type', 'sales', 'deadline_day']
+
+SUMMARY_ATTRIBUTES = ('status', 'customer_type', 'sales', 'ship_deadline')
+
+
+def order_snapshot(order: Order) -> Dict[str, Any]:
+    return {
+        column.key: getattr(order, column.key)
+        for column in Order.__mapper__.column_attrs
+    }
+
+
+def _deadline_day(value: Any) -> date:
+    if value is None:
+        return NO_DEADLINE_DAY
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def summary_key(snapshot: Dict[str, Any]) -> SummaryKey:
+    customer_type = snapshot.get('customer_type')
+    if customer_type is None:
+        customer_type = CustomerType.UNKNOWN
+    return (
+        int(snapshot['status']),
+        int(customer_type),
+        snapshot.get('sales') or '',
+        _deadline_day(snapshot.get('ship_deadline')),
+    )
+
+
+def summary_deltas(
+    removed: Iterable[Dict[str, Any]],
+    added: Iterable[Dict[str, Any]]
+) -> Dict[SummaryKey, int]:
+    deltas: Dict[SummaryKey, int] = defaultdict(int)
+    for snapshot in removed:
+        deltas[summary_key(snapshot)] -= 1
+    for snapshot in added:
+        deltas[summary_key(snapshot)] += 1
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def _increment_statement(dialect_name: str):
+    if dialect_name == 'sqlite':
+        stmt = sqlite_insert(_summary_table)
+        return stmt.on_conflict_do_update(
+            index_elements=_KEY_COLUMNS,
+            set_={'order_count': _summary_table.c.order_count + stmt.excluded.order_count}
+        )
+    if dialect_name in ('mysql', 'mariadb'):
+        stmt = mysql_insert(_summary_table)
+        return stmt.on_duplicate_key_update(
+            order_count=_summary_table.c.order_count + stmt.inserted.order_count
+        )
+    return None
+
+
+def apply_summary_deltas(session: Session, deltas: Dict[SummaryKey, int]) -> None:
+    if not deltas:
+        return
+
+    rows = [
+        {
+            'status': key[0],
+            'customer_type': key[1],
+            'sales': key[2],
+            'deadline_day': key[3],
+            'order_count': delta,
+        }
+        for key, delta in deltas.items()
+    ]
+
+    stmt = _increment_statement(session.get_bind().dialect.name)
+    if stmt is not None:
+        session.execute(stmt, rows)
+        return
+
+    for row in rows:
+        result = session.execute(
+            update(_summary_table).where(
+                and_(*[_summary_table.c[name] == row[name] for name in _KEY_COLUMNS])
+            ).values(order_count=_summary_table.c.order_count + row['order_count'])
+        )
+        if result.rowcount == 0:
+            session.execute(insert(_summary_table).values(**row))
+
+
+def apply_summary_changes(
+    session: Session,
+    removed: Iterable[Dict[str, Any]],
+    added: Iterable[Dict[str, Any]]
+) -> None:
+    apply_summary_deltas(session, summary_deltas(removed, added))
+
+
+def rebuild_order_stats_summary(conn: Connection) -> int:
+    deadline_day = func.coalesce(
+        func.date(Order.ship_deadline),
+        literal_column(f"'{NO_DEADLINE_DAY.isoformat()}'")
+    )
+    customer_type = func.coalesce(
+        Order.customer_type, literal_column(str(int(CustomerType.UNKNOWN)))
+    )
+    source = select(
+        Order.status,
+        customer_type,
+        Order.sales,
+        deadline_day,
+        func.count(Order.hash)
+    ).group_by(Order.status, customer_type, Order.sales, deadline_day)
+
+    conn.execute(delete(_summary_table))
+    result = conn.execute(
+        insert(_summary_table).from_select(
+            _KEY_COLUMNS + ['order_count'], source
+        )
+    )
+    return result.rowcount or 0
+
+
+def summary_count_statement(column_name: str, exclude_empty: bool = False) -> Select:
+    column = _summary_table.c[column_name]
+    stmt = select(column, func.sum(_summary_table.c.order_count)).group_by(column).having(
+        func.sum(_summary_table.c.order_count) > 0
+    )
+    if exclude_empty:
+        stmt = stmt.where(column != '')
+    return stmt
@@ -0,0 +1,57 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Optional
+
+from models import Order
+from database.order_facets import OrderFacets
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass
+class OrderPage:
+    orders: List[Order] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    facets: Optional[OrderFacets] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(kind: str, values: List[Any]) -> str:
+    payload = json.dumps(
+        {"k": kind, "v": [_encode_value(v) for v in values]},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, kind: str) -> List[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        values = [_decode_value(v) for v in payload["v"]]
+        cursor_kind = payload["k"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid page cursor: {e}") from e
+    if cursor_kind != kind:
+        raise InvalidCursorError(
+            f"Page cursor for '{cursor_kind}' cannot be used for '{kind}'"
+        )
+    return values
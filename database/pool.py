@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    return value in ("1", "true", "yes", "on")
+
+
+@dataclass
+class PoolConfig:
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+
+    @classmethod
+    def from_env(cls) -> 'PoolConfig':
+        defaults = cls()
+        return cls(
+            pool_size=env_int('DB_POOL_SIZE', defaults.pool_size),
+            max_overflow=env_int('DB_MAX_OVERFLOW', defaults.max_overflow),
+            pool_timeout=env_float('DB_POOL_TIMEOUT', defaults.pool_timeout),
+            pool_recycle=env_int('DB_POOL_RECYCLE', defaults.pool_recycle),
+            pool_pre_ping=env_bool('DB_POOL_PRE_PING', defaults.pool_pre_ping),
+        )
+
+    def to_engine_kwargs(self) -> Dict[str, Any]:
+        return {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+
+
+@dataclass
+class PoolStats:
+    size: int = 0
+    checked_in: int = 0
+    checked_out: int = 0
+    overflow: int = 0
+    total_checkouts: int = 0
+    timeouts: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    @property
+    def avg_wait_time(self) -> float:
+        if self.total_checkouts == 0:
+            return 0.0
+        return self.total_wait_time / self.total_checkouts
+
+
+class InstrumentedQueuePool(QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._total_checkouts = 0
+        self._timeouts = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self._total_checkouts += 1
+            self._total_wait_time += waited
+            if waited > self._max_wait_time:
+                self._max_wait_time = waited
+        return record
+
+    def get_stats(self) -> PoolStats:
+        with self._stats_lock:
+            return PoolStats(
+                size=self.size(),
+                checked_in=self.checkedin(),
+                checked_out=self.checkedout(),
+                overflow=max(self.overflow(), 0),
+                total_checkouts=self._total_checkouts,
+                timeouts=self._timeouts,
+                total_wait_time=self._total_wait_time,
+                max_wait_time=self._max_wait_time,
+            )
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._total_checkouts = 0
+            self._timeouts = 0
+            self._total_wait_time = 0.0
+            self._max_wait_time = 0.0
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from models import Order, Inventory, Customer, ReturnRequest
+
+
+class OrderRow(NamedTuple):
+    hash: str
+    customer_type: int
+    customer_name: str
+    sales: str
+    order_id: str
+    tracking_number: Optional[str]
+    status: int
+    order_time: Optional[datetime]
+    payment_time: Optional[datetime]
+    ship_deadline: Optional[datetime]
+    product_id: str
+    quantity: int
+    return_request_id: Optional[str]
+    customer_id: Optional[str]
+    return_applied: Optional[bool]
+
+    to_array = Order.to_array
+    status_enum = Order.status_enum
+    customer_type_enum = Order.customer_type_enum
+
+
+class InventoryRow(NamedTuple):
+    product_id: str
+    product_type: str
+    manufacturer: str
+    product_name: str
+    product_model: Optional[str]
+    stock_quantity: int
+    sold_quantity: int
+    status: int
+    expected_arrival: Optional[datetime]
+
+    to_array = Inventory.to_array
+    to_public_array = Inventory.to_public_array
+    status_enum = Inventory.status_enum
+
+
+class CustomerRow(NamedTuple):
+    customer_id: str
+    company_name: str
+    customer_type: int
+    contact_person: Optional[str]
+    contact_phone: Optional[str]
+    contact_email: Optional[str]
+    city: Optional[str]
+    province: Optional[str]
+    credit_level: Optional[int]
+    is_active: Optional[bool]
+
+    get_credit_level_string = Customer.get_credit_level_string
+    customer_type_enum = Customer.customer_type_enum
+
+
+class ReturnRequestRow(NamedTuple):
+    return_request_id: str
+    order_id: str
+    product_id: str
+    quantity: int
+    reason: int
+    status: int
+    customer_name: str
+    reviewer_id: Optional[str]
+    reviewed_at: Optional[datetime]
+    created_at: Optional[datetime]
+
+    status_enum = ReturnRequest.status_enum
+    reason_enum = ReturnRequest.reason_enum
+
+
+@dataclass(frozen=True)
+class Projection:
+    entity: type
+    row_type: type
+    columns: Tuple[Any, ...]
+
+    def select(self) -> Select:
+        return select(*self.columns)
+
+    def rows(self, result: Iterable) -> List[Any]:
+        make = self.row_type._make
+        return [make(row) for row in result]
+
+
+def _projection(entity: type, row_type: type) -> Projection:
+    return Projection(
+        entity=entity,
+        row_type=row_type,
+        columns=tuple(getattr(entity, name) for name in row_type._fields),
+    )
+
+
+ORDER_LIST = _projection(Order, OrderRow)
+INVENTORY_LIST = _projection(Inventory, InventoryRow)
+CUSTOMER_LIST = _projection(Customer, CustomerRow)
+RETURN_REQUEST_LIST = _projection(ReturnRequest, ReturnRequestRow)
+
+LIST_PROJECTIONS: Dict[type, Projection] = {
+    Order: ORDER_LIST,
+    Inventory: INVENTORY_LIST,
+    Customer: CUSTOMER_LIST,
+    ReturnRequest: RETURN_REQUEST_LIST,
+}
+
+
+def projection_for(entity: type) -> Projection:
+    try:
+        return LIST_PROJECTIONS[entity]
+    except KeyError:
+        raise ValueError(f"No list projection for {entity.__name__}") from None
@@ -4,6 +4,8 @@ from sqlalchemy.orm import Session
 
 from models import ReturnRequest, ReturnStatus
 from database.connection import get_db
+from database.approximate_counts import approximate_row_count
+from database.projections import RETURN_REQUEST_LIST, ReturnRequestRow
 
 
 class ReturnRequestRepositoryError(Exception):
@@ -25,6 +27,9 @@ class ReturnRequestRepository:
     def _get_session(self) -> Session:
         return self._db.get_session()
 
+    def _get_read_session(self) -> Session:
+        return self._db.get_read_session()
+
     def create_return_request(self, return_request: ReturnRequest) -> None:
         if not return_request.validate():
             raise ValueError("Invalid return request data")
@@ -51,7 +56,7 @@ class ReturnRequestRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_return_request_by_id(self, return_request_id: str) -> ReturnRequest:
         session = self._get_session()
@@ -65,32 +70,48 @@ class ReturnRequestRepository:
                 )
             return return_request
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_by_order_id(self, order_id: str) -> List[ReturnRequest]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(ReturnRequest).filter(
                 ReturnRequest.order_id == order_id
             ).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_all(self) -> List[ReturnRequest]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(ReturnRequest).all()
         finally:
-            session.close()
+            self._db.release_session(session)
+
+    def find_all_rows(self) -> List[ReturnRequestRow]:
+        session = self._get_read_session()
+        try:
+            return RETURN_REQUEST_LIST.rows(session.execute(RETURN_REQUEST_LIST.select()))
+        finally:
+            self._db.release_session(session)
+
+    def find_rows_by_status(self, status: ReturnStatus) -> List[ReturnRequestRow]:
+        session = self._get_read_session()
+        try:
+            return RETURN_REQUEST_LIST.rows(session.execute(
+                RETURN_REQUEST_LIST.select().where(ReturnRequest.status == int(status))
+            ))
+        finally:
+            self._db.release_session(session)
 
     def find_by_status(self, status: ReturnStatus) -> List[ReturnRequest]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(ReturnRequest).filter(
                 ReturnRequest.status == int(status)
             ).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def update_return_request(self, return_request: ReturnRequest) -> None:
         if not return_request.return_request_id:
@@ -124,7 +145,7 @@ class ReturnRequestRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def delete_return_request(self, return_request_id: str) -> None:
         session = self._get_session()
@@ -144,11 +165,15 @@ class ReturnRequestRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def count(self) -> int:
-        session = self._get_session()
+    def count(self, approximate: bool = False) -> int:
+        session = self._get_read_session()
         try:
+            if approximate:
+                estimate = approximate_row_count(session.connection(), ReturnRequest.__tablename__)
+                if estimate is not None:
+                    return estimate
             return session.query(ReturnRequest).count()
         finally:
-            session.close()
+            self._db.release_session(session)
@@ -0,0 +1,73 @@
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from database.pool import InstrumentedQueuePool, env_int, env_float
+
+
+SQLITE_PROFILE_PERFORMANCE = "performance"
+
+
+@dataclass
+class SqliteProfile:
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size: int = -64 * 1024
+    busy_timeout: int = 5000
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> Optional['SqliteProfile']:
+        profile = os.environ.get('DB_SQLITE_PROFILE', '').strip().lower()
+        if profile != SQLITE_PROFILE_PERFORMANCE:
+            return None
+        defaults = cls()
+        return cls(
+            journal_mode=os.environ.get('DB_SQLITE_JOURNAL_MODE', defaults.journal_mode),
+            synchronous=os.environ.get('DB_SQLITE_SYNCHRONOUS', defaults.synchronous),
+            mmap_size=env_int('DB_SQLITE_MMAP_SIZE', defaults.mmap_size),
+            cache_size=env_int('DB_SQLITE_CACHE_SIZE', defaults.cache_size),
+            busy_timeout=env_int('DB_SQLITE_BUSY_TIMEOUT', defaults.busy_timeout),
+            pool_size=env_int('DB_POOL_SIZE', defaults.pool_size),
+            max_overflow=env_int('DB_MAX_OVERFLOW', defaults.max_overflow),
+            pool_timeout=env_float('DB_POOL_TIMEOUT', defaults.pool_timeout),
+        )
+
+    def pragmas(self) -> Dict[str, Any]:
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "busy_timeout": self.busy_timeout,
+        }
+
+    def to_engine_kwargs(self) -> Dict[str, Any]:
+        return {
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": self.busy_timeout / 1000.0,
+            },
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+        }
+
+    def install(self, engine: Engine) -> None:
+        pragmas = self.pragmas()
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
@@ -0,0 +1,72 @@
+from typing import Optional
+
+from sqlalchemy.engine import Connection, Transaction
+from sqlalchemy.orm import Session
+
+from database.connection import DatabaseConnection, get_db
+
+
+class UnitOfWork:
+    def __init__(self, db: Optional[DatabaseConnection] = None):
+        self._db = db or get_db()
+        self._connection: Optional[Connection] = None
+        self._transaction: Optional[Transaction] = None
+        self._session: Optional[Session] = None
+        self._joined = False
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            active = self._db.active_unit_of_work_session()
+            if active is None:
+                raise RuntimeError("Unit of work is not active.")
+            return active
+        return self._session
+
+    @property
+    def is_active(self) -> bool:
+        return self._session is not None or self._joined
+
+    def __enter__(self) -> 'UnitOfWork':
+        if self._db.active_unit_of_work_session() is not None:
+            self._joined = True
+            return self
+
+        if self._db.engine is None:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        if not self._db.supports_unit_of_work:
+            raise RuntimeError(
+                "Unit of work needs its own connection; "
+                "the database engine shares a single connection across sessions."
+            )
+
+        self._connection = self._db.engine.connect()
+        self._transaction = self._connection.begin()
+        self._session = self._db.create_session(
+            bind=self._connection,
+            join_transaction_mode="create_savepoint"
+        )
+        self._db.bind_unit_of_work_session(self._session)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._joined:
+            self._joined = False
+            return
+
+        self._db.bind_unit_of_work_session(None)
+        try:
+            self._session.close()
+            if exc_type is None:
+                self._transaction.commit()
+            else:
+                self._transaction.rollback()
+        finally:
+            self._connection.close()
+            self._session = None
+            self._transaction = None
+            self._connection = None
+
+
+def unit_of_work(db: Optional[DatabaseConnection] = None) -> UnitOfWork:
+    return UnitOfWork(db)
@@ -2,11 +2,18 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
+from sqlalchemy import select, bindparam
 from sqlalchemy.orm import Session
 
 from models import User
 from enums import UserRole
 from database.connection import get_db
+from database.approximate_counts import approximate_row_count
+from database.change_tracking import changed_attributes, row_exists, versioned_update
+
+
+_SELECT_USER_BY_ID = select(User).where(User.user_id == bindparam('user_id'))
+_SELECT_USER_BY_USERNAME = select(User).where(User.username == bindparam('username'))
 
 
 class UserRepositoryError(Exception):
@@ -21,6 +28,10 @@ class UserAlreadyExistsError(UserRepositoryError):
     pass
 
 
+class UserConflictError(UserRepositoryError):
+    pass
+
+
 class InvalidCredentialsError(UserRepositoryError):
     pass
 
@@ -32,6 +43,9 @@ class UserRepository:
     def _get_session(self) -> Session:
         return self._db.get_session()
 
+    def _get_read_session(self) -> Session:
+        return self._db.get_read_session()
+
     def ensure_default_admin(self) -> None:
         session = self._get_session()
         try:
@@ -52,7 +66,7 @@ class UserRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def create_user(self, user: User) -> None:
         if not user.validate():
@@ -76,27 +90,31 @@ class UserRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_user_by_id(self, user_id: str) -> User:
         session = self._get_session()
         try:
-            user = session.query(User).filter(User.user_id == user_id).first()
+            user = session.execute(
+                _SELECT_USER_BY_ID, {"user_id": user_id}
+            ).scalars().first()
             if not user:
                 raise UserNotFoundError(f"User with ID '{user_id}' not found")
             return user
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def get_user_by_username(self, username: str) -> User:
         session = self._get_session()
         try:
-            user = session.query(User).filter(User.username == username).first()
+            user = session.execute(
+                _SELECT_USER_BY_USERNAME, {"username": username}
+            ).scalars().first()
             if not user:
                 raise UserNotFoundError(f"User '{username}' not found")
             return user
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def authenticate(self, username: str, password: str) -> User:
         session = self._get_session()
@@ -124,31 +142,35 @@ class UserRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def update_user(self, user: User) -> None:
         if not user.user_id:
             raise ValueError("User ID is required")
         
+        user.role = int(user.role)
+        changes, _ = changed_attributes(user)
+        if not changes:
+            return
+        
         session = self._get_session()
         try:
-            existing = session.query(User).filter(User.user_id == user.user_id).first()
-            if not existing:
-                raise UserNotFoundError(f"User with ID '{user.user_id}' not found")
-            user.role = int(user.role)
-            for key, value in user.__dict__.items():
-                if not key.startswith('_') and key != 'user_id':
-                    setattr(existing, key, value)
+            if not versioned_update(session, user, 'user_id', changes):
+                if not row_exists(session, user, 'user_id'):
+                    raise UserNotFoundError(f"User with ID '{user.user_id}' not found")
+                raise UserConflictError(
+                    f"User with ID '{user.user_id}' was modified by another user"
+                )
             
             session.commit()
-        except UserNotFoundError:
+        except UserRepositoryError:
             session.rollback()
             raise
         except Exception as e:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def update_password(self, user_id: str, new_password: str) -> None:
         session = self._get_session()
@@ -166,7 +188,7 @@ class UserRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def delete_user(self, user_id: str) -> None:
         session = self._get_session()
@@ -182,32 +204,36 @@ class UserRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_all_users(self) -> List[User]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(User).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_users_by_role(self, role: UserRole) -> List[User]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(User).filter(User.role == int(role)).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
     def find_active_users(self) -> List[User]:
-        session = self._get_session()
+        session = self._get_read_session()
         try:
             return session.query(User).filter(User.is_active == True).all()
         finally:
-            session.close()
+            self._db.release_session(session)
 
-    def count(self) -> int:
-        session = self._get_session()
+    def count(self, approximate: bool = False) -> int:
+        session = self._get_read_session()
         try:
+            if approximate:
+                estimate = approximate_row_count(session.connection(), User.__tablename__)
+                if estimate is not None:
+                    return estimate
             return session.query(User).count()
         finally:
-            session.close()
+            self._db.release_session(session)
@@ -64,3 +64,47 @@ class OrderStatus(IntEnum):
             cls.RETURN_APPLYING,
             cls.RETURNING,
         ]
+
+    @classmethod
+    def get_closed_statuses(cls) -> list:
+        return [
+            cls.COMPLETED,
+            cls.PAUSED,
+            cls.CANCELLED,
+        ]
+
+    @classmethod
+    def get_archivable_statuses(cls) -> list:
+        return [
+            cls.COMPLETED,
+            cls.CANCELLED,
+        ]
+
+    @classmethod
+    def get_allowed_sources(cls, target: 'OrderStatus') -> list:
+        mapping = {
+            cls.NEW: [cls.PAUSED],
+            cls.PENDING_PAYMENT: [cls.NEW, cls.PAUSED],
+            cls.PENDING_SHIP: [cls.NEW, cls.PENDING_PAYMENT, cls.PAUSED],
+            cls.PACKING: [cls.PENDING_SHIP, cls.PAUSED],
+            cls.PENDING_RECEIVE: [cls.PENDING_SHIP, cls.PACKING, cls.PAUSED],
+            cls.COMPLETED: [cls.PENDING_RECEIVE, cls.RETURN_REJECTED, cls.PAUSED],
+            cls.PAUSED: [
+                cls.NEW,
+                cls.PENDING_PAYMENT,
+                cls.PENDING_SHIP,
+                cls.PACKING,
+                cls.PENDING_RECEIVE,
+            ],
+            cls.CANCELLED: [
+                cls.NEW,
+                cls.PENDING_PAYMENT,
+                cls.PENDING_SHIP,
+                cls.PACKING,
+                cls.PAUSED,
+            ],
+            cls.RETURN_APPLYING: [cls.PENDING_RECEIVE, cls.COMPLETED, cls.RETURN_REJECTED],
+            cls.RETURNING: [cls.RETURN_APPLYING],
+            cls.RETURN_REJECTED: [cls.RETURN_APPLYING],
+        }
+        return mapping.get(target, [])
@@ -21,6 +21,7 @@ create table customer
     is_active      tinyint(1)   null,
     created_at     datetime     null,
     updated_at     datetime     null,
+    version        int          default 1 not null,
     constraint ix_customer_company_name
         unique (company_name)
 );
@@ -38,7 +39,8 @@ create table inventory
     status           int          null,
     expected_arrival datetime     null,
     created_at       datetime     null,
-    updated_at       datetime     null
+    updated_at       datetime     null,
+    version          int          default 1 not null
 );
 
 create index ix_inventory_product_name
@@ -59,6 +61,7 @@ create table user
     created_at    datetime     null,
     updated_at    datetime     null,
     last_login_at datetime     null,
+    version       int          default 1 not null,
     constraint ix_user_username
         unique (username)
 );
@@ -109,6 +112,7 @@ create table `order`
     return_applied    tinyint(1)   null,
     created_at        datetime     null,
     updated_at        datetime     null,
+    version           int          default 1 not null,
     constraint fk_order_customer_id
         foreign key (customer_id) references customer (customer_id),
     constraint fk_order_product_id
@@ -123,8 +127,109 @@ create index ix_order_created_by_id
 create index ix_order_customer_id
     on `order` (customer_id);
 
+create index ix_order_status_ship_deadline
+    on `order` (status, ship_deadline);
+
+create index ix_order_ship_deadline_hash
+    on `order` (ship_deadline, Hash);
+
+create index ix_order_sales_status
+    on `order` (sales, status);
+
+create index ix_order_product_id
+    on `order` (product_id);
+
+create index ix_order_tracking_number
+    on `order` (tracking_number);
+
+create index ix_order_order_time
+    on `order` (order_time);
+
+create index ix_order_payment_time
+    on `order` (payment_time);
+
+create index ix_order_created_at_hash
+    on `order` (created_at, Hash);
+
 create index ix_order_order_id
     on `order` (order_id);
 
 create index ix_order_return_request_id
-    on `order` (return_request_id);
\ No newline at end of file
+    on `order` (return_request_id);
+
+set session innodb_ft_enable_stopword = off;
+
+create fulltext index ft_order_order_id
+    on `order` (order_id) with parser ngram;
+
+create fulltext index ft_order_customer_name
+    on `order` (customer_name) with parser ngram;
+
+create table order_stats_summary
+(
+    status        int          not null,
+    customer_type int          not null,
+    sales         varchar(100) not null,
+    deadline_day  date         not null,
+    order_count   int          not null,
+    primary key (status, customer_type, sales, deadline_day)
+);
+
+create table order_header
+(
+    order_id       varchar(50)  not null
+        primary key,
+    customer_name  varchar(200) not null,
+    customer_id    varchar(64)  null,
+    customer_type  int          not null,
+    sales          varchar(100) not null,
+    status         int          not null,
+    line_count     int          not null,
+    total_quantity int          not null,
+    order_time     datetime     null,
+    payment_time   datetime     null,
+    ship_deadline  datetime     null
+);
+
+create index ix_order_header_order_time
+    on order_header (order_time);
+
+create index ix_order_header_status_ship_deadline
+    on order_header (status, ship_deadline);
+
+create index ix_order_header_customer_id
+    on order_header (customer_id);
+
+create table order_archive
+(
+    Hash              varchar(64)  not null,
+    customer_type     int          null,
+    customer_name     varchar(200) not null,
+    sales             varchar(100) not null,
+    order_id          varchar(50)  not null,
+    tracking_number   varchar(100) null,
+    status            int          not null,
+    order_time        datetime     not null,
+    payment_time      datetime     null,
+    ship_deadline     datetime     null,
+    product_id        varchar(64)  not null,
+    quantity          int          not null,
+    return_request_id varchar(64)  null,
+    customer_id       varchar(64)  null,
+    created_by_id     varchar(64)  null,
+    return_applied    tinyint(1)   null,
+    created_at        datetime     null,
+    updated_at        datetime     null,
+    version           int          not null,
+    archived_at       datetime     not null,
+    primary key (Hash, order_time)
+);
+
+create index ix_order_archive_order_id
+    on order_archive (order_id);
+
+create index ix_order_archive_customer_id
+    on order_archive (customer_id);
+
+create index ix_order_archive_status
+    on order_archive (status);
@@ -3,6 +3,9 @@ from .user import User
 from .customer import Customer
 from .inventory import Inventory
 from .return_request import ReturnRequest, ReturnStatus
+from .order_stats_summary import OrderStatsSummary, NO_DEADLINE_DAY
+from .order_header import OrderHeader
+from .order_archive import ArchivedOrder, ARCHIVED_COLUMN_NAMES
 
 __all__ = [
     'Order',
@@ -11,4 +14,9 @@ __all__ = [
     'Inventory',
     'ReturnRequest',
     'ReturnStatus',
+    'OrderStatsSummary',
+    'NO_DEADLINE_DAY',
+    'OrderHeader',
+    'ArchivedOrder',
+    'ARCHIVED_COLUMN_NAMES',
 ]
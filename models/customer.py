@@ -6,6 +6,7 @@ from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text
 from sqlalchemy.orm import relationship, Mapped
 
 from models.order import Base
+from models.key_types import UuidKey
 from enums import CustomerType
 
 if TYPE_CHECKING:
@@ -16,7 +17,7 @@ class Customer(Base):
     __tablename__ = 'customer'
     __allow_unmapped__ = True
     
-    customer_id = Column('customer_id', String(64), primary_key=True)
+    customer_id = Column('customer_id', UuidKey(), primary_key=True)
     company_name = Column('company_name', String(200), unique=True, nullable=False, index=True)
     customer_type = Column('customer_type', Integer, default=CustomerType.UNKNOWN)
     contact_person = Column('contact_person', String(50), default='')
@@ -32,6 +33,9 @@ class Customer(Base):
     is_active = Column('is_active', Boolean, default=True)
     created_at = Column('created_at', DateTime, default=datetime.now)
     updated_at = Column('updated_at', DateTime, default=datetime.now, onupdate=datetime.now)
+    version = Column('version', Integer, nullable=False, default=1, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     orders: List['Order'] = relationship('Order', back_populates='customer')
 
@@ -28,6 +28,9 @@ class Inventory(Base):
     expected_arrival = Column('expected_arrival', DateTime, nullable=True)
     created_at = Column('created_at', DateTime, default=datetime.now)
     updated_at = Column('updated_at', DateTime, default=datetime.now, onupdate=datetime.now)
+    version = Column('version', Integer, nullable=False, default=1, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     orders: List['Order'] = relationship('Order', back_populates='product')
     return_requests: List['ReturnRequest'] = relationship('ReturnRequest', back_populates='product')
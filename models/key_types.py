@@ -0,0 +1,59 @@
+import os
+import uuid
+from typing import Optional
+
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.types import BINARY, TypeDecorator
+
+
+COMPACT_KEYS = os.environ.get('DB_COMPACT_KEYS', '').strip().lower() in ("1", "true", "yes", "on")
+
+SurrogateKey = BigInteger().with_variant(Integer(), 'sqlite')
+
+
+class HashKey(TypeDecorator):
+    impl = String(64)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if COMPACT_KEYS:
+            return dialect.type_descriptor(BINARY(32))
+        return dialect.type_descriptor(String(64))
+
+    def process_bind_param(self, value, dialect) -> Optional[object]:
+        if not COMPACT_KEYS or value is None:
+            return value
+        if isinstance(value, bytes):
+            return value
+        return bytes.fromhex(value)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value).hex()
+        return value
+
+
+class UuidKey(TypeDecorator):
+    impl = String(64)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if COMPACT_KEYS:
+            return dialect.type_descriptor(BINARY(16))
+        return dialect.type_descriptor(String(64))
+
+    def process_bind_param(self, value, dialect) -> Optional[object]:
+        if not COMPACT_KEYS or value is None:
+            return value
+        if isinstance(value, bytes):
+            return value
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        if not value:
+            return None
+        return uuid.UUID(value).bytes
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return str(uuid.UUID(bytes=bytes(value)))
+        return value
@@ -2,10 +2,11 @@ import hashlib
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import declarative_base, relationship
 
 from enums import OrderStatus, CustomerType
+from models.key_types import COMPACT_KEYS, HashKey, SurrogateKey, UuidKey
 
 if TYPE_CHECKING:
     from models.customer import Customer
@@ -19,7 +20,11 @@ class Order(Base):
     __tablename__ = 'order'
     __allow_unmapped__ = True
     
-    hash = Column('Hash', String(64), primary_key=True, nullable=False)
+    if COMPACT_KEYS:
+        surrogate_id = Column('id', SurrogateKey, primary_key=True, autoincrement=True)
+        hash = Column('Hash', HashKey(), unique=True, nullable=False)
+    else:
+        hash = Column('Hash', HashKey(), primary_key=True, nullable=False)
     customer_type = Column('customer_type', Integer, default=CustomerType.UNKNOWN)
     customer_name = Column('customer_name', String(200), nullable=False)
     sales = Column('sales', String(100), nullable=False)
@@ -32,11 +37,28 @@ class Order(Base):
     product_id = Column('product_id', String(64), ForeignKey('inventory.product_id'), nullable=False)
     quantity = Column('quantity', Integer, nullable=False, default=1)
     return_request_id = Column('return_request_id', String(64), index=True, nullable=True)
-    customer_id = Column('customer_id', String(64), ForeignKey('customer.customer_id'), index=True, nullable=True)
-    created_by_id = Column('created_by_id', String(64), ForeignKey('user.user_id'), index=True, nullable=True)
+    customer_id = Column('customer_id', UuidKey(), ForeignKey('customer.customer_id'), index=True, nullable=True)
+    created_by_id = Column('created_by_id', UuidKey(), ForeignKey('user.user_id'), index=True, nullable=True)
     return_applied = Column('return_applied', Boolean, default=False)
     created_at = Column('created_at', DateTime, default=datetime.now)
     updated_at = Column('updated_at', DateTime, default=datetime.now, onupdate=datetime.now)
+    version = Column('version', Integer, nullable=False, default=1, server_default='1')
+
+    __table_args__ = (
+        Index('ix_order_status_ship_deadline', status, ship_deadline),
+        Index('ix_order_ship_deadline_hash', ship_deadline, hash),
+        Index('ix_order_sales_status', sales, status),
+        Index('ix_order_product_id', product_id),
+        Index('ix_order_tracking_number', tracking_number),
+        Index('ix_order_order_time', order_time),
+        Index('ix_order_payment_time', payment_time),
+        Index('ix_order_created_at_hash', created_at, hash),
+    )
+
+    if COMPACT_KEYS:
+        __mapper_args__ = {'primary_key': [hash], 'version_id_col': version}
+    else:
+        __mapper_args__ = {'version_id_col': version}
 
     customer = relationship('Customer', back_populates='orders', foreign_keys=[customer_id])
     product = relationship('Inventory', back_populates='orders', foreign_keys=[product_id])
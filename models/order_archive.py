@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Table
+
+from models.order import Base, Order
+
+
+ARCHIVE_KEY_COLUMNS = ('Hash', 'order_time')
+ARCHIVED_COLUMN_NAMES = [
+    column.name for column in Order.__table__.columns
+    if not (column.primary_key and column.name != 'Hash')
+]
+
+
+def _archive_column(name: str) -> Column:
+    column = Order.__table__.c[name]
+    return Column(
+        name,
+        column.type,
+        primary_key=name in ARCHIVE_KEY_COLUMNS,
+        nullable=column.nullable and name not in ARCHIVE_KEY_COLUMNS
+    )
+
+
+class ArchivedOrder(Base):
+    __table__ = Table(
+        'order_archive',
+        Base.metadata,
+        *[_archive_column(name) for name in ARCHIVED_COLUMN_NAMES],
+        Column('archived_at', DateTime, nullable=False, default=datetime.now),
+        Index('ix_order_archive_order_id', 'order_id'),
+        Index('ix_order_archive_customer_id', 'customer_id'),
+        Index('ix_order_archive_status', 'status'),
+    )
+
+    hash = __table__.c.Hash
+
+    to_array = Order.to_array
+    status_enum = Order.status_enum
+    customer_type_enum = Order.customer_type_enum
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, Integer, DateTime, Index
+
+from enums import OrderStatus, CustomerType
+from models.order import Base
+from models.key_types import UuidKey
+
+
+class OrderHeader(Base):
+    __tablename__ = 'order_header'
+
+    order_id = Column('order_id', String(50), primary_key=True)
+    customer_name = Column('customer_name', String(200), nullable=False)
+    customer_id = Column('customer_id', UuidKey(), nullable=True)
+    customer_type = Column('customer_type', Integer, nullable=False, default=CustomerType.UNKNOWN)
+    sales = Column('sales', String(100), nullable=False, default='')
+    status = Column('status', Integer, nullable=False, default=OrderStatus.UNKNOWN)
+    line_count = Column('line_count', Integer, nullable=False, default=0)
+    total_quantity = Column('total_quantity', Integer, nullable=False, default=0)
+    order_time = Column('order_time', DateTime, nullable=True)
+    payment_time = Column('payment_time', DateTime, nullable=True)
+    ship_deadline = Column('ship_deadline', DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('ix_order_header_order_time', order_time),
+        Index('ix_order_header_status_ship_deadline', status, ship_deadline),
+        Index('ix_order_header_customer_id', customer_id),
+    )
+
+    @property
+    def status_enum(self) -> OrderStatus:
+        return OrderStatus(self.status)
+
+    @property
+    def customer_type_enum(self) -> CustomerType:
+        return CustomerType(self.customer_type)
+
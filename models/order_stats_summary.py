@@ -0,0 +1,18 @@
+from datetime import date
+
+from sqlalchemy import Column, String, Integer, Date
+
+from models.order import Base
+
+
+NO_DEADLINE_DAY = date(1970, 1, 1)
+
+
+class OrderStatsSummary(Base):
+    __tablename__ = 'order_stats_summary'
+
+    status = Column('status', Integer, primary_key=True, autoincrement=False)
+    customer_type = Column('customer_type', Integer, primary_key=True, autoincrement=False)
+    sales = Column('sales', String(100), primary_key=True)
+    deadline_day = Column('deadline_day', Date, primary_key=True)
+    order_count = Column('order_count', Integer, nullable=False, default=0)
@@ -7,6 +7,7 @@ from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey
 from sqlalchemy.orm import relationship, Mapped
 
 from models.order import Base
+from models.key_types import UuidKey
 from enums import ReturnReason
 
 if TYPE_CHECKING:
@@ -41,7 +42,7 @@ class ReturnRequest(Base):
     description = Column('description', Text, default='')
     status = Column('status', Integer, default=ReturnStatus.PENDING)
     customer_name = Column('customer_name', String(200), nullable=False)
-    reviewer_id = Column('reviewer_id', String(64), nullable=True)
+    reviewer_id = Column('reviewer_id', UuidKey(), nullable=True)
     review_comment = Column('review_comment', Text, default='')
     reviewed_at = Column('reviewed_at', DateTime, nullable=True)
     created_at = Column('created_at', DateTime, default=datetime.now)
@@ -7,6 +7,7 @@ from sqlalchemy import Column, String, Integer, DateTime, Boolean
 from sqlalchemy.orm import relationship, Mapped
 
 from models.order import Base
+from models.key_types import UuidKey
 from enums import UserRole
 
 if TYPE_CHECKING:
@@ -17,7 +18,7 @@ class User(Base):
     __tablename__ = 'user'
     __allow_unmapped__ = True
     
-    user_id = Column('user_id', String(64), primary_key=True)
+    user_id = Column('user_id', UuidKey(), primary_key=True)
     username = Column('username', String(50), unique=True, nullable=False, index=True)
     password_hash = Column('password_hash', String(128), nullable=False)
     display_name = Column('display_name', String(100), default='')
@@ -29,6 +30,9 @@ class User(Base):
     created_at = Column('created_at', DateTime, default=datetime.now)
     updated_at = Column('updated_at', DateTime, default=datetime.now, onupdate=datetime.now)
     last_login_at = Column('last_login_at', DateTime, nullable=True)
+    version = Column('version', Integer, nullable=False, default=1, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     created_orders: List['Order'] = relationship('Order', back_populates='created_by')
 
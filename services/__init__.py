@@ -3,6 +3,7 @@ from .user_service import UserService
 from .customer_service import CustomerService
 from .statistics_service import StatisticsService
 from .excel_service import ExcelService
+from .deadline_monitor import DeadlineIndex, DeadlineMonitor, get_deadline_monitor
 
 __all__ = [
     'OrderService',
@@ -10,4 +11,7 @@ __all__ = [
     'CustomerService',
     'StatisticsService',
     'ExcelService',
+    'DeadlineIndex',
+    'DeadlineMonitor',
+    'get_deadline_monitor',
 ]
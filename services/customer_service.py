@@ -4,6 +4,7 @@ from models import Customer
 from enums import CustomerType
 from database import CustomerRepository
 from database.customer_repository import CustomerNotFoundError
+from database.projections import CustomerRow
 
 
 class CustomerService:
@@ -36,6 +37,9 @@ class CustomerService:
     def get_all_customers(self) -> List[Customer]:
         return self._customer_repo.find_all_customers()
 
+    def get_customer_rows(self) -> List[CustomerRow]:
+        return self._customer_repo.find_all_customer_rows()
+
     def get_customers_by_customer_type(
         self, customer_type: CustomerType
     ) -> List[Customer]:
@@ -0,0 +1,236 @@
+import threading
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from enums import OrderStatus
+from database import OrderRepository, add_order_change_listener, remove_order_change_listener
+from database.order_overview import NEAR_DEADLINE_DAYS
+from database.pool import env_int
+
+
+_CLOSED_STATUSES = {int(s) for s in OrderStatus.get_closed_statuses()}
+_NOT_DUE = 0
+_DUE_SOON = 1
+_OVERDUE = 2
+
+
+def _start_of_today() -> datetime:
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return None
+
+
+class DeadlineIndex:
+    def __init__(self):
+        self._entries: List[Tuple[datetime, str]] = []
+        self._deadlines: Dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, deadlines: Iterable[Tuple[str, datetime]]) -> None:
+        self._deadlines = {
+            order_hash: _as_datetime(deadline) for order_hash, deadline in deadlines
+            if _as_datetime(deadline) is not None
+        }
+        self._entries = sorted(
+            (deadline, order_hash) for order_hash, deadline in self._deadlines.items()
+        )
+
+    def get(self, order_hash: str) -> Optional[datetime]:
+        return self._deadlines.get(order_hash)
+
+    def put(self, order_hash: str, deadline: datetime) -> Optional[datetime]:
+        previous = self.discard(order_hash)
+        self._deadlines[order_hash] = deadline
+        insort(self._entries, (deadline, order_hash))
+        return previous
+
+    def discard(self, order_hash: str) -> Optional[datetime]:
+        deadline = self._deadlines.pop(order_hash, None)
+        if deadline is not None:
+            del self._entries[bisect_left(self._entries, (deadline, order_hash))]
+        return deadline
+
+    def _position(self, value: Optional[datetime], default: int) -> int:
+        if value is None:
+            return default
+        return bisect_left(self._entries, (value,))
+
+    def count_between(self, start: Optional[datetime], end: Optional[datetime]) -> int:
+        return max(self._position(end, len(self._entries)) - self._position(start, 0), 0)
+
+    def hashes_between(self, start: Optional[datetime], end: Optional[datetime]) -> List[str]:
+        entries = self._entries[self._position(start, 0):self._position(end, len(self._entries))]
+        return [order_hash for _, order_hash in entries]
+
+
+class DeadlineMonitor(QObject):
+    orders_due_soon = pyqtSignal(list)
+    orders_overdue = pyqtSignal(list)
+    index_changed = pyqtSignal()
+    _schedule_requested = pyqtSignal()
+
+    def __init__(self, due_soon_days: Optional[int] = None):
+        super().__init__()
+        self._due_soon_days = (
+            due_soon_days if due_soon_days is not None
+            else env_int('DEADLINE_ALERT_DAYS', NEAR_DEADLINE_DAYS)
+        )
+        self._index = DeadlineIndex()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._buffered: Optional[List[Tuple[list, list]]] = None
+        self._today = _start_of_today()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_day_changed)
+        self._schedule_requested.connect(self._schedule_next_check)
+
+    @property
+    def due_soon_days(self) -> int:
+        return self._due_soon_days
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def start(self, order_repo: Optional[OrderRepository] = None) -> int:
+        add_order_change_listener(self._on_order_changes)
+        with self._lock:
+            self._buffered = []
+        try:
+            deadlines = (order_repo or OrderRepository()).find_open_deadlines()
+        except Exception as e:
+            with self._lock:
+                self._buffered = None
+            remove_order_change_listener(self._on_order_changes)
+            raise e
+
+        with self._lock:
+            self._index.load(deadlines)
+            buffered, self._buffered = self._buffered, None
+            for removed, added in buffered:
+                self._apply(removed, added)
+            self._today = _start_of_today()
+            self._loaded = True
+            size = len(self._index)
+
+        self._schedule_requested.emit()
+        self.index_changed.emit()
+        return size
+
+    def stop(self) -> None:
+        remove_order_change_listener(self._on_order_changes)
+        self._timer.stop()
+        with self._lock:
+            self._loaded = False
+            self._index.load([])
+
+    def count_overdue(self) -> int:
+        with self._lock:
+            return self._index.count_between(None, _start_of_today())
+
+    def count_due_within(self, days: int) -> int:
+        today = _start_of_today()
+        with self._lock:
+            return self._index.count_between(today, today + timedelta(days=days))
+
+    def overdue_hashes(self) -> List[str]:
+        with self._lock:
+            return self._index.hashes_between(None, _start_of_today())
+
+    def due_within_hashes(self, days: int) -> List[str]:
+        today = _start_of_today()
+        with self._lock:
+            return self._index.hashes_between(today, today + timedelta(days=days))
+
+    def _urgency(self, deadline: Optional[datetime], today: datetime) -> int:
+        if deadline is None:
+            return _NOT_DUE
+        if deadline < today:
+            return _OVERDUE
+        if deadline < today + timedelta(days=self._due_soon_days):
+            return _DUE_SOON
+        return _NOT_DUE
+
+    def _apply(
+        self,
+        removed: List[Dict[str, Any]],
+        added: List[Dict[str, Any]]
+    ) -> Tuple[List[str], List[str]]:
+        today = _start_of_today()
+        due_soon, overdue = [], []
+        added_hashes = set()
+        for snapshot in added:
+            order_hash = snapshot.get('hash')
+            added_hashes.add(order_hash)
+            deadline = _as_datetime(snapshot.get('ship_deadline'))
+            if deadline is None or snapshot.get('status') in _CLOSED_STATUSES:
+                self._index.discard(order_hash)
+                continue
+            previous = self._index.put(order_hash, deadline)
+            urgency = self._urgency(deadline, today)
+            if urgency > self._urgency(previous, today):
+                (overdue if urgency == _OVERDUE else due_soon).append(order_hash)
+
+        for snapshot in removed:
+            if snapshot.get('hash') not in added_hashes:
+                self._index.discard(snapshot.get('hash'))
+        return due_soon, overdue
+
+    def _on_order_changes(self, removed: List[Dict[str, Any]], added: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            if self._buffered is not None:
+                self._buffered.append((removed, added))
+                return
+            if not self._loaded:
+                return
+            due_soon, overdue = self._apply(removed, added)
+        self._emit(due_soon, overdue)
+
+    def _emit(self, due_soon: List[str], overdue: List[str]) -> None:
+        if due_soon:
+            self.orders_due_soon.emit(due_soon)
+        if overdue:
+            self.orders_overdue.emit(overdue)
+        self.index_changed.emit()
+
+    def _schedule_next_check(self) -> None:
+        next_day = _start_of_today() + timedelta(days=1)
+        delay_ms = int((next_day - datetime.now()).total_seconds() * 1000)
+        self._timer.start(max(delay_ms, 1000))
+
+    def _on_day_changed(self) -> None:
+        today = _start_of_today()
+        due_soon_window = timedelta(days=self._due_soon_days)
+        with self._lock:
+            previous, self._today = self._today, today
+            if today > previous:
+                overdue = self._index.hashes_between(previous, today)
+                due_soon = self._index.hashes_between(previous + due_soon_window, today + due_soon_window)
+            else:
+                overdue, due_soon = [], []
+        if overdue or due_soon:
+            self._emit(due_soon, overdue)
+        self._schedule_next_check()
+
+
+_deadline_monitor: Optional[DeadlineMonitor] = None
+
+
+def get_deadline_monitor() -> DeadlineMonitor:
+    global _deadline_monitor
+    if _deadline_monitor is None:
+        _deadline_monitor = DeadlineMonitor()
+    return _deadline_monitor
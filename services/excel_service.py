@@ -10,7 +10,9 @@ from openpyxl import Workbook, load_workbook
 
 from models import Order, Customer, User, Inventory, ReturnRequest, ReturnStatus
 from enums import OrderStatus, CustomerType, UserRole, InventoryStatus, ReturnReason
-from database import OrderRepository, CustomerRepository, InventoryRepository, ReturnRequestRepository
+from database import (
+    OrderRepository, CustomerRepository, InventoryRepository, ReturnRequestRepository, unit_of_work
+)
 from database.user_repository import UserRepository, UserAlreadyExistsError
 from database.customer_repository import CustomerAlreadyExistsError
 from database.inventory_repository import InventoryNotFoundError
@@ -22,6 +24,8 @@ REQUIRED_HEADERS = [
     "下单时间", "付款时间", "订单最晚发货日期", "购买产品", "购买数量", "退货处理号"
 ]
 
+ORDER_IMPORT_CHUNK_SIZE = 1000
+
 INVENTORY_HEADERS = [
     "产品类型",
     "品牌",
@@ -208,47 +212,47 @@ class ExcelService:
         if not orders:
             return result
         
-        company_map = {}
-        customer_id_map = {}
-        sales_map = set()
-        
-        for order in orders:
-            if order.customer_name:
-                company_map[order.customer_name] = order.customer_type
-            if order.sales:
-                sales_map.add(order.sales)
-        
-        for company_name, customer_type in company_map.items():
-            try:
-                customer, is_new = self._get_or_create_customer(
-                    company_name, customer_type
-                )
-                customer_id_map[company_name] = customer.customer_id
-                
-                if is_new:
-                    result.customers_created += 1
-            except Exception as e:
-                result.errors.append(f"Failed to create customer '{company_name}': {e}")
-        
-        for sales_name in sales_map:
-            try:
-                account_info = self._create_sales_user(sales_name)
-                if account_info:
-                    result.created_accounts.append(account_info)
-                    result.users_created += 1
-            except UserAlreadyExistsError:
-                pass
-            except Exception as e:
-                result.errors.append(f"Failed to create sales user '{sales_name}': {e}")
-        
-        for order in orders:
-            try:
+        with unit_of_work():
+            company_map = {}
+            customer_id_map = {}
+            sales_map = set()
+            
+            for order in orders:
+                if order.customer_name:
+                    company_map[order.customer_name] = order.customer_type
+                if order.sales:
+                    sales_map.add(order.sales)
+            
+            for company_name, customer_type in company_map.items():
+                try:
+                    customer, is_new = self._get_or_create_customer(
+                        company_name, customer_type
+                    )
+                    customer_id_map[company_name] = customer.customer_id
+                    
+                    if is_new:
+                        result.customers_created += 1
+                except Exception as e:
+                    result.errors.append(f"Failed to create customer '{company_name}': {e}")
+            
+            for sales_name in sales_map:
+                try:
+                    account_info = self._create_sales_user(sales_name)
+                    if account_info:
+                        result.created_accounts.append(account_info)
+                        result.users_created += 1
+                except UserAlreadyExistsError:
+                    pass
+                except Exception as e:
+                    result.errors.append(f"Failed to create sales user '{sales_name}': {e}")
+            
+            for order in orders:
                 if order.customer_name in customer_id_map:
                     order.customer_id = customer_id_map[order.customer_name]
-                
-                self._order_repo.create_order(order)
-                result.orders_created += 1
-
+            
+            created_orders = self._create_orders(orders, result)
+            
+            for order in created_orders:
                 try:
                     self._inventory_repo.update_stock(order.product_id, -order.quantity)
                 except InventoryNotFoundError:
@@ -277,7 +281,7 @@ class ExcelService:
                         
                         if not order.return_request_id:
                             order.return_request_id = return_request.return_request_id
-                            self._order_repo.update_order(order)
+                            self._order_repo.update_order(order, allow_unversioned=True)
                         
                         result.return_requests_created += 1
                     except ReturnRequestAlreadyExistsError:
@@ -286,11 +290,27 @@ class ExcelService:
                         result.errors.append(
                             f"Failed to create return request for order '{order.order_id}': {ret_err}"
                         )
-            except Exception as e:
-                result.errors.append(f"Failed to create order '{order.order_id}': {e}")
         
         return result
 
+    def _create_orders(self, orders: List[Order], result: ImportResult) -> List[Order]:
+        created = []
+        for start in range(0, len(orders), ORDER_IMPORT_CHUNK_SIZE):
+            chunk = orders[start:start + ORDER_IMPORT_CHUNK_SIZE]
+            try:
+                self._order_repo.create_orders_bulk(chunk, ORDER_IMPORT_CHUNK_SIZE)
+                created.extend(chunk)
+            except Exception:
+                for order in chunk:
+                    try:
+                        self._order_repo.create_order(order)
+                        created.append(order)
+                    except Exception as e:
+                        result.errors.append(f"Failed to create order '{order.order_id}': {e}")
+        
+        result.orders_created += len(created)
+        return created
+
     def _get_or_create_customer(
         self, company_name: str, customer_type: CustomerType
     ) -> Tuple[Customer, bool]:
@@ -1,12 +1,16 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Union
 
-from models import Order
+from models import Order, OrderHeader
 from enums import OrderStatus, CustomerType, UserRole
-from database import OrderRepository
+from database import OrderRepository, OrderPage, DateRange, OrderFacets
+from database.projections import OrderRow
+from database.pool import env_int
 
 
 class OrderService:
+    ARCHIVE_AFTER_DAYS = 180
+
     def __init__(self, user_service=None):
         self._order_repo = OrderRepository()
         self._user_service = user_service
@@ -14,22 +18,24 @@ class OrderService:
     def set_user_service(self, user_service):
         self._user_service = user_service
 
-    def _filter_by_customer(self, orders: List[Order]) -> List[Order]:
+    def _customer_scope(self) -> Optional[str]:
         if not self._user_service:
-            return orders
+            return None
         
         current_user = self._user_service.get_current_user()
         if not current_user:
-            return orders
-        
-        if current_user.role in [UserRole.ADMIN, UserRole.MANAGER]:
-            return orders
+            return None
         
         if current_user.role == UserRole.CUSTOMER:
-            customer_name = current_user.display_name
-            return [order for order in orders if order.customer_name == customer_name]
+            return current_user.display_name
         
-        return orders
+        return None
+
+    def _filter_by_customer(self, orders: List[Order]) -> List[Order]:
+        customer_name = self._customer_scope()
+        if customer_name is None:
+            return orders
+        return [order for order in orders if order.customer_name == customer_name]
 
     def create_order(self, order: Order) -> None:
         if not order.check_entity():
@@ -43,43 +49,137 @@ class OrderService:
         sales: str = "",
         status: Optional[OrderStatus] = None,
         customer_type: Optional[CustomerType] = None,
-        ship_deadline: Optional[datetime] = None
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None,
+        include_archived: bool = False
     ) -> List[Order]:
         orders = self._order_repo.find(
-            order_id, customer_name, sales, status, customer_type, ship_deadline
+            order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time, include_archived
         )
         return self._filter_by_customer(orders)
 
+    def get_orders_page(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = OrderRepository.PAGE_SIZE,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None
+    ) -> OrderPage:
+        return self._order_repo.find_page(
+            cursor, page_size, order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time, self._customer_scope()
+        )
+
+    def iter_orders_by_filter(
+        self,
+        batch_size: int = OrderRepository.PAGE_SIZE,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None
+    ) -> Iterator[Order]:
+        return self._order_repo.iter_orders(
+            batch_size, order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time, self._customer_scope()
+        )
+
     def get_all_orders(self) -> List[Order]:
         orders = self._order_repo.find_all()
         return self._filter_by_customer(orders)
 
-    def get_orders_by_order_id(self, order_id: str) -> List[Order]:
-        orders = self._order_repo.find_by_order_id(order_id)
+    def get_order_rows(self, statuses: Optional[List[OrderStatus]] = None) -> List[OrderRow]:
+        rows = self._order_repo.find_rows(statuses)
+        return self._filter_by_customer(rows)
+
+    def get_order_rows_page(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = OrderRepository.PAGE_SIZE,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None,
+        include_facets: bool = False
+    ) -> OrderPage:
+        return self._order_repo.find_rows_page(
+            cursor, page_size, order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time, include_facets, self._customer_scope()
+        )
+
+    def get_order_facets(
+        self,
+        order_id: str = "",
+        customer_name: str = "",
+        sales: str = "",
+        status: Optional[OrderStatus] = None,
+        customer_type: Optional[CustomerType] = None,
+        ship_deadline: Optional[Union[datetime, DateRange]] = None,
+        order_time: Optional[DateRange] = None,
+        payment_time: Optional[DateRange] = None
+    ) -> OrderFacets:
+        return self._order_repo.find_facets(
+            order_id, customer_name, sales, status, customer_type, ship_deadline,
+            order_time, payment_time, self._customer_scope()
+        )
+
+    def get_order_header(self, order_id: str) -> Optional[OrderHeader]:
+        header = self._order_repo.get_order_header(order_id)
+        if header is None or not self._filter_by_customer([header]):
+            return None
+        return header
+
+    def get_order_headers_page(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = OrderRepository.PAGE_SIZE,
+        status: Optional[OrderStatus] = None
+    ) -> OrderPage:
+        return self._order_repo.find_order_headers_page(
+            cursor, page_size, status=status, owner_name=self._customer_scope()
+        )
+
+    def get_orders_by_order_id(self, order_id: str, include_archived: bool = False) -> List[Order]:
+        orders = self._order_repo.find_by_order_id(order_id, include_archived)
         return self._filter_by_customer(orders)
 
-    def get_orders_by_product_id(self, product_id: str) -> List[Order]:
-        orders = self._order_repo.find_by_product_id(product_id)
+    def get_orders_by_product_id(self, product_id: str, include_archived: bool = False) -> List[Order]:
+        orders = self._order_repo.find_by_product_id(product_id, include_archived)
         return self._filter_by_customer(orders)
 
-    def get_orders_by_status(self, status: OrderStatus) -> List[Order]:
-        orders = self._order_repo.find_by_status(status)
+    def get_orders_by_status(self, status: OrderStatus, include_archived: bool = False) -> List[Order]:
+        orders = self._order_repo.find_by_status(status, include_archived)
         return self._filter_by_customer(orders)
 
-    def get_orders_by_customer_type(self, customer_type: CustomerType) -> List[Order]:
-        orders = self._order_repo.find_by_customer_type(customer_type)
+    def get_orders_by_customer_type(self, customer_type: CustomerType, include_archived: bool = False) -> List[Order]:
+        orders = self._order_repo.find_by_customer_type(customer_type, include_archived)
         return self._filter_by_customer(orders)
 
     def get_orders_by_ship_deadline(self, deadline: datetime) -> List[Order]:
         orders = self._order_repo.find_by_ship_deadline(deadline)
         return self._filter_by_customer(orders)
 
-    def get_orders_by_sales(self, sales: str) -> List[Order]:
-        orders = self._order_repo.find_by_sales(sales)
+    def get_orders_by_sales(self, sales: str, include_archived: bool = False) -> List[Order]:
+        orders = self._order_repo.find_by_sales(sales, include_archived)
         return self._filter_by_customer(orders)
 
-    def get_orders_by_customer_name(self, customer_name: str) -> List[Order]:
-        orders = self._order_repo.find_by_customer_name(customer_name)
+    def get_orders_by_customer_name(self, customer_name: str, include_archived: bool = False) -> List[Order]:
+        orders = self._order_repo.find_by_customer_name(customer_name, include_archived)
         return self._filter_by_customer(orders)
 
     def update_order(self, order: Order) -> None:
@@ -87,6 +187,20 @@ class OrderService:
             raise ValueError("Invalid order data")
         self._order_repo.update_order(order)
 
+    def archive_old_orders(self, older_than_days: Optional[int] = None) -> int:
+        if older_than_days is None:
+            older_than_days = env_int('DB_ARCHIVE_AFTER_DAYS', self.ARCHIVE_AFTER_DAYS)
+        return self._order_repo.archive_orders(older_than_days)
+
+    def transition_order_status(
+        self,
+        hashes: List[str],
+        new_status: OrderStatus,
+        values: Optional[Dict[str, Any]] = None,
+        allowed_sources: Optional[List[OrderStatus]] = None
+    ) -> List[str]:
+        return self._order_repo.transition_status(hashes, new_status, allowed_sources, values)
+
     def delete_order(self, order: Order) -> None:
         self._order_repo.delete_order(order)
 
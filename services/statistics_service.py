@@ -1,21 +1,30 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
-from models import Order, Inventory
+from models import Order
 from enums import OrderStatus, CustomerType, UserRole
-from database import OrderRepository, CustomerRepository, InventoryRepository
+from database import OrderRepository, CustomerRepository, InventoryRepository, InventoryRow, get_async_db
 from database.user_repository import UserRepository
+from database.async_repositories import (
+    AsyncOrderRepository, AsyncCustomerRepository, AsyncUserRepository, AsyncInventoryRepository
+)
+from database.order_overview import NEAR_DEADLINE_DAYS
+from services.deadline_monitor import DeadlineMonitor
 
 
 @dataclass
 class DashboardStats:
     total_orders: int = 0
+    total_order_ids: int = 0
     total_customers: int = 0
     total_users: int = 0
     total_products: int = 0
     pending_orders: int = 0
     completed_orders: int = 0
     near_deadline_orders: int = 0
+    approximate: bool = False
 
 
 @dataclass
@@ -56,6 +65,7 @@ class StatisticsService:
         self._customer_repo = CustomerRepository()
         self._user_repo = UserRepository()
         self._inventory_repo: Optional[InventoryRepository] = None
+        self._deadline_monitor: Optional[DeadlineMonitor] = None
         self._user_service = user_service
 
     def set_user_service(self, user_service):
@@ -64,6 +74,9 @@ class StatisticsService:
     def set_inventory_repo(self, inventory_repo: InventoryRepository):
         self._inventory_repo = inventory_repo
 
+    def set_deadline_monitor(self, deadline_monitor: DeadlineMonitor):
+        self._deadline_monitor = deadline_monitor
+
     def _get_customer_id_filter(self) -> str:
         if not self._user_service:
             return ""
@@ -78,28 +91,49 @@ class StatisticsService:
         return ""
 
     def get_dashboard_stats(self) -> DashboardStats:
-        stats = DashboardStats()
+        return self.get_dashboard_overview()[0]
+
+    def get_dashboard_overview(self, approximate: bool = False) -> Tuple[DashboardStats, Dict[str, int]]:
+        stats = DashboardStats(approximate=approximate)
         
-        stats.total_customers = self._customer_repo.count()
-        stats.total_users = self._user_repo.count()
+        stats.total_customers = self._customer_repo.count(approximate)
+        stats.total_users = self._user_repo.count(approximate)
         
         if self._inventory_repo:
-            stats.total_products = self._inventory_repo.count()
+            stats.total_products = self._inventory_repo.count(approximate)
         
         customer_id = self._get_customer_id_filter()
-        dashboard_counts = self._order_repo.get_dashboard_counts(customer_id)
+        dashboard_counts, deadline_stats = self._order_repo.get_order_overview(customer_id, approximate)
+        self._apply_dashboard_counts(stats, dashboard_counts)
+        self._apply_deadline_index(stats, customer_id)
+        stats.total_order_ids = self._order_repo.count_order_headers(customer_id, approximate=approximate)
         
+        return stats, deadline_stats
+
+    @staticmethod
+    def _apply_dashboard_counts(stats: DashboardStats, dashboard_counts: Dict[str, Any]) -> None:
         stats.total_orders = dashboard_counts.get("total_orders", 0)
         stats.pending_orders = dashboard_counts.get("pending_orders", 0)
         stats.completed_orders = dashboard_counts.get("completed_orders", 0)
         stats.near_deadline_orders = dashboard_counts.get("near_deadline_orders", 0)
-        
-        return stats
+
+    def _apply_deadline_index(self, stats: DashboardStats, customer_id: str) -> None:
+        if customer_id or not self._deadline_monitor or not self._deadline_monitor.is_loaded:
+            return
+        stats.near_deadline_orders = self._deadline_monitor.count_due_within(NEAR_DEADLINE_DAYS)
+
+    def get_orders_per_day(self, days: int = 30) -> List[Dict[str, Any]]:
+        customer_id = self._get_customer_id_filter()
+        end = date.today() + timedelta(days=1)
+        return self._order_repo.count_orders_per_day(end - timedelta(days=days), end, customer_id)
 
     def get_order_status_distribution(self) -> List[OrderStatusStats]:
         customer_id = self._get_customer_id_filter()
         status_counts = self._order_repo.count_by_status(customer_id)
-        
+        return self._to_status_stats(status_counts)
+
+    @staticmethod
+    def _to_status_stats(status_counts: List[Dict[str, Any]]) -> List[OrderStatusStats]:
         return [
             OrderStatusStats(
                 status=item["status"],
@@ -111,7 +145,10 @@ class StatisticsService:
     def get_order_customer_type_distribution(self) -> List[OrderCustomerTypeStats]:
         customer_id = self._get_customer_id_filter()
         type_counts = self._order_repo.count_by_customer_type(customer_id)
-        
+        return self._to_customer_type_stats(type_counts)
+
+    @staticmethod
+    def _to_customer_type_stats(type_counts: List[Dict[str, Any]]) -> List[OrderCustomerTypeStats]:
         return [
             OrderCustomerTypeStats(
                 customer_type=item["customer_type"],
@@ -145,7 +182,10 @@ class StatisticsService:
             return []
         
         stats = self._inventory_repo.get_sales_by_product_type()
-        
+        return self._to_inventory_sales_stats(stats)
+
+    @staticmethod
+    def _to_inventory_sales_stats(stats: List[Dict[str, Any]]) -> List[InventorySalesStats]:
         return [
             InventorySalesStats(
                 product_type=item["product_type"],
@@ -166,7 +206,10 @@ class StatisticsService:
     def get_best_selling_platform(self) -> List[PlatformSalesStats]:
         customer_id = self._get_customer_id_filter()
         type_counts = self._order_repo.count_by_customer_type(customer_id)
-        
+        return self._to_platform_stats(type_counts)
+
+    @staticmethod
+    def _to_platform_stats(type_counts: List[Dict[str, Any]]) -> List[PlatformSalesStats]:
         result = []
         for item in type_counts:
             result.append(PlatformSalesStats(
@@ -177,7 +220,55 @@ class StatisticsService:
         
         return result
 
-    def get_all_inventory_for_display(self) -> List[Inventory]:
+    def get_all_inventory_for_display(self) -> List[InventoryRow]:
         if not self._inventory_repo:
             return []
-        return self._inventory_repo.find_all_inventory()
+        return self._inventory_repo.find_all_inventory_rows()
+
+    @staticmethod
+    def is_async_available() -> bool:
+        return get_async_db().is_connected
+
+    async def fetch_dashboard_async(self) -> Dict[str, Any]:
+        customer_id = self._get_customer_id_filter()
+        order_repo = AsyncOrderRepository()
+        inventory_repo = AsyncInventoryRepository() if self._inventory_repo else None
+
+        async def count_products() -> int:
+            return await inventory_repo.count() if inventory_repo else 0
+
+        async def inventory_sales() -> List[Dict[str, Any]]:
+            return await inventory_repo.get_sales_by_product_type() if inventory_repo else []
+
+        (
+            total_customers, total_users, total_products, order_overview,
+            status_counts, type_counts, inventory_stats, total_order_ids
+        ) = await asyncio.gather(
+            AsyncCustomerRepository().count(),
+            AsyncUserRepository().count(),
+            count_products(),
+            order_repo.get_order_overview(customer_id),
+            order_repo.count_by_status(customer_id),
+            order_repo.count_by_customer_type(customer_id),
+            inventory_sales(),
+            order_repo.count_order_headers(customer_id),
+        )
+        dashboard_counts, deadline_stats = order_overview
+
+        dash_stats = DashboardStats(
+            total_order_ids=total_order_ids,
+            total_customers=total_customers,
+            total_users=total_users,
+            total_products=total_products,
+        )
+        self._apply_dashboard_counts(dash_stats, dashboard_counts)
+        self._apply_deadline_index(dash_stats, customer_id)
+
+        return {
+            'dash_stats': dash_stats,
+            'status_stats': self._to_status_stats(status_counts),
+            'customer_type_stats': self._to_customer_type_stats(type_counts),
+            'deadline_stats': deadline_stats,
+            'inventory_stats': self._to_inventory_sales_stats(inventory_stats),
+            'platform_stats': self._to_platform_stats(type_counts),
+        }
@@ -0,0 +1,96 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import get_db, OrderRepository, InventoryRepository, InvalidCursorError
+from database.pagination import decode_cursor, encode_cursor
+from models import Order, Inventory
+from enums import InventoryStatus, OrderStatus
+
+
+class OrderCursorRoundTripTest(unittest.TestCase):
+    ORDER_COUNT = 23
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._db = get_db()
+        self._db.connect(os.path.join(self._tmpdir.name, "pages.db"))
+        self._orders = OrderRepository()
+        product = Inventory(
+            product_type="type", manufacturer="maker", product_name="product",
+            stock_quantity=1000, status=int(InventoryStatus.NORMAL)
+        )
+        InventoryRepository().create_inventory(product)
+
+        base = datetime(2024, 3, 1)
+        for i in range(self.ORDER_COUNT):
+            self._orders.create_order(Order(
+                order_id=f"P{i:03d}",
+                customer_name="alice" if i % 4 == 0 else "bob",
+                sales="sales",
+                product_id=product.product_id,
+                quantity=1,
+                order_time=base,
+                ship_deadline=None if i % 5 == 0 else base + timedelta(days=i % 3),
+                status=int(OrderStatus.COMPLETED if i % 7 == 0 else OrderStatus.NEW),
+            ))
+
+    def tearDown(self):
+        self._db.close()
+        self._tmpdir.cleanup()
+
+    def _walk(self, fetch) -> list:
+        items, cursor = [], None
+        while True:
+            page = fetch(cursor)
+            self.assertTrue(page.orders)
+            items.extend(page.orders)
+            if not page.has_more:
+                return items
+            cursor = page.next_cursor
+
+    def test_hash_pages_cover_every_order_once(self):
+        orders = self._walk(lambda cursor: self._orders.find_page(cursor, 4))
+        hashes = [order.hash for order in orders]
+        self.assertEqual(len(hashes), self.ORDER_COUNT)
+        self.assertEqual(hashes, sorted(set(hashes)))
+
+    def test_owner_pages_are_full(self):
+        pages, cursor = [], None
+        while True:
+            page = self._orders.find_rows_page(cursor, 2, owner_name="alice")
+            pages.append(len(page.orders))
+            if not page.has_more:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(pages, [2, 2, 2])
+
+    def test_deadline_pages_follow_the_sorted_stream(self):
+        orders = self._walk(lambda cursor: self._orders.find_pending_orders_page("", cursor, 3))
+        expected = list(self._orders.iter_pending_orders_sorted())
+        self.assertEqual([o.hash for o in orders], [o.hash for o in expected])
+        self.assertEqual(len(orders), self.ORDER_COUNT - 4)
+
+    def test_find_all_keeps_insertion_order(self):
+        order_ids = [order.order_id for order in self._orders.find_all()]
+        self.assertEqual(order_ids, [f"P{i:03d}" for i in range(self.ORDER_COUNT)])
+
+    def test_cursor_values_round_trip(self):
+        values = [datetime(2024, 3, 1, 12, 30), "abc"]
+        cursor = encode_cursor(OrderRepository.KEYSET_BY_DEADLINE, values)
+        self.assertEqual(decode_cursor(cursor, OrderRepository.KEYSET_BY_DEADLINE), values)
+
+    def test_cursor_kind_mismatch_is_rejected(self):
+        cursor = self._orders.find_page(None, 4).next_cursor
+        with self.assertRaises(InvalidCursorError):
+            self._orders.find_pending_orders_page("", cursor, 4)
+        with self.assertRaises(InvalidCursorError):
+            self._orders.find_page("not-a-cursor", 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
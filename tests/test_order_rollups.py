@@ -0,0 +1,118 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from database import get_db, OrderRepository, InventoryRepository
+from database.order_headers import rebuild_order_headers
+from database.order_stats import rebuild_order_stats_summary
+from models import Order, Inventory, OrderHeader, OrderStatsSummary
+from enums import InventoryStatus, OrderStatus, CustomerType
+
+
+class OrderRollupConsistencyTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._db = get_db()
+        self._db.connect(os.path.join(self._tmpdir.name, "rollups.db"))
+        self._orders = OrderRepository()
+        self._product = Inventory(
+            product_type="type", manufacturer="maker", product_name="product",
+            stock_quantity=1000, status=int(InventoryStatus.NORMAL)
+        )
+        InventoryRepository().create_inventory(self._product)
+
+    def tearDown(self):
+        self._db.close()
+        self._tmpdir.cleanup()
+
+    def _order(self, order_id: str, sales: str = "sales", **values) -> Order:
+        values.setdefault("order_time", datetime(2024, 1, 1))
+        return Order(
+            order_id=order_id,
+            customer_name="customer",
+            customer_type=int(CustomerType.ONLINE_RETAIL),
+            sales=sales,
+            product_id=self._product.product_id,
+            quantity=2,
+            **values
+        )
+
+    def _summary_rows(self) -> set:
+        table = OrderStatsSummary.__table__
+        with self._db.engine.connect() as conn:
+            rows = conn.execute(select(table).where(table.c.order_count != 0)).all()
+        return {tuple(row) for row in rows}
+
+    def _header_rows(self) -> set:
+        with self._db.engine.connect() as conn:
+            return {tuple(row) for row in conn.execute(select(OrderHeader.__table__)).all()}
+
+    def assertRollupsMatchRebuild(self):
+        summary, headers = self._summary_rows(), self._header_rows()
+        with self._db.engine.begin() as conn:
+            rebuild_order_stats_summary(conn)
+            rebuild_order_headers(conn)
+        self.assertEqual(summary, self._summary_rows())
+        self.assertEqual(headers, self._header_rows())
+
+    def test_create_and_upsert(self):
+        self._orders.create_order(self._order("A"))
+        self._orders.create_order(self._order("A", sales="other"))
+        self._orders.create_order(self._order("B", ship_deadline=datetime(2024, 2, 1)))
+        self._orders.create_order(self._order(
+            "B", ship_deadline=datetime(2024, 2, 1), status=int(OrderStatus.PACKING)
+        ))
+        self._orders.create_orders_bulk([self._order(f"C{i}", sales=f"s{i % 3}") for i in range(10)])
+        self._orders.create_orders_bulk([self._order(f"C{i}", sales=f"s{i % 3}") for i in range(5, 15)])
+        self.assertRollupsMatchRebuild()
+
+    def test_update_and_delete(self):
+        for i in range(4):
+            self._orders.create_order(self._order("D", sales=f"s{i}"))
+        orders = self._orders.find_by_order_id("D")
+        orders[0].status = int(OrderStatus.PENDING_SHIP)
+        self._orders.update_order(orders[0])
+        orders[1].quantity = 7
+        orders[1].payment_time = datetime(2024, 1, 2)
+        self._orders.update_order(orders[1])
+        self._orders.delete_order(orders[2])
+        blind = self._order("D", sales="s3")
+        blind.generate_hash()
+        blind.status = int(OrderStatus.PACKING)
+        self._orders.update_order(blind, allow_unversioned=True)
+        self.assertRollupsMatchRebuild()
+
+    def test_transition(self):
+        for i in range(6):
+            self._orders.create_order(self._order(f"E{i % 2}", sales=f"s{i}"))
+        hashes = [order.hash for order in self._orders.find_all()]
+        transitioned = self._orders.transition_status(hashes[:4], OrderStatus.PENDING_PAYMENT)
+        self.assertEqual(len(transitioned), 4)
+        self._orders.transition_status(hashes, OrderStatus.CANCELLED)
+        self.assertRollupsMatchRebuild()
+
+    def test_archive(self):
+        old = datetime.now() - timedelta(days=400)
+        for i in range(5):
+            self._orders.create_order(self._order(
+                f"F{i % 2}", sales=f"s{i}", order_time=old, status=int(OrderStatus.COMPLETED)
+            ))
+        self._orders.create_order(self._order("F0", sales="live", order_time=old))
+        self._orders.create_order(self._order(
+            "G", order_time=datetime.now(), status=int(OrderStatus.COMPLETED)
+        ))
+
+        self.assertEqual(self._orders.archive_orders(365, batch_size=2), 5)
+        self.assertEqual(self._orders.count(), 2)
+        self.assertEqual(self._orders.count(include_archived=True), 7)
+        self.assertRollupsMatchRebuild()
+
+
+if __name__ == "__main__":
+    unittest.main()
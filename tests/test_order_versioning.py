@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import get_db, OrderRepository, InventoryRepository
+from database.order_repository import OrderConflictError
+from models import Order, Inventory
+from enums import InventoryStatus, OrderStatus
+
+
+class OrderVersionConflictTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._db = get_db()
+        self._db.connect(os.path.join(self._tmpdir.name, "versions.db"))
+        self._orders = OrderRepository()
+        self._product = Inventory(
+            product_type="type", manufacturer="maker", product_name="product",
+            stock_quantity=100, status=int(InventoryStatus.NORMAL)
+        )
+        InventoryRepository().create_inventory(self._product)
+
+    def tearDown(self):
+        self._db.close()
+        self._tmpdir.cleanup()
+
+    def _order(self, **values) -> Order:
+        return Order(
+            order_id="V1",
+            customer_name="customer",
+            sales="sales",
+            product_id=self._product.product_id,
+            quantity=1,
+            order_time=datetime(2024, 1, 1),
+            **values
+        )
+
+    def test_stale_copy_is_rejected(self):
+        self._orders.create_order(self._order())
+        first = self._orders.find_by_order_id("V1")[0]
+        second = self._orders.find_by_order_id("V1")[0]
+
+        first.status = int(OrderStatus.PENDING_SHIP)
+        self._orders.update_order(first)
+        self.assertEqual(first.version, 2)
+
+        second.tracking_number = "T1"
+        with self.assertRaises(OrderConflictError):
+            self._orders.update_order(second)
+
+        stored = self._orders.find_by_order_id("V1")[0]
+        self.assertEqual(stored.status, int(OrderStatus.PENDING_SHIP))
+        self.assertEqual(stored.tracking_number, "")
+        self.assertEqual(stored.version, 2)
+
+    def test_unversioned_update_needs_explicit_opt_in(self):
+        self._orders.create_order(self._order())
+        blind = self._order()
+        blind.generate_hash()
+        blind.tracking_number = "T2"
+
+        with self.assertRaises(OrderConflictError):
+            self._orders.update_order(blind)
+        self.assertEqual(self._orders.find_by_order_id("V1")[0].tracking_number, "")
+
+        self._orders.update_order(blind, allow_unversioned=True)
+        self.assertEqual(self._orders.find_by_order_id("V1")[0].tracking_number, "T2")
+
+    def test_upsert_ignores_stale_version(self):
+        self._orders.create_order(self._order())
+        self._orders.create_order(self._order(tracking_number="T3", version=1))
+        self._orders.create_order(self._order(tracking_number="T4", version=1))
+
+        stored = self._orders.find_by_order_id("V1")[0]
+        self.assertEqual(stored.tracking_number, "T4")
+        self.assertEqual(stored.version, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import get_db, unit_of_work, OrderRepository, InventoryRepository
+from models import Order, Inventory
+from enums import InventoryStatus
+
+
+class UnitOfWorkIsolationTest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._db = get_db()
+        self._db.connect(os.path.join(self._tmpdir.name, "uow.db"))
+        self._orders = OrderRepository()
+        self._inventory = InventoryRepository()
+        self._product = Inventory(
+            product_type="type", manufacturer="maker", product_name="product",
+            stock_quantity=10, status=int(InventoryStatus.NORMAL)
+        )
+        self._inventory.create_inventory(self._product)
+
+    def tearDown(self):
+        self._db.close()
+        self._tmpdir.cleanup()
+
+    def _order(self, order_id: str) -> Order:
+        return Order(
+            order_id=order_id,
+            customer_name="customer",
+            sales="sales",
+            product_id=self._product.product_id,
+            quantity=1,
+            order_time=datetime(2024, 1, 1),
+        )
+
+    def _count_in_thread(self) -> int:
+        result = {}
+
+        def count():
+            result["count"] = self._orders.count()
+
+        worker = threading.Thread(target=count)
+        worker.start()
+        worker.join()
+        return result["count"]
+
+    def test_other_threads_do_not_share_the_unit_of_work_transaction(self):
+        with unit_of_work():
+            self._orders.create_order(self._order("O1"))
+            self.assertEqual(self._count_in_thread(), 0)
+            self._orders.create_order(self._order("O2"))
+            self._inventory.update_stock(self._product.product_id, -2)
+
+        self.assertEqual(self._orders.count(), 2)
+        self.assertEqual(
+            self._inventory.get_inventory_by_id(self._product.product_id).stock_quantity, 8
+        )
+
+    def test_rolled_back_unit_of_work_leaves_no_rows(self):
+        with self.assertRaises(RuntimeError):
+            with unit_of_work():
+                self._orders.create_order(self._order("O1"))
+                self.assertEqual(self._count_in_thread(), 0)
+                raise RuntimeError("abort")
+
+        self.assertEqual(self._orders.count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 from .worker import Worker, WorkerSignals, ServiceRunner, get_service_runner
+from .async_bridge import AsyncRunner, get_async_runner
 from .matplotlib_config import (
     configure_matplotlib_chinese,
     get_font_path,
@@ -10,6 +11,8 @@ __all__ = [
     'WorkerSignals', 
     'ServiceRunner',
     'get_service_runner',
+    'AsyncRunner',
+    'get_async_runner',
     'configure_matplotlib_chinese',
     'get_font_path',
     'get_font_properties',
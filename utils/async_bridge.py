@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Set
+
+from utils.worker import WorkerSignals
+
+
+class AsyncRunner:
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._pending_signals: Set[WorkerSignals] = set()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None:
+                return self._loop
+
+            started = threading.Event()
+            loop = asyncio.new_event_loop()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+                loop.close()
+
+            self._thread = threading.Thread(target=run_loop, name="AsyncRunnerLoop", daemon=True)
+            self._thread.start()
+            started.wait()
+            self._loop = loop
+            return loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(
+        self,
+        coro_fn: Callable[..., Awaitable[Any]],
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+        on_success: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_finished: Optional[Callable[[], None]] = None
+    ) -> Future:
+        if kwargs is None:
+            kwargs = {}
+
+        signals = WorkerSignals()
+        if on_success:
+            signals.result.connect(on_success)
+        if on_error:
+            signals.error.connect(on_error)
+        if on_finished:
+            signals.finished.connect(on_finished)
+        signals.finished.connect(lambda: self._pending_signals.discard(signals))
+        self._pending_signals.add(signals)
+
+        def on_done(future: Future):
+            try:
+                result = future.result()
+            except Exception as e:
+                signals.error.emit(e)
+            else:
+                signals.result.emit(result)
+            finally:
+                signals.finished.emit()
+
+        future = self.submit(coro_fn(*args, **kwargs))
+        future.add_done_callback(on_done)
+        return future
+
+    def shutdown(self, cleanup: Optional[Coroutine] = None, timeout: float = 5.0):
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+
+        if loop is None:
+            if cleanup is not None:
+                cleanup.close()
+            return
+
+        if cleanup is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(cleanup, loop).result(timeout)
+            except Exception:
+                pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+
+_async_runner: Optional[AsyncRunner] = None
+
+
+def get_async_runner() -> AsyncRunner:
+    global _async_runner
+    if _async_runner is None:
+        _async_runner = AsyncRunner()
+    return _async_runner
@@ -1,6 +1,8 @@
 from typing import Callable, Any, Optional
 from PyQt6.QtCore import QObject, QThread, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
 
+from database.connection import get_db
+
 
 class WorkerSignals(QObject):
     finished = pyqtSignal()
@@ -20,7 +22,8 @@ class Worker(QRunnable):
     @pyqtSlot()
     def run(self):
         try:
-            result = self.fn(*self.args, **self.kwargs)
+            with get_db().session_scope():
+                result = self.fn(*self.args, **self.kwargs)
             self.signals.result.emit(result)
         except Exception as e:
             self.signals.error.emit(e)
@@ -6,7 +6,7 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QColor, QPalette
 
 from services import StatisticsService
-from utils import get_service_runner
+from utils import get_service_runner, get_async_runner
 
 
 CHART_COLORS = [
@@ -79,6 +79,37 @@ class DashboardView(QWidget):
         loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self._content_layout.addWidget(loading_label)
         
+        get_service_runner().run(
+            self._fetch_approximate_stats,
+            on_success=self._on_approximate_stats_loaded,
+            on_error=self._on_approximate_stats_error
+        )
+
+    def _fetch_approximate_stats(self):
+        dash_stats, deadline_stats = self._statistics_service.get_dashboard_overview(approximate=True)
+        return {
+            'dash_stats': dash_stats,
+            'status_stats': self._statistics_service.get_order_status_distribution(),
+            'customer_type_stats': self._statistics_service.get_order_customer_type_distribution(),
+            'deadline_stats': deadline_stats,
+        }
+
+    def _on_approximate_stats_loaded(self, stats):
+        self._on_stats_loaded(stats)
+        self._load_exact_data()
+
+    def _on_approximate_stats_error(self, error: Exception):
+        self._load_exact_data()
+
+    def _load_exact_data(self):
+        if self._statistics_service.is_async_available():
+            get_async_runner().run(
+                self._statistics_service.fetch_dashboard_async,
+                on_success=self._on_stats_loaded,
+                on_error=self._on_stats_error
+            )
+            return
+
         runner = get_service_runner()
         runner.run(
             self._fetch_all_stats,
@@ -87,11 +118,12 @@ class DashboardView(QWidget):
         )
     
     def _fetch_all_stats(self):
+        dash_stats, deadline_stats = self._statistics_service.get_dashboard_overview()
         return {
-            'dash_stats': self._statistics_service.get_dashboard_stats(),
+            'dash_stats': dash_stats,
             'status_stats': self._statistics_service.get_order_status_distribution(),
             'customer_type_stats': self._statistics_service.get_order_customer_type_distribution(),
-            'deadline_stats': self._statistics_service.get_deadline_distribution(),
+            'deadline_stats': deadline_stats,
             'inventory_stats': self._statistics_service.get_inventory_sales_stats(),
             'platform_stats': self._statistics_service.get_best_selling_platform(),
         }
@@ -106,7 +138,7 @@ class DashboardView(QWidget):
         status_stats = stats['status_stats']
         customer_type_stats = stats['customer_type_stats']
         deadline_stats = stats['deadline_stats']
-        inventory_stats = stats['inventory_stats']
+        inventory_stats = stats.get('inventory_stats')
         
         overview_card = self._create_overview_card(dash_stats)
         self._content_layout.addWidget(overview_card)
@@ -157,7 +189,7 @@ class DashboardView(QWidget):
         
         layout = QVBoxLayout(card)
         
-        title = QLabel("📊 总览")
+        title = QLabel("📊 总览（估算值，正在刷新...）" if stats.approximate else "📊 总览")
         title_font = QFont()
         title_font.setBold(True)
         title.setFont(title_font)
@@ -166,13 +198,15 @@ class DashboardView(QWidget):
         grid = QGridLayout()
         grid.setSpacing(10)
         
+        prefix = "≈" if stats.approximate else ""
         stats_data = [
-            ("订单总数", str(stats.total_orders), "#4CAF50"),
-            ("客户总数", str(stats.total_customers), "#2196F3"),
-            ("用户总数", str(stats.total_users), "#9C27B0"),
-            ("待处理订单", str(stats.pending_orders), "#FF9800"),
-            ("已完成订单", str(stats.completed_orders), "#4CAF50"),
-            ("临近截止", str(stats.near_deadline_orders), "#F44336"),
+            ("订单总数", f"{prefix}{stats.total_orders}", "#4CAF50"),
+            ("订单号总数", f"{prefix}{stats.total_order_ids}", "#009688"),
+            ("客户总数", f"{prefix}{stats.total_customers}", "#2196F3"),
+            ("用户总数", f"{prefix}{stats.total_users}", "#9C27B0"),
+            ("待处理订单", f"{prefix}{stats.pending_orders}", "#FF9800"),
+            ("已完成订单", f"{prefix}{stats.completed_orders}", "#4CAF50"),
+            ("临近截止", f"{prefix}{stats.near_deadline_orders}", "#F44336"),
         ]
         
         for i, (label_text, value, color) in enumerate(stats_data):
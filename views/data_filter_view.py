@@ -1,24 +1,33 @@
-from datetime import datetime
+from datetime import date
 from typing import Optional
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QLineEdit, QComboBox, QTableWidget, QTableWidgetItem,
-    QHeaderView, QFrame, QDateEdit, QMessageBox
+    QHeaderView, QFrame, QDateEdit, QMessageBox, QCompleter
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QDate
+from PyQt6.QtCore import Qt, pyqtSignal, QDate, QStringListModel
 
 from services import OrderService
+from database import DateRange, OrderFacets
 from enums import OrderStatus, CustomerType
 from utils import get_service_runner
 
 
 class DataFilterView(QWidget):
     back_to_main = pyqtSignal()
+    PAGE_SIZE = 200
+    UNSET_DATE = QDate(2000, 1, 1)
+    LABEL_ROLE = Qt.ItemDataRole.UserRole + 1
 
     def __init__(self, order_service: OrderService):
         super().__init__()
         self._order_service = order_service
+        self._search_filters = {}
+        self._next_cursor: Optional[str] = None
+        self._loaded_count = 0
+        self._search_generation = 0
+        self._facets: Optional[OrderFacets] = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -49,6 +58,9 @@ class DataFilterView(QWidget):
         filter_layout = self._create_filter_form()
         layout.addLayout(filter_layout)
         
+        date_filter_layout = self._create_date_filter_form()
+        layout.addLayout(date_filter_layout)
+        
         search_btn = QPushButton("🔍 搜索")
         search_btn.clicked.connect(self._on_search_clicked)
         layout.addWidget(search_btn)
@@ -65,8 +77,19 @@ class DataFilterView(QWidget):
         self._table.setAlternatingRowColors(True)
         layout.addWidget(self._table)
         
+        bottom_bar = QHBoxLayout()
+        
         self._result_label = QLabel("共 0 条记录")
-        layout.addWidget(self._result_label)
+        bottom_bar.addWidget(self._result_label)
+        
+        bottom_bar.addStretch()
+        
+        self._load_more_btn = QPushButton("加载更多")
+        self._load_more_btn.setEnabled(False)
+        self._load_more_btn.clicked.connect(self._on_load_more_clicked)
+        bottom_bar.addWidget(self._load_more_btn)
+        
+        layout.addLayout(bottom_bar)
 
     def _create_filter_form(self) -> QHBoxLayout:
         layout = QHBoxLayout()
@@ -90,62 +113,175 @@ class DataFilterView(QWidget):
         sales_layout.addWidget(QLabel("销售员:"))
         self._sales_entry = QLineEdit()
         self._sales_entry.setPlaceholderText("销售员")
+        self._sales_model = QStringListModel()
+        sales_completer = QCompleter(self._sales_model, self._sales_entry)
+        sales_completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self._sales_entry.setCompleter(sales_completer)
         sales_layout.addWidget(self._sales_entry)
         layout.addLayout(sales_layout)
         
         status_layout = QVBoxLayout()
         status_layout.addWidget(QLabel("状态:"))
         self._status_combo = QComboBox()
-        self._status_combo.addItem("全部", None)
+        self._add_combo_item(self._status_combo, "全部", None)
         for status in OrderStatus:
             if status != OrderStatus.UNKNOWN:
-                self._status_combo.addItem(str(status), status)
+                self._add_combo_item(self._status_combo, str(status), status)
         status_layout.addWidget(self._status_combo)
         layout.addLayout(status_layout)
         
         type_layout = QVBoxLayout()
         type_layout.addWidget(QLabel("客户类型:"))
         self._type_combo = QComboBox()
-        self._type_combo.addItem("全部", None)
+        self._add_combo_item(self._type_combo, "全部", None)
         for ct in CustomerType:
             if ct != CustomerType.UNKNOWN:
-                self._type_combo.addItem(str(ct), ct)
+                self._add_combo_item(self._type_combo, str(ct), ct)
         type_layout.addWidget(self._type_combo)
         layout.addLayout(type_layout)
         
         return layout
 
+    def _add_combo_item(self, combo: QComboBox, label: str, value):
+        combo.addItem(label, value)
+        combo.setItemData(combo.count() - 1, label, self.LABEL_ROLE)
+
+    def _create_date_edit(self) -> QDateEdit:
+        date_edit = QDateEdit()
+        date_edit.setCalendarPopup(True)
+        date_edit.setDisplayFormat("yyyy-MM-dd")
+        date_edit.setMinimumDate(self.UNSET_DATE)
+        date_edit.setSpecialValueText("不限")
+        date_edit.setDate(self.UNSET_DATE)
+        return date_edit
+
+    def _create_date_filter_form(self) -> QHBoxLayout:
+        layout = QHBoxLayout()
+        layout.setSpacing(10)
+        
+        self._date_edits = {}
+        for key, label in (
+            ("order_time", "下单时间:"),
+            ("payment_time", "付款时间:"),
+            ("ship_deadline", "发货截止:"),
+        ):
+            range_layout = QVBoxLayout()
+            range_layout.addWidget(QLabel(label))
+            edits_layout = QHBoxLayout()
+            start_edit = self._create_date_edit()
+            end_edit = self._create_date_edit()
+            edits_layout.addWidget(start_edit)
+            edits_layout.addWidget(QLabel("至"))
+            edits_layout.addWidget(end_edit)
+            range_layout.addLayout(edits_layout)
+            layout.addLayout(range_layout)
+            self._date_edits[key] = (start_edit, end_edit)
+        
+        clear_btn = QPushButton("清除日期")
+        clear_btn.clicked.connect(self._on_clear_dates_clicked)
+        layout.addWidget(clear_btn, alignment=Qt.AlignmentFlag.AlignBottom)
+        
+        return layout
+
+    def _on_clear_dates_clicked(self):
+        for start_edit, end_edit in self._date_edits.values():
+            start_edit.setDate(self.UNSET_DATE)
+            end_edit.setDate(self.UNSET_DATE)
+
+    def _edit_date(self, date_edit: QDateEdit) -> Optional[date]:
+        if date_edit.date() == self.UNSET_DATE:
+            return None
+        return date_edit.date().toPyDate()
+
+    def _date_range(self, key: str) -> Optional[DateRange]:
+        start_edit, end_edit = self._date_edits[key]
+        first = self._edit_date(start_edit)
+        last = self._edit_date(end_edit)
+        if first is None and last is None:
+            return None
+        return DateRange.of_days(first, last)
+
     def _on_search_clicked(self):
-        order_id = self._order_id_entry.text().strip()
-        customer_name = self._customer_entry.text().strip()
-        sales = self._sales_entry.text().strip()
+        try:
+            date_ranges = {key: self._date_range(key) for key in self._date_edits}
+        except ValueError:
+            QMessageBox.warning(self, "提示", "结束日期不能早于开始日期")
+            return
         
-        status = self._status_combo.currentText()
-        customer_type = self._type_combo.currentText()
+        self._search_filters = {
+            "order_id": self._order_id_entry.text().strip(),
+            "customer_name": self._customer_entry.text().strip(),
+            "sales": self._sales_entry.text().strip(),
+            "status": self._status_combo.currentData(),
+            "customer_type": self._type_combo.currentData(),
+            **date_ranges,
+        }
+        self._next_cursor = None
+        self._loaded_count = 0
+        self._facets = None
+        self._search_generation += 1
+        self._table.setRowCount(0)
+        self._load_page(None)
+
+    def _on_load_more_clicked(self):
+        if self._next_cursor:
+            self._load_page(self._next_cursor)
+
+    def _load_page(self, cursor: Optional[str]):
+        filters = dict(self._search_filters)
+        generation = self._search_generation
+        self._load_more_btn.setEnabled(False)
         
         def do_search():
-            return self._order_service.get_orders_by_filter(
-                order_id=order_id,
-                customer_name=customer_name,
-                sales=sales,
-                status=OrderStatus.from_string(status),
-                customer_type=CustomerType.from_string(customer_type)
+            return self._order_service.get_order_rows_page(
+                cursor=cursor,
+                page_size=self.PAGE_SIZE,
+                include_facets=cursor is None,
+                **filters
             )
         
         runner = get_service_runner()
         runner.run(
             do_search,
-            on_success=self._on_search_success,
+            on_success=lambda page: self._on_search_success(page, generation),
             on_error=lambda e: QMessageBox.critical(self, "错误", f"搜索失败: {e}")
         )
     
-    def _on_search_success(self, orders):
-        self._populate_table(orders)
-        self._result_label.setText(f"共 {len(orders)} 条记录")
+    def _on_search_success(self, page, generation: int):
+        if generation != self._search_generation:
+            return
+        
+        self._next_cursor = page.next_cursor
+        self._loaded_count += len(page.orders)
+        if page.facets is not None:
+            self._facets = page.facets
+            self._apply_facets(page.facets)
+        self._populate_table(page.orders)
+        self._load_more_btn.setEnabled(page.has_more)
+        if page.has_more and self._facets is not None:
+            self._result_label.setText(f"已加载 {self._loaded_count} / 共 {self._facets.total} 条记录")
+        elif page.has_more:
+            self._result_label.setText(f"已加载 {self._loaded_count} 条记录，还有更多")
+        else:
+            self._result_label.setText(f"共 {self._loaded_count} 条记录")
+
+    def _apply_facet_counts(self, combo: QComboBox, counts: dict):
+        for index in range(combo.count()):
+            value = combo.itemData(index)
+            label = combo.itemData(index, self.LABEL_ROLE)
+            if value is None:
+                count = sum(counts.values())
+            else:
+                count = counts.get(int(value), 0)
+            combo.setItemText(index, f"{label} ({count})")
+
+    def _apply_facets(self, facets: OrderFacets):
+        self._apply_facet_counts(self._status_combo, facets.status)
+        self._apply_facet_counts(self._type_combo, facets.customer_type)
+        sales_names = sorted(facets.sales, key=lambda name: facets.sales[name], reverse=True)
+        self._sales_model.setStringList([name for name in sales_names if name])
 
     def _populate_table(self, orders):
-        self._table.setRowCount(0)
-        
         for order in orders:
             row = self._table.rowCount()
             self._table.insertRow(row)
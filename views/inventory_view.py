@@ -74,7 +74,7 @@ class InventoryQueryView(QWidget):
     def _load_inventory(self):
         runner = get_service_runner()
         runner.run(
-            self._inventory_repo.find_all_inventory,
+            self._inventory_repo.find_all_inventory_rows,
             on_success=self._populate_table,
             on_error=lambda e: QMessageBox.critical(self, "错误", f"加载库存失败: {e}")
         )
@@ -122,9 +122,9 @@ class InventoryQueryView(QWidget):
         
         def do_search():
             if keyword:
-                return self._inventory_repo.search_inventory(keyword)
+                return self._inventory_repo.search_inventory_rows(keyword)
             else:
-                return self._inventory_repo.find_all_inventory()
+                return self._inventory_repo.find_all_inventory_rows()
         
         runner = get_service_runner()
         runner.run(
@@ -191,7 +191,7 @@ class InventoryManagementView(QWidget):
     def _load_inventory(self):
         runner = get_service_runner()
         runner.run(
-            self._inventory_repo.find_all_inventory,
+            self._inventory_repo.find_all_inventory_rows,
             on_success=self._populate_table,
             on_error=lambda e: QMessageBox.critical(self, "错误", f"加载库存失败: {e}")
         )
@@ -495,4 +495,5 @@ class EditInventoryDialog(QDialog):
             sold_quantity=self._sold_quantity_spin.value(),
             status=InventoryStatus.from_string(self._status_combo.currentText()).value,
             expected_arrival=self._expected_arrival_date.date().toPyDate(),
+            version=self._inventory.version,
         )
\ No newline at end of file
@@ -8,9 +8,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
-from models import Order
 from enums import OrderStatus, UserRole
-from database import OrderRepository, InventoryRepository
+from database import OrderRepository, InventoryRepository, OrderRow
 from services import OrderService
 from utils import get_service_runner
 
@@ -25,7 +24,7 @@ class OrderStatusManagementView(QWidget):
         self._user_service = user_service
         self._order_repo = OrderRepository()
         self._inventory_repo = InventoryRepository()
-        self._selected_orders: Dict[str, Order] = {}
+        self._selected_orders: Dict[str, OrderRow] = {}
         self._order_checkboxes: Dict[str, QCheckBox] = {}
         self._status_combos: Dict[str, QComboBox] = {}
         self._has_permission = self._check_permission()
@@ -160,19 +159,19 @@ class OrderStatusManagementView(QWidget):
         runner = get_service_runner()
         if status_filter is not None:
             runner.run(
-                self._order_service.get_orders_by_status,
-                args=(status_filter,),
+                self._order_service.get_order_rows,
+                args=([status_filter],),
                 on_success=self._populate_order_table,
                 on_error=lambda e: QMessageBox.critical(self, "错误", f"加载订单失败: {e}")
             )
         else:
             runner.run(
-                self._order_service.get_all_orders,
+                self._order_service.get_order_rows,
                 on_success=self._populate_order_table,
                 on_error=lambda e: QMessageBox.critical(self, "错误", f"加载订单失败: {e}")
             )
 
-    def _populate_order_table(self, orders: List[Order]):
+    def _populate_order_table(self, orders: List[OrderRow]):
         self._order_table.setRowCount(len(orders))
         self._order_checkboxes.clear()
         self._status_combos.clear()
@@ -243,7 +242,7 @@ class OrderStatusManagementView(QWidget):
         for checkbox in self._order_checkboxes.values():
             checkbox.setChecked(is_checked)
 
-    def _on_checkbox_changed(self, order: Order, state: int):
+    def _on_checkbox_changed(self, order: OrderRow, state: int):
         if state == Qt.CheckState.Checked.value:
             self._selected_orders[order.hash] = order
         else:
@@ -265,15 +264,13 @@ class OrderStatusManagementView(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            orders_to_update = [(order, new_status) for order in self._selected_orders.values()]
+            order_hashes = list(self._selected_orders.keys())
             
             def do_batch_update():
-                updated_count = 0
-                for order, status in orders_to_update:
-                    order.status = int(status)
-                    self._order_repo.update_order(order)
-                    updated_count += 1
-                return updated_count
+                transitioned = self._order_service.transition_order_status(
+                    order_hashes, new_status, allowed_sources=list(OrderStatus)
+                )
+                return len(transitioned), len(order_hashes)
             
             runner = get_service_runner()
             runner.run(
@@ -282,11 +279,8 @@ class OrderStatusManagementView(QWidget):
                 on_error=lambda e: QMessageBox.critical(self, "错误", f"批量修改状态失败: {e}")
             )
     
-    def _on_batch_update_success(self, updated_count):
-        QMessageBox.information(
-            self, "修改成功",
-            f"已成功修改 {updated_count} 个订单的状态。"
-        )
+    def _on_batch_update_success(self, counts):
+        self._show_update_result(*counts)
         
         self._selected_orders.clear()
         self._select_all_checkbox.setChecked(False)
@@ -305,19 +299,21 @@ class OrderStatusManagementView(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            orders_to_update = []
+            hashes_by_status: Dict[OrderStatus, List[str]] = {}
             for order_hash, order in self._selected_orders.items():
                 if order_hash in self._status_combos:
                     new_status = self._status_combos[order_hash].currentData()
-                    orders_to_update.append((order, new_status))
+                    if new_status != OrderStatus(order.status):
+                        hashes_by_status.setdefault(new_status, []).append(order_hash)
             
             def do_single_update():
                 updated_count = 0
-                for order, status in orders_to_update:
-                    order.status = int(status)
-                    self._order_repo.update_order(order)
-                    updated_count += 1
-                return updated_count
+                for status, order_hashes in hashes_by_status.items():
+                    transitioned = self._order_service.transition_order_status(
+                        order_hashes, status, allowed_sources=list(OrderStatus)
+                    )
+                    updated_count += len(transitioned)
+                return updated_count, sum(len(h) for h in hashes_by_status.values())
             
             runner = get_service_runner()
             runner.run(
@@ -326,12 +322,16 @@ class OrderStatusManagementView(QWidget):
                 on_error=lambda e: QMessageBox.critical(self, "错误", f"修改状态失败: {e}")
             )
     
-    def _on_single_update_success(self, updated_count):
-        QMessageBox.information(
-            self, "修改成功",
-            f"已成功修改 {updated_count} 个订单的状态。"
-        )
+    def _on_single_update_success(self, counts):
+        self._show_update_result(*counts)
         
         self._selected_orders.clear()
         self._select_all_checkbox.setChecked(False)
         self._load_orders(self._filter_combo.currentData())
+
+    def _show_update_result(self, updated_count: int, requested_count: int):
+        skipped_count = requested_count - updated_count
+        message = f"已成功修改 {updated_count} 个订单的状态。"
+        if skipped_count > 0:
+            message += f"\n{skipped_count} 个订单已是目标状态或已被删除，未作修改。"
+        QMessageBox.information(self, "修改成功", message)
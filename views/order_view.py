@@ -11,7 +11,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 
 from services import OrderService
-from database import InventoryRepository
+from database import InventoryRepository, unit_of_work
 from models import Order
 from enums import OrderStatus, CustomerType, InventoryStatus, UserRole
 from utils import get_service_runner
@@ -106,7 +106,7 @@ class PlaceOrderView(QWidget):
     def _load_products(self):
         runner = get_service_runner()
         runner.run(
-            self._inventory_repo.find_all_inventory,
+            self._inventory_repo.find_all_inventory_rows,
             on_success=self._populate_products_table,
             on_error=lambda e: QMessageBox.critical(self, "错误", f"加载产品列表失败: {e}")
         )
@@ -283,27 +283,28 @@ class PlaceOrderView(QWidget):
         created_orders = 0
         stock_update_failures = 0
         
-        for product_id, quantity in order_info['selected_products'].items():
-            order = Order(
-                customer_type=int(order_info['customer_type']),
-                customer_name=order_info['customer_name'],
-                sales=order_info['sales'],
-                order_id=order_info['order_id'],
-                product_id=product_id,
-                quantity=quantity,
-                order_time=order_info['order_time'],
-                ship_deadline=order_info['ship_deadline'],
-                status=int(OrderStatus.PENDING_PAYMENT),
-            )
-            
-            self._order_service.create_order(order)
+        with unit_of_work():
+            for product_id, quantity in order_info['selected_products'].items():
+                order = Order(
+                    customer_type=int(order_info['customer_type']),
+                    customer_name=order_info['customer_name'],
+                    sales=order_info['sales'],
+                    order_id=order_info['order_id'],
+                    product_id=product_id,
+                    quantity=quantity,
+                    order_time=order_info['order_time'],
+                    ship_deadline=order_info['ship_deadline'],
+                    status=int(OrderStatus.PENDING_PAYMENT),
+                )
+                
+                self._order_service.create_order(order)
 
-            try:
-                self._inventory_repo.update_stock(product_id, -quantity)
-            except Exception:
-                stock_update_failures += 1
-            
-            created_orders += 1
+                try:
+                    self._inventory_repo.update_stock(product_id, -quantity)
+                except Exception:
+                    stock_update_failures += 1
+                
+                created_orders += 1
         
         return {
             'order_id': order_info['order_id'],
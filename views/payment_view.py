@@ -11,7 +11,7 @@ from PyQt6.QtGui import QPixmap, QImage, QPainter, QColor
 
 from models import Order
 from enums import OrderStatus
-from database import OrderRepository, InventoryRepository
+from database import OrderRepository, InventoryRepository, unit_of_work
 from utils import get_service_runner
 
 
@@ -185,15 +185,16 @@ class PaymentView(QWidget):
     
     def _cancel_order_in_thread(self):
         stock_restore_errors = []
-        orders = self._order_repo.find_by_order_id(self._order_id)
-        for order in orders:
-            try:
-                self._inventory_repo.update_stock(order.product_id, order.quantity)
-            except Exception as stock_error:
-                stock_restore_errors.append(f"产品 {order.product_id}: {stock_error}")
-            
-            order.status = int(OrderStatus.CANCELLED)
-            self._order_repo.update_order(order)
+        with unit_of_work():
+            orders = self._order_repo.find_by_order_id(self._order_id)
+            for order in orders:
+                try:
+                    self._inventory_repo.update_stock(order.product_id, order.quantity)
+                except Exception as stock_error:
+                    stock_restore_errors.append(f"产品 {order.product_id}: {stock_error}")
+                
+                order.status = int(OrderStatus.CANCELLED)
+                self._order_repo.update_order(order)
         
         return stock_restore_errors
     
@@ -270,11 +271,12 @@ class PaymentView(QWidget):
             )
     
     def _complete_payment_in_thread(self):
-        orders = self._order_repo.find_by_order_id(self._order_id)
-        for order in orders:
-            order.status = int(OrderStatus.PENDING_SHIP)
-            order.payment_time = datetime.now()
-            self._order_repo.update_order(order)
+        with unit_of_work():
+            orders = self._order_repo.find_by_order_id(self._order_id)
+            for order in orders:
+                order.status = int(OrderStatus.PENDING_SHIP)
+                order.payment_time = datetime.now()
+                self._order_repo.update_order(order)
         return True
     
     def _on_payment_complete_success(self, _):
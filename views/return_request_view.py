@@ -8,9 +8,9 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
-from models import Order, ReturnRequest, ReturnStatus
+from models import ReturnRequest, ReturnStatus
 from enums import OrderStatus, ReturnReason, UserRole
-from database import OrderRepository, InventoryRepository
+from database import OrderRepository, InventoryRepository, OrderRow
 from services import OrderService
 from utils import get_service_runner
 
@@ -24,7 +24,7 @@ class ReturnRequestView(QWidget):
         self._user_service = user_service
         self._order_repo = OrderRepository()
         self._inventory_repo = InventoryRepository()
-        self._selected_orders: Dict[str, Order] = {}
+        self._selected_orders: Dict[str, OrderRow] = {}
         self._order_checkboxes: Dict[str, QCheckBox] = {}
         
         self._setup_ui()
@@ -100,20 +100,14 @@ class ReturnRequestView(QWidget):
 
     def _load_orders(self):
         try:
-            orders = self._order_service.get_all_orders()
-            
-            filtered_orders = []
-            for order in orders:
-                if getattr(order, 'return_applied', False) and order.status == OrderStatus.RETURN_REJECTED:
-                    continue
-                if order.status in [OrderStatus.COMPLETED, OrderStatus.PENDING_RECEIVE]:
-                    filtered_orders.append(order)
-            
-            self._populate_order_table(filtered_orders)
+            orders = self._order_service.get_order_rows(
+                [OrderStatus.COMPLETED, OrderStatus.PENDING_RECEIVE]
+            )
+            self._populate_order_table(orders)
         except Exception as e:
             QMessageBox.critical(self, "错误", f"加载订单失败: {e}")
 
-    def _populate_order_table(self, orders: List[Order]):
+    def _populate_order_table(self, orders: List[OrderRow]):
         self._order_table.setRowCount(len(orders))
         self._order_checkboxes.clear()
         
@@ -163,7 +157,7 @@ class ReturnRequestView(QWidget):
             
             order_id_item.setData(Qt.ItemDataRole.UserRole, order)
 
-    def _on_checkbox_changed(self, order: Order, state: int):
+    def _on_checkbox_changed(self, order: OrderRow, state: int):
         if state == Qt.CheckState.Checked.value:
             self._selected_orders[order.hash] = order
         else:
@@ -187,16 +181,13 @@ class ReturnRequestView(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            orders_to_update = list(self._selected_orders.values())
+            order_hashes = list(self._selected_orders.keys())
             
             def do_return_request():
-                updated_count = 0
-                for order in orders_to_update:
-                    order.status = int(OrderStatus.RETURN_APPLYING)
-                    order.return_applied = True
-                    self._order_repo.update_order(order)
-                    updated_count += 1
-                return updated_count
+                transitioned = self._order_service.transition_order_status(
+                    order_hashes, OrderStatus.RETURN_APPLYING, {'return_applied': True}
+                )
+                return len(transitioned)
             
             runner = get_service_runner()
             runner.run(